@@ -1,19 +1,22 @@
 from typing import Dict, Any,List
-import json
 from datetime import datetime
-import uuid
+import asyncio
 from .base_agent import BaseAgent
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage
 from core.agent_config import AgentConfig
 from core.agent_type import AgentType
 from core.research_state import ResearchState
+from core.knowledge_base import KnowledgeBase
+from core.source_record import SourceRecord
+from core.findings_index import FindingsIndex
 
 class AnalystAgent(BaseAgent):
     """Analyzes and synthesizes information"""
     def __init__(self):
         config = AgentConfig(
             agent_type=AgentType.ANALYST,
+            model_tier="strong",
             system_prompt="""You are an Analysis Specialist. Your responsibilities:
             1. Analyze collected data and sources
             2. Identify patterns, trends, and relationships
@@ -24,10 +27,16 @@ class AnalystAgent(BaseAgent):
             Maintain objectivity and academic rigor."""
         )
         super().__init__(config)
+        self.knowledge_base = KnowledgeBase()
+        # Embeds findings for near-duplicate merging; the graph shares the search specialist's model
+        self.embed_fn = None
 
     async def analyze(self, state: ResearchState) -> Dict[str, Any]:
         """Analyze search results and generate insights"""
-        search_results = state.get("search_results", [])
+        # search_results holds citation ids into the shared source records
+        sources_by_id = {source.citation_id: source for source in state.get("sources", [])}
+        search_results = [sources_by_id[citation_id] for citation_id in state.get("search_results", [])
+                          if citation_id in sources_by_id]
         topic = state["topic"]
 
 
@@ -45,13 +54,19 @@ class AnalystAgent(BaseAgent):
             analysis_data["sources_by_type"][source_type] = \
                 analysis_data["sources_by_type"].get(source_type, 0) + 1
 
+        # In pipelined runs early batches were already analyzed while search was
+        # still running; this pass only merges them with the sources they missed
+        partial_analyses = state.get("partial_analyses", [])
+        covered = {source_id for partial in partial_analyses for source_id in partial["source_ids"]}
+        tail = [result for result in search_results if result.citation_id not in covered]
+
         prompt = ChatPromptTemplate.from_messages([
             SystemMessage(content=self.config.system_prompt),
             HumanMessage(content=f"""
             Analyze these research findings for topic: {topic.title}
-
+            {self._partial_context(partial_analyses)}
             Search Results Summary:
-            {json.dumps(search_results[:5], indent=2)}
+            {self.compactor.pack_sources(tail[:5])}
 
             Provide a comprehensive analysis covering:
             1. Key trends and patterns
@@ -60,11 +75,11 @@ class AnalystAgent(BaseAgent):
             4. Evidence strength assessment
             5. Identified knowledge gaps
             6. Preliminary conclusions
+            {self._revision_focus(state)}
             """)
         ])
 
-        chain = prompt | self.llm
-        response = await chain.ainvoke({})
+        response = await self.invoke_llm(prompt)
 
    
         analysis_result = {
@@ -77,16 +92,73 @@ class AnalystAgent(BaseAgent):
         self.log_activity("analysis_completed", {
             "topic": topic.title,
             "sources_analyzed": len(search_results),
-            "confidence": analysis_result["confidence_score"]
+            "confidence": analysis_result["confidence_score"],
+            "partial_analyses_merged": len(partial_analyses),
+            "llm_calls_coalesced": self.router.flights.stats()["coalesced"]
         })
 
+        # Findings accumulate across passes; rewordings of known ones merge into them
+        analysis_pass = state.get("analysis_passes", 0) + 1
+        pass_source_ids = [source.citation_id for source in tail[:5]] + sorted(covered)
+        index = FindingsIndex(self.embed_fn, state.get("findings", []),
+                              pruned_ids=state.get("pruned_finding_ids", []))
+        new_findings = await asyncio.to_thread(
+            index.add, self._extract_findings(response.content, pass_source_ids), analysis_pass
+        )
+        await asyncio.to_thread(self.knowledge_base.add_findings, topic, new_findings)
+        self.log_activity("findings_indexed", {"pass": analysis_pass, **index.stats()})
+
         return {
             "analysis": analysis_result,
             "research_phase": "synthesis",
-            "findings": self._extract_findings(response.content)
+            "findings": index.findings(),
+            "analysis_passes": analysis_pass
         }
 
-    def _calculate_confidence(self, results: List[Dict]) -> float:
+    async def analyze_batch(self, topic, sources: List[SourceRecord]) -> Dict[str, Any]:
+        """Preliminary analysis of an early batch of sources, merged by the final pass"""
+        prompt = ChatPromptTemplate.from_messages([
+            SystemMessage(content=self.config.system_prompt),
+            HumanMessage(content=f"""
+            Summarize what these sources contribute to the topic: {topic.title}
+
+            Sources:
+            {self.compactor.pack_sources(sources, self.compactor.max_prompt_chars // 2)}
+
+            List the key findings, methodologies and open questions, citing source ids.
+            """)
+        ])
+        try:
+            response = await self.invoke_llm(prompt, tier="fast")
+        except Exception as e:
+            print(f"Partial analysis error: {e}")
+            return {}
+        return {
+            "source_ids": [source.citation_id for source in sources],
+            "summary": response.content,
+            "created_at": datetime.now().isoformat()
+        }
+
+    def _partial_context(self, partial_analyses: List[Dict[str, Any]]) -> str:
+        """Prompt section carrying the partial analyses to merge"""
+        if not partial_analyses:
+            return ""
+        summaries = "\n\n".join(partial["summary"] for partial in partial_analyses)
+        return ("\n            Partial analyses of earlier sources (merge these into the analysis):\n"
+                + self.compactor.bound_text(summaries, self.compactor.max_prompt_chars // 2) + "\n")
+
+    def _revision_focus(self, state: ResearchState) -> str:
+        """Targeted instructions for the validation issues a re-analysis can fix"""
+        issues = set(state.get("validation_errors", [])) if state.get("analysis_passes") else set()
+        focus = []
+        if "shallow_analysis" in issues:
+            focus.append("The previous analysis was too brief: cover every point above in depth, "
+                         "citing specific sources, in at least 300 words.")
+        if "insufficient_findings" in issues:
+            focus.append("State at least three distinct findings, each on its own line starting with 'Finding:'.")
+        return "\n            ".join(focus)
+
+    def _calculate_confidence(self, results: List[SourceRecord]) -> float:
         """Calculate confidence score based on source quality"""
         if not results:
             return 0.0
@@ -104,18 +176,22 @@ class AnalystAgent(BaseAgent):
 
         return sum(scores) / len(scores) if scores else 0.0
 
-    def _extract_findings(self, analysis: str) -> List[Dict[str, Any]]:
-        """Extract structured findings from analysis"""
+    def _extract_findings(self, analysis: str, source_ids: List[str]) -> List[Dict[str, Any]]:
+        """Extract structured findings from analysis, attributed to the sources they cite.
+
+        A finding that cites none of source_ids is attributed to no source.
+        """
         findings = []
         lines = analysis.split('\n')
 
         for line in lines:
             if any(keyword in line.lower() for keyword in ['finding', 'conclusion', 'result', 'shows']):
+                cited = [source_id for source_id in source_ids if source_id in line]
                 findings.append({
-                    "id": str(uuid.uuid4()),
                     "content": line.strip(),
                     "category": self._categorize_finding(line),
-                    "confidence": 0.8
+                    "confidence": 0.8,
+                    "source_ids": cited
                 })
 
         return findings
@@ -2,27 +2,26 @@ from typing import Dict
 import logging
 from datetime import datetime
 import json
-from langchain_openai import ChatOpenAI
 from core.agent_config import AgentConfig
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
+from core.model_router import ModelRouter
+from core.state_compactor import StateCompactor
 
 class BaseAgent:
   def __init__(self,config = AgentConfig):
     self.config = config
+    self.router = ModelRouter(config)
+    self.compactor = StateCompactor(max_prompt_chars=config.max_prompt_chars)
     self.llm = self.initiate_llm()
     self.tools = config.tools
     self.logger = self._setup_logger()
 
-  def initiate_llm(self):   
-        return ChatOpenAI(
-            api_key=openrouter_api_key,
-            base_url="https://openrouter.ai/api/v1",
-            model="liquid/lfm-2.5-1.2b-instruct:free",
-        )
+  def initiate_llm(self):
+        """Primary chat model for this agent's configured model or tier"""
+        return self.router.llm()
+
+  async def invoke_llm(self, prompt, inputs: Dict = None, tier: str = None):
+        """Run a prompt through the agent's routed model with fallback"""
+        return await self.router.ainvoke(prompt, inputs or {}, tier=tier)
 
   def _setup_logger(self):
         """Setup agent-specific logger"""
@@ -18,6 +18,7 @@ class ResearchCoordinatorAgent(BaseAgent):
     def __init__(self):
         config = AgentConfig(
             agent_type=AgentType.RESEARCH_COORDINATOR,
+            model_tier="fast",
             system_prompt="""You are a Research Coordinator. Your responsibilities:
             1. Analyze the research topic and break it into subtopics
             2. Determine the appropriate research methodology
@@ -51,9 +52,8 @@ class ResearchCoordinatorAgent(BaseAgent):
             """)
         ])
 
-        chain = prompt | self.llm
-        response = await chain.ainvoke({
-            "messages": state.get("messages", [])
+        response = await self.invoke_llm(prompt, {
+            "messages": self.compactor.bound_messages(state.get("messages", []))
         })
 
 
@@ -69,4 +69,8 @@ class ResearchCoordinatorAgent(BaseAgent):
 
         self.log_activity("coordination_completed", coordination_result)
 
-        return {"research_phase": "literature_review", "analysis": coordination_result}
+        return {
+            "research_phase": "literature_review",
+            "research_plan": response.content,
+            "analysis": coordination_result
+        }
@@ -1,18 +1,23 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, AsyncIterator, Optional, Tuple
+from collections import Counter, defaultdict, deque
 import asyncio
-from datetime import datetime
-import uuid
+import numpy as np
 from .base_agent import BaseAgent
 from core.agent_config import AgentConfig, AgentType
 from core.research_state import ResearchState
 from core.advanced_research import AdvancedResearch
 from core.content_analyzer import ContentAnalyzer
+from core.knowledge_base import KnowledgeBase
+from core.citation_index import CitationIndex
+from core.source_record import SourceRecord
+from core.deadline import current_deadline
 
 class SearchSpecialistAgent(BaseAgent):
     """Specializes in finding and evaluating sources"""
     def __init__(self):
         config = AgentConfig(
             agent_type=AgentType.SEARCH_SPECIALIST,
+            model_tier="fast",
             system_prompt="""You are a Search Specialist. Your responsibilities:
             1. Find relevant academic and web sources
             2. Evaluate source credibility and relevance
@@ -23,68 +28,290 @@ class SearchSpecialistAgent(BaseAgent):
             Prioritize recent, authoritative sources."""
         )
         super().__init__(config)
-        self.search_tool = AdvancedResearch()
         self.content_analyzer = ContentAnalyzer()
+        self.search_tool = AdvancedResearch(deadline_s=10.0, min_relevance=0.5, fetch_pages=True,
+                                            embed_fn=self.content_analyzer.embed)
+        self.knowledge_base = KnowledgeBase()
+        self.max_results = 3
+        # Adaptive breadth: wave_size queries start at once and each later query starts
+        # when a result shows novelty against the sources already held, or stagger_s
+        # after the previous one; low novelty skips the queries not yet started
+        self.wave_size = 2
+        self.stagger_s = 2.0
+        self.max_queries = 8
+        self.max_results_cap = 5
+        self.min_novelty = 0.15
+        self.widen_novelty = 0.45
+        self.provider_min_novelty = 0.1
+        self.gap_queries_per_pass = 3
 
     async def search(self, state: ResearchState) -> Dict[str, Any]:
         """Perform comprehensive search"""
+        async for batch in self.search_stream(state):
+            if batch["done"]:
+                return batch["update"]
+
+    async def search_stream(self, state: ResearchState) -> AsyncIterator[Dict[str, Any]]:
+        """Yield processed source batches as each query completes, then the state update.
+
+        Batches are {"done": False, "query", "results", "remaining", "novelty"}, where
+        results are the new sources found by that query in completion order and
+        remaining counts the queries still running or planned. The last item is
+        {"done": True, "update"} with every source in query order.
+        """
         topic = state["topic"]
+        queries, gap_fill = self._plan_queries(state)
+        planned = deque(queries)
+        widening = deque(query for query in self._widening_queries(topic) if query not in queries)
+        max_results = self.max_results
+        issued = []
+        search_results = []
+        results_by_query = {}
+        new_results = []
+        held = list(state.get("sources", [])) if gap_fill else []
+        seen_ids = {result.get("citation_id") for result in held}
+        citation_index = CitationIndex(state.get("citations", []))
+        held_vectors = await asyncio.to_thread(self._embed_sources, held)
+
+        loop = asyncio.get_running_loop()
+        pending = set()
+        last_launch = loop.time()
+        stopped = False
+        # Scores of batches that arrived with nothing held yet say nothing about breadth
+        measured = defaultdict(list)
+        query_novelty = {}
+        due = self.wave_size
+        try:
+            while True:
+                for _ in range(due):
+                    if stopped or not planned or len(issued) >= self.max_queries:
+                        break
+                    query = planned.popleft()
+                    issued.append(query)
+                    pending.add(asyncio.ensure_future(self._execute_search(
+                        query, topic, max_results, self._live_providers(measured)
+                    )))
+                    last_launch = loop.time()
+                due = 0
+                can_launch = bool(planned) and not stopped and len(issued) < self.max_queries
+                if not pending:
+                    if not can_launch:
+                        break
+                    due = 1
+                    continue
+                # The next planned query starts on novel results, or stagger_s after the last one
+                timeout = max(0.0, last_launch + self.stagger_s - loop.time()) if can_launch else None
+                done, pending = await asyncio.wait(pending, timeout=timeout,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    due = 1
+                    continue
+
+                batches = sorted((task.result() for task in done), key=lambda rb: issued.index(rb["query"]))
+                for completed, result_batch in enumerate(batches, 1):
+                    search_results.append(result_batch)
+                    query = result_batch["query"]
+                    batch = self._process_batch(result_batch, query, citation_index, seen_ids, new_results)
+                    results_by_query.setdefault(query, []).extend(batch)
+                    held_before = len(held_vectors)
+                    novelty, held_vectors = await asyncio.to_thread(
+                        self._score_novelty, result_batch, batch, held_vectors
+                    )
+                    scores = [score for _, score in novelty]
+                    if held_before and scores:
+                        for provider, score in novelty:
+                            measured[provider].append(score)
+                        batch_novelty = self._mean(scores)
+                        query_novelty[query] = round(batch_novelty, 3)
+                        if batch_novelty < self.min_novelty:
+                            # Mostly sources we already hold: the planned queries not yet
+                            # started would find the same, so they are skipped
+                            stopped = True
+                        else:
+                            due += 1
+                            if batch_novelty >= self.widen_novelty:
+                                max_results = min(self.max_results_cap, max_results + 1)
+                                if widening:
+                                    planned.append(widening.popleft())
+                    yield {
+                        "done": False,
+                        "query": query,
+                        "results": batch,
+                        "remaining": len(pending) + len(batches) - completed + (
+                            0 if stopped else min(len(planned), self.max_queries - len(issued))
+                        ),
+                        "novelty": self._mean(scores)
+                    }
+        finally:
+            # The consumer may stop early; do not leave queries running unobserved
+            for task in pending:
+                task.cancel()
+
+        processed_results = held + [result for query in issued for result in results_by_query.get(query, [])]
+        citations = citation_index.to_list()
+
+        if new_results:
+            await asyncio.get_event_loop().run_in_executor(
+                None, self.knowledge_base.add_sources, topic, [record.to_dict() for record in new_results]
+            )
 
+        self.log_activity("search_completed", {
+            "queries": issued,
+            "queries_skipped": list(planned),
+            "query_novelty": query_novelty,
+            "provider_novelty": {provider: round(self._mean(scores), 3) for provider, scores in measured.items()},
+            "providers_in_use": self._live_providers(measured),
+            "gap_fill": gap_fill,
+            "results_found": len(processed_results),
+            "knowledge_base_hits": len(processed_results) - len(held) - len(new_results),
+            "citations_indexed": len(citations),
+            "provider_calls_coalesced": self.search_tool.flights.stats()["coalesced"],
+            "query_cache": self.search_tool.query_cache.stats(),
+            "partial_rounds": sum(bool(batch.get("partial")) for batch in search_results),
+            "provider_latency_p90": {
+                name: snapshot["p90"] for name, snapshot in self.search_tool.latency_report().items()
+            }
+        })
 
-        queries = [
+        yield {
+            "done": True,
+            "update": {
+                # One collection of records; search_results refers into it by citation id
+                "search_results": [record.citation_id for record in processed_results],
+                "sources": processed_results,
+                "citations": citations,
+                "search_passes": state.get("search_passes", 0) + 1,
+                "research_phase": "analysis"
+            }
+        }
+
+    def _plan_queries(self, state: ResearchState) -> Tuple[List[str], bool]:
+        """The queries for this search pass and whether they fill a source gap.
+
+        Search only runs again when the analyst's router or the validator found
+        too few or too weak sources. Repeating the original queries would only be
+        served from the query cache, so every later pass searches for additional
+        sources and keeps the ones already held, even when none are held yet.
+        Each gap pass takes queries no earlier pass has issued.
+        """
+        topic = state["topic"]
+        search_passes = state.get("search_passes", 0)
+        if search_passes > 0:
+            return self._gap_queries(topic, search_passes), True
+        return [
             f"{topic.title} recent developments",
             f"{topic.domain} {topic.title} research papers",
             f"{topic.title} methodology best practices"
-        ]
+        ], False
 
- 
-        search_tasks = [self._execute_search(query) for query in queries]
-        search_results = await asyncio.gather(*search_tasks)
+    def _process_batch(self, result_batch: Dict[str, Any], query: str, citation_index: CitationIndex,
+                       seen_ids: set, new_results: List[SourceRecord]) -> List[SourceRecord]:
+        """Dedupe and analyze one query's results, returning the sources not seen before"""
+        processed = []
+        deadline = current_deadline()
+        for result in result_batch.get("results", []):
+            if deadline is not None:
+                deadline.check()
 
+            if AdvancedResearch.has_body(result):
+                # The same paper found by several queries becomes one source and one citation
+                citation_id = citation_index.add(result, query)
+                if citation_id in seen_ids:
+                    continue
+                seen_ids.add(citation_id)
 
-        processed_results = []
-        citations = []
+                if result.get("from_knowledge_base") and "analysis" in result:
+                    record = SourceRecord.from_result(result, citation_id)
+                else:
+                    content = result.get("content") or result.get("summary", "")
+                    record = SourceRecord.from_result(
+                        result, citation_id, self.content_analyzer.analyze_content(content)
+                    )
+                    new_results.append(record)
+                processed.append(record)
+        return processed
 
-        for result_batch in search_results:
-            for result in result_batch.get("results", []):
+    def _gap_queries(self, topic, gap_pass: int = 1) -> List[str]:
+        """Broader queries for the gap_pass-th search after a shortfall, none of them issued before.
 
-                if "content" in result or "summary" in result:
-                    content = result.get("content", result.get("summary", ""))
-                    analysis = self.content_analyzer.analyze_content(content)
+        The pool avoids the widening queries, which earlier passes may already
+        have issued; an exhausted pool plans no queries.
+        """
+        pool = [
+            f"{topic.title} survey",
+            f"{topic.title} review of literature",
+            f"{topic.domain} {topic.title} empirical evidence",
+            f"{topic.title} case studies",
+            f"{topic.title} meta-analysis",
+            f"{topic.domain} {topic.title} datasets and benchmarks",
+            f"{topic.title} critiques",
+            f"{topic.title} theoretical foundations",
+            f"{topic.title} future directions"
+        ]
+        pool.extend(f"{topic.title} {subtopic} survey" for subtopic in topic.subtopics)
+        start = (gap_pass - 1) * self.gap_queries_per_pass
+        return pool[start:start + self.gap_queries_per_pass]
 
-                    processed_result = {
-                        **result,
-                        "analysis": analysis,
-                        "processed_at": datetime.now().isoformat()
-                    }
-                    processed_results.append(processed_result)
-
-  
-                    citation = {
-                        "id": str(uuid.uuid4()),
-                        "title": result.get("title", "Untitled"),
-                        "authors": result.get("authors", ["Unknown"]),
-                        "source": result.get("source", "Unknown"),
-                        "url": result.get("url", ""),
-                        "accessed_at": datetime.now().isoformat()
-                    }
-                    citations.append(citation)
+    def _widening_queries(self, topic) -> List[str]:
+        """Queries added while results keep bringing new information"""
+        queries = [f"{topic.title} {subtopic}" for subtopic in topic.subtopics]
+        queries.extend([
+            f"{topic.title} applications",
+            f"{topic.title} challenges and limitations",
+            f"{topic.domain} {topic.title} open problems",
+            f"{topic.title} comparative analysis"
+        ])
+        return queries
 
-        self.log_activity("search_completed", {
-            "queries": queries,
-            "results_found": len(processed_results),
-            "citations_generated": len(citations)
-        })
+    def _embed_sources(self, sources: List[SourceRecord]) -> np.ndarray:
+        texts = [f"{source.get('title', '')} {(source.get('content') or source.get('summary') or '')[:500]}"
+                 for source in sources]
+        return self.content_analyzer.embed(texts)
 
-        return {
-            "search_results": processed_results,
-            "sources": processed_results,
-            "citations": citations,
-            "research_phase": "analysis"
-        }
+    def _score_novelty(self, result_batch: Dict[str, Any], batch: List[SourceRecord],
+                       held_vectors: np.ndarray) -> Tuple[List[Tuple[str, float]], np.ndarray]:
+        """Per-result novelty (provider, 1 - max similarity to held sources) and the extended held set.
+
+        Results dropped as duplicates of held sources score 0.
+        """
+        scores = []
+        vectors = self._embed_sources(batch)
+        for source, vector in zip(batch, vectors):
+            similarity = float(np.max(held_vectors @ vector)) if len(held_vectors) else 0.0
+            scores.append((source.get("source", "unknown"), 1.0 - max(0.0, similarity)))
+            held_vectors = np.vstack([held_vectors, vector[None, :]])
+        fetched = Counter(result.get("source", "unknown") for result in result_batch.get("results", [])
+                          if AdvancedResearch.has_body(result))
+        kept = Counter(source.get("source", "unknown") for source in batch)
+        for provider, count in fetched.items():
+            scores.extend([(provider, 0.0)] * max(0, count - kept[provider]))
+        return scores, held_vectors
+
+    def _live_providers(self, measured: Dict[str, List[float]]) -> List[str]:
+        """Providers to call next, leaving out those that keep returning sources we already hold"""
+        providers = [provider for provider in AdvancedResearch.PROVIDERS
+                     if self._mean(measured.get(provider, [1.0])) >= self.provider_min_novelty]
+        return providers or list(AdvancedResearch.PROVIDERS)
+
+    @staticmethod
+    def _mean(values: List[float]) -> float:
+        return sum(values) / len(values) if values else 0.0
+
+    async def _execute_search(self, query: str, topic, max_results: Optional[int] = None,
+                              providers: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Execute a single search query, serving known sources from the knowledge base first"""
+        max_results = max_results or self.max_results
+        loop = asyncio.get_event_loop()
+        known = await loop.run_in_executor(
+            None, self.knowledge_base.search_sources, query, topic.domain, max_results
+        )
+        if len(known) >= max_results:
+            return {"query": query, "results": known, "from_knowledge_base": True}
 
-    async def _execute_search(self, query: str) -> Dict[str, Any]:
-        """Execute a single search query"""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.search_tool.search_with_cache, query, 3
-        )
\ No newline at end of file
+        # to_thread carries the run's deadline into the search round
+        fetched = await asyncio.to_thread(self.search_tool.search_with_cache, query, max_results,
+                                          providers=providers)
+        known_ids = {KnowledgeBase.source_id(result) for result in known}
+        gaps = [result for result in fetched.get("results", [])
+                if KnowledgeBase.source_id(result) not in known_ids]
+        return {**fetched, "results": known + gaps[:max_results - len(known)]}
\ No newline at end of file
@@ -0,0 +1,181 @@
+from typing import Dict, Any, AsyncIterator, Tuple
+import asyncio
+import time
+from datetime import datetime
+from .base_agent import BaseAgent
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import SystemMessage, HumanMessage
+from core.agent_config import AgentConfig
+from core.agent_type import AgentType
+from core.research_state import ResearchState
+from core.citation_index import CitationIndex
+from core.deadline import DeadlineExceeded
+
+class WriterAgent(BaseAgent):
+    """Writes the final research paper"""
+
+    # Body sections have no dependencies on each other and are written concurrently
+    BODY_SECTIONS = {
+        "introduction": ("Introduction",
+                         "Motivate the topic, state the research questions and outline the paper."),
+        "literature_review": ("Literature Review",
+                              "Review the sources, grouping them by theme and noting agreements and conflicts."),
+        "methodology": ("Methodology",
+                        "Describe how sources were gathered and analyzed and the methods they report."),
+        "findings": ("Findings and Analysis",
+                     "Present each key finding with the evidence and sources that support it."),
+        "discussion": ("Discussion",
+                       "Interpret the findings, their implications and how they relate to each other."),
+        "limitations": ("Limitations",
+                        "Discuss the limitations of the evidence and of this review."),
+        "conclusion": ("Conclusion and Recommendations",
+                       "Summarize the conclusions and give concrete recommendations for further research.")
+    }
+    SECTION_ORDER = ["abstract", *BODY_SECTIONS, "references"]
+
+    def __init__(self):
+        config = AgentConfig(
+            agent_type=AgentType.WRITER,
+            model_tier="standard",
+            system_prompt="""You are an Academic Writer. Your responsibilities:
+            1. Write clear, well-structured sections of a research paper
+            2. Ground every claim in the provided research context
+            3. Cite sources by their id in square brackets
+            4. Keep terminology consistent across sections
+
+            Write in a formal academic register."""
+        )
+        super().__init__(config)
+
+    async def write(self, state: ResearchState) -> Dict[str, Any]:
+        """Generate the final research paper"""
+        started = time.perf_counter()
+        content = {}
+        async for section, text in self.write_stream(state):
+            content[section] = text
+        content = {section: content.get(section, "") for section in self.SECTION_ORDER}
+
+        section_word_counts = {
+            section: len(text.split()) for section, text in content.items() if section != "references"
+        }
+        final_paper = {
+            "title": f"Research Report: {state['topic'].title}",
+            "sections": ["Title and Abstract"] + [title for title, _ in self.BODY_SECTIONS.values()]
+                        + ["References"],
+            "content": content,
+            "generated_at": datetime.now().isoformat(),
+            "generation_time": time.perf_counter() - started,
+            "word_count": sum(section_word_counts.values()),
+            "section_word_counts": section_word_counts,
+            "citations_count": len(state.get("citations", [])),
+            "metadata": state.get("metadata", {})
+        }
+
+        self.log_activity("paper_written", {
+            "topic": state["topic"].title,
+            "word_count": final_paper["word_count"],
+            "generation_time": final_paper["generation_time"]
+        })
+
+        return {
+            "final_paper": final_paper,
+            "research_phase": "completed",
+            "completion_time": datetime.now().isoformat()
+        }
+
+    async def write_stream(self, state: ResearchState) -> AsyncIterator[Tuple[str, str]]:
+        """Yield (section, text) as sections complete: the body, then the abstract, then references"""
+        context = self.pack_context(state)
+        tasks = [asyncio.create_task(self._write_section(section, context, state))
+                 for section in self.BODY_SECTIONS]
+        body = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                section, text = await next_done
+                body[section] = text
+                self.log_activity("section_written", {"section": section, "words": len(text.split())})
+                yield section, text
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        # The abstract summarizes the finished body, so it is the one sequential step
+        yield "abstract", await self._write_abstract(state, body)
+        yield "references", CitationIndex(state.get("citations", [])).format_apa()
+
+    def pack_context(self, state: ResearchState) -> str:
+        """Research context shared by every section prompt, packed once per paper"""
+        topic = state["topic"]
+        analysis = state.get("analysis", {}).get("comprehensive_analysis", "")
+        findings = "\n".join(f"- {finding['content']}" for finding in state.get("findings", [])[:20])
+        budget = self.compactor.max_prompt_chars
+        return "\n\n".join([
+            f"Topic: {topic.title}\nDomain: {topic.domain}",
+            "Research plan:\n" + self.compactor.bound_text(state.get("research_plan", ""), budget // 6),
+            "Analysis:\n" + self.compactor.bound_text(analysis, budget // 4),
+            "Key findings:\n" + self.compactor.bound_text(findings, budget // 6),
+            "Limitations:\n" + "\n".join(f"- {item}" for item in state.get("limitations", [])),
+            "Recommendations:\n" + "\n".join(f"- {item}" for item in state.get("recommendations", [])),
+            "Sources:\n" + self.compactor.pack_sources(state.get("sources", []), budget // 3)
+        ])
+
+    async def _write_section(self, section: str, context: str, state: ResearchState) -> Tuple[str, str]:
+        """Write one body section; falls back to what the state already holds on error"""
+        title, guide = self.BODY_SECTIONS[section]
+        # The shared context comes first so every section prompt has the same prefix
+        prompt = ChatPromptTemplate.from_messages([
+            SystemMessage(content=self.config.system_prompt),
+            HumanMessage(content=f"""
+            Research context:
+            {context}
+
+            Write the "{title}" section of the research paper. {guide}
+            Return only the section text, without a heading.
+            """)
+        ])
+        try:
+            response = await self.invoke_llm(prompt)
+            return section, response.content.strip()
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"Error writing section {section}: {e}")
+            return section, self._fallback_section(section, state)
+
+    async def _write_abstract(self, state: ResearchState, body: Dict[str, str]) -> str:
+        """Write the abstract from the finished body sections"""
+        sections = "\n\n".join(
+            f"{self.BODY_SECTIONS[section][0]}:\n{self.compactor.bound_text(text, 1500)}"
+            for section, text in body.items() if text
+        )
+        prompt = ChatPromptTemplate.from_messages([
+            SystemMessage(content=self.config.system_prompt),
+            HumanMessage(content=f"""
+            Write a 150-250 word abstract for a research paper on: {state['topic'].title}
+
+            Paper sections:
+            {sections}
+
+            Return only the abstract text.
+            """)
+        ])
+        try:
+            response = await self.invoke_llm(prompt)
+            return response.content.strip()
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"Error writing abstract: {e}")
+            return self.compactor.bound_text(body.get("introduction", ""), 1500)
+
+    def _fallback_section(self, section: str, state: ResearchState) -> str:
+        """Section text assembled from state when generation fails"""
+        if section == "findings":
+            return "\n".join(finding["content"] for finding in state.get("findings", []))
+        if section == "limitations":
+            return "\n".join(state.get("limitations", []))
+        if section == "conclusion":
+            return "\n".join(state.get("recommendations", []))
+        if section in ("literature_review", "methodology"):
+            return state.get(section, "")
+        return ""
@@ -0,0 +1,104 @@
+"""End-to-end benchmark of ResearchAssistantGraph over recorded interactions.
+
+Record once against the live services, then replay offline:
+
+    python -m benchmarks.replay_benchmark --cassette cassettes/dcf.jsonl --mode record
+    python -m benchmarks.replay_benchmark --cassette cassettes/dcf.jsonl --runs 5 --latency none
+
+Replay needs no network access, but the sentence-transformers embedding model
+must already be in the local HuggingFace cache.
+"""
+from typing import Dict, Any, List
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from core.cassette import Cassette, use_cassette
+from core.knowledge_base import KnowledgeBase
+from core.research_topic import ResearchTopic
+from graph.research_assistant_graph import ResearchAssistantGraph
+
+
+class ReplayBenchmark:
+    """Run the research graph against a cassette and report per-node and total time"""
+
+    def __init__(self, cassette_path: str, mode: str = "replay", latency="recorded"):
+        self.cassette_path = cassette_path
+        self.mode = mode
+        self.latency = latency
+        self.assistant = ResearchAssistantGraph()
+
+    def _reset(self):
+        """Start each run cold so runs are comparable"""
+        self.assistant.node_timings = []
+        search_tool = self.assistant.agents["search_specialist"].search_tool
+        search_tool.cache.clear()
+        search_tool.query_cache.clear()
+        for agent in self.assistant.agents.values():
+            if hasattr(agent, "knowledge_base"):
+                agent.knowledge_base = KnowledgeBase(":memory:")
+
+    async def run_once(self, topic: ResearchTopic) -> Dict[str, Any]:
+        self._reset()
+        cassette = Cassette(self.cassette_path, mode=self.mode, latency=self.latency)
+        started = time.perf_counter()
+        with use_cassette(cassette):
+            await self.assistant.run_research(topic)
+        return {
+            "total": time.perf_counter() - started,
+            "nodes": list(self.assistant.node_timings),
+            "cassette_hits": cassette.hits,
+            "cassette_misses": cassette.misses
+        }
+
+    async def run(self, topic: ResearchTopic, runs: int = 3) -> Dict[str, Any]:
+        results = [await self.run_once(topic) for _ in range(runs)]
+        return self.summarize(results)
+
+    @staticmethod
+    def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        per_node: Dict[str, List[float]] = {}
+        for result in results:
+            run_totals: Dict[str, float] = {}
+            for timing in result["nodes"]:
+                run_totals[timing["node"]] = run_totals.get(timing["node"], 0.0) + timing["duration"]
+            for node, duration in run_totals.items():
+                per_node.setdefault(node, []).append(duration)
+
+        describe = lambda values: {
+            "mean": statistics.mean(values),
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+            "runs": len(values)
+        }
+        return {
+            "runs": len(results),
+            "total": describe([result["total"] for result in results]),
+            "nodes": {node: describe(values) for node, values in sorted(per_node.items())},
+            "cassette_misses": sum(result["cassette_misses"] for result in results)
+        }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Record/replay benchmark for the research graph")
+    parser.add_argument("--cassette", required=True)
+    parser.add_argument("--mode", choices=Cassette.MODES, default="replay")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency", default="recorded",
+                        help="'recorded', 'none' or a fixed delay in seconds per call")
+    parser.add_argument("--title", default="Discounted Cash Flow in modern world")
+    parser.add_argument("--domain", default="Finance")
+    parser.add_argument("--complexity", default="expert")
+    args = parser.parse_args()
+
+    latency = args.latency if args.latency in ("recorded", "none") else float(args.latency)
+    benchmark = ReplayBenchmark(args.cassette, mode=args.mode, latency=latency)
+    topic = ResearchTopic(title=args.title, domain=args.domain, complexity=args.complexity)
+    runs = 1 if args.mode == "record" else args.runs
+    print(json.dumps(await benchmark.run(topic, runs), indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Per-checkpoint serialization cost of ResearchState at realistic sizes.
+
+Every node transition writes the full state to the checkpointer, so the cost
+of one dumps_typed/loads_typed round trip is paid per node per run:
+
+    python -m benchmarks.serde_benchmark --sources 50 500 2000 --iterations 50
+"""
+from typing import Dict, Any, List
+import argparse
+import statistics
+import time
+from datetime import datetime
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from core.research_topic import ResearchTopic
+from core.source_record import SourceRecord
+from core.state_serde import ResearchStateSerializer
+
+
+def build_state(sources: int, findings: int, messages: int) -> Dict[str, Any]:
+    """A ResearchState shaped like the ones produced by the search and analyst nodes"""
+    topic = ResearchTopic(title="Discounted Cash Flow in modern world", domain="Finance",
+                          complexity="expert", subtopics=["terminal value", "WACC"])
+    records = [SourceRecord.from_result({
+        "source": "arxiv" if i % 2 else "web",
+        "title": f"Paper {i} on discounted cash flow valuation",
+        "authors": ["A. Author", "B. Author", "C. Author"],
+        "summary": "Discounted cash flow valuation of firms under uncertainty. " * 8,
+        "published": "2024-01-15",
+        "url": f"http://arxiv.org/abs/2401.{i:05d}v1",
+        "relevance_score": 0.9
+    }, f"arxiv:2401.{i:05d}", {"chunks": 1, "word_count": 64, "sentence_count": 9}) for i in range(sources)]
+    history = [SystemMessage(content="You are an advanced research assistant.")]
+    history += [(HumanMessage if i % 2 else AIMessage)(content="Research plan step. " * 40, id=str(i))
+                for i in range(messages)]
+    return {
+        "messages": history,
+        "topic": topic,
+        "research_phase": "analysis",
+        "research_plan": "1. Key research questions\n" * 40,
+        "search_results": [record.citation_id for record in records],
+        "sources": records,
+        "analysis": {"comprehensive_analysis": "Finding: cash flows dominate. " * 200,
+                     "confidence_score": 0.82},
+        "findings": [{"id": f"f{i}", "content": f"Finding {i}: terminal value dominates",
+                      "category": "result", "confidence": 0.8} for i in range(findings)],
+        "citations": [{"id": record.citation_id, "title": record.title,
+                       "authors": list(record.authors), "queries": ["q1", "q2"]} for record in records],
+        "validation_errors": [],
+        "metadata": {"start_time": datetime.now().isoformat(), "topic_id": "bench"}
+    }
+
+
+def measure(serializer, state: Dict[str, Any], iterations: int) -> Dict[str, float]:
+    dump_times: List[float] = []
+    load_times: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        typed = serializer.dumps_typed(state)
+        dump_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        serializer.loads_typed(typed)
+        load_times.append(time.perf_counter() - started)
+    return {
+        "type": typed[0],
+        "bytes": len(typed[1]),
+        "dumps_ms": statistics.median(dump_times) * 1000,
+        "loads_ms": statistics.median(load_times) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark checkpoint serialization of ResearchState")
+    parser.add_argument("--sources", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--findings", type=int, default=40)
+    parser.add_argument("--messages", type=int, default=12)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    serializers = {"jsonplus": JsonPlusSerializer(), "research-msgpack": ResearchStateSerializer()}
+    print(f"{'sources':>8} {'serializer':>18} {'type':>18} {'bytes':>12} {'dumps ms':>10} {'loads ms':>10}")
+    for count in args.sources:
+        state = build_state(count, args.findings, args.messages)
+        for name, serializer in serializers.items():
+            result = measure(serializer, state, args.iterations)
+            print(f"{count:>8} {name:>18} {result['type']:>18} {result['bytes']:>12,} "
+                  f"{result['dumps_ms']:>10.2f} {result['loads_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
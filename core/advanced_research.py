@@ -1,42 +1,127 @@
-from typing import List, Dict
-from langchain_community.tools import DuckDuckGoSearchRun
-from langchain_community.utilities import ArxivAPIWrapper
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Callable
+from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextvars import ContextVar
 from datetime import datetime
+import contextvars
 import hashlib
+import threading
+import time
+from core.citation_index import canonical_citation_id
+from core.arxiv_client import ArxivBatchClient
+from core.page_fetcher import PageFetcher
+from core.semantic_query_cache import SemanticQueryCache
+from core.single_flight import SingleFlight
+from core.latency_histogram import LatencyHistogram
+from core.cassette import active_cassette
+from core.persistent_cache import shared_cache
+from core.deadline import current_deadline
+
+
+# Monotonic time at which the search round a provider call belongs to returns
+_round_ends: ContextVar[Optional[float]] = ContextVar("search_round_ends", default=None)
 
 
 class AdvancedResearch:
-  def __init__(self):
-    self.search_tool = DuckDuckGoSearchRun()
-    self.arxiv_wrapper = ArxivAPIWrapper()
+  PROVIDERS = ("web", "arxiv", "scholar")
+  # Placeholder providers whose canned results must not satisfy a round's quorum
+  MOCK_PROVIDERS = ("scholar",)
+  # Shared by every instance so concurrent runs coalesce identical provider calls
+  flights = SingleFlight()
+  # Long-lived pool so stragglers can finish in the background after a round returns
+  provider_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="search-provider")
+  provider_latency = {
+      "web": LatencyHistogram(),
+      "arxiv": LatencyHistogram(),
+      "scholar": LatencyHistogram(),
+  }
+
+  def __init__(self, deadline_s: Optional[float] = None, min_relevance: float = 0.0,
+               cancel_stragglers: bool = False, fetch_pages: bool = False,
+               embed_fn: Optional[Callable] = None, query_thresholds: Optional[Dict[str, float]] = None):
+    self.search_tool = DuckDuckGoSearchAPIWrapper()
+    # Optional stage that replaces web snippets with the main text of each result page
+    self.page_fetcher = PageFetcher() if fetch_pages else None
+    # Shared so queries from every run are batched and paced together
+    self.arxiv_client = ArxivBatchClient.shared()
     self.cache = {}
+    self._cache_lock = threading.Lock()
+    # Per-provider results, also served to paraphrases of a cached query
+    self.query_cache = SemanticQueryCache(embed_fn=embed_fn, thresholds=query_thresholds)
+    # Latency budget per search round; None waits for every provider
+    self.deadline_s = deadline_s
+    self.min_relevance = min_relevance
+    self.cancel_stragglers = cancel_stragglers
 
-  def search_with_cache(self,query:str,max_results:int=5) -> Dict[str,any]:
-    cache_key = hashlib.md5(query.encode()).hexdigest() # Corrected from m5 to md5
+  def search_with_cache(self,query:str,max_results:int=5,deadline_s:Optional[float]=None,
+                        min_results:Optional[int]=None,providers:Optional[List[str]]=None) -> Dict[str,any]:
+    # A round over a subset of providers is cached separately from a full round
+    scope = "" if providers is None else "|" + ",".join(sorted(providers))
+    cache_key = hashlib.md5((query + scope).encode()).hexdigest() # Corrected from m5 to md5
     if cache_key in self.cache:
       return self.cache[cache_key]
 
+    deadline_s = self.deadline_s if deadline_s is None else deadline_s
+    min_results = max_results if min_results is None else min_results
     try:
-      with ThreadPoolExecutor(max_workers=3) as executor: # Corrected typo: ThreadPoolEcecutor -> ThreadPoolExecutor
-        futures=[
-            executor.submit(self._web_search,query,max_results),
-            executor.submit(self._arxiv_search,query,max_results),
-            executor.submit(self._scholar_search,query,max_results),
-        ]
-        results=[]
-        for future in as_completed(futures):
+      searches = {
+          "web": self._web_search,
+          "arxiv": self._arxiv_search,
+          "scholar": self._scholar_search,
+      }
+      searches = {name: search for name, search in searches.items() if providers is None or name in providers}
+      started = time.monotonic()
+      round_ends = None if deadline_s is None else started + deadline_s
+      # Each provider thread runs in a copy of this context so it sees the run's deadline
+      futures = {
+          self.provider_pool.submit(self._round_context(round_ends).run, self._timed_search,
+                                    name, search, query, max_results): name
+          for name, search in searches.items()
+      }
+      deadline = current_deadline()
+      results=[]
+      quorum_results = []
+      pending = set(futures)
+      while pending:
+        timeout = None if deadline_s is None else max(0.0, deadline_s - (time.monotonic() - started))
+        if deadline is not None:
+          timeout = deadline.bound(timeout)
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
           try:
-            results.extend(future.result())
+            provider_results = future.result()
           except Exception as e:
             print(f"Search error {e}")
+            continue
+          results.extend(provider_results)
+          if futures[future] not in self.MOCK_PROVIDERS:
+            quorum_results.extend(provider_results)
+        if deadline is not None and deadline.cancelled:
+          break
+        if deadline_s is None:
+          continue
+        # Return early once enough distinct, usable results are in, or when the budget is spent
+        relevant = sum(self.has_body(r) and r.get("relevance_score", 0.0) >= self.min_relevance
+                       for r in self._deduplicate_results(quorum_results))
+        if relevant >= min_results or not done:
+          break
+
       unique_results = self._deduplicate_results(results)
       result_dict={
           "query":query,
           "timestamp":datetime.now().isoformat(),
-          "results":unique_results[:max_results]
+          "results":unique_results[:max_results],
+          "partial": bool(pending),
+          "pending_providers": sorted(futures[f] for f in pending)
       }
-      self.cache[cache_key]=result_dict
+      with self._cache_lock:
+        self.cache[cache_key]=result_dict
+      for future in pending:
+        if self.cancel_stragglers and future.cancel():
+          continue
+        future.add_done_callback(
+            lambda f, name=futures[future]: self._merge_late_results(cache_key, name, f, max_results)
+        )
       return result_dict
     except Exception as e: # Added missing except block
       print(f"An error occurred in search_with_cache: {e}")
@@ -47,30 +132,113 @@ class AdvancedResearch:
           "error": str(e)
       }
 
+  @staticmethod
+  def _round_context(round_ends: Optional[float]) -> contextvars.Context:
+    """A copy of this context that also carries when the current round returns"""
+    context = contextvars.copy_context()
+    context.run(_round_ends.set, round_ends)
+    return context
+
+  def _timed_search(self, provider: str, search, query: str, max_results: int) -> List[Dict]:
+    deadline = current_deadline()
+    if deadline is not None:
+      deadline.check()
+    cached = self.query_cache.get(provider, query, max_results)
+    if cached is not None:
+      return cached
+    # Results fetched by any worker process are reused from the shared cache
+    persistent = shared_cache()
+    payload = {"provider": provider, "query": query, "max_results": max_results}
+    if persistent is not None:
+      cached = persistent.get("search", payload)
+      if cached is not None:
+        self.query_cache.put(provider, query, max_results, cached)
+        return cached
+    results = self.flights.do((provider, query, max_results), self._provider_call, provider, search, query, max_results)
+    self.query_cache.put(provider, query, max_results, results)
+    if persistent is not None and results:
+      persistent.set("search", payload, results)
+    return results
+
+  def _provider_call(self, provider: str, search, query: str, max_results: int) -> List[Dict]:
+    """Call a provider, or record/replay the call when a cassette is active.
+
+    Runs only in the flight leader, so each provider call is timed once however
+    many rounds waited on it.
+    """
+    started = time.perf_counter()
+    try:
+      cassette = active_cassette()
+      if cassette is None:
+        return search(query, max_results)
+      payload = {"provider": provider, "query": query, "max_results": max_results}
+      return cassette.call(f"search:{provider}", payload, lambda: search(query, max_results))
+    finally:
+      self.provider_latency[provider].record(time.perf_counter() - started)
+
+  def _merge_late_results(self, cache_key: str, provider: str, future, max_results: int):
+    """Fold a straggler provider's results into the cached round for the next lookup"""
+    if future.cancelled() or future.exception() is not None:
+      return
+    with self._cache_lock:
+      entry = self.cache.get(cache_key)
+      if entry is None:
+        return
+      merged = self._deduplicate_results(entry["results"] + future.result())
+      pending = [name for name in entry.get("pending_providers", []) if name != provider]
+      # Replace rather than mutate so concurrent readers never see a half-updated entry
+      self.cache[cache_key] = {
+          **entry,
+          "results": merged[:max_results],
+          "partial": bool(pending),
+          "pending_providers": pending
+      }
+
+  @classmethod
+  def latency_report(cls) -> Dict[str, Dict]:
+    """Per-provider latency histograms for tuning round budgets"""
+    return {name: histogram.snapshot() for name, histogram in cls.provider_latency.items()}
+
   def _web_search(self,query:str,max_results:int) -> List[Dict]:
+    """Search the web, one structured result per hit"""
     try:
-      results = self.search_tool.run(query)
-      return [{
+      hits = self.search_tool.results(query, max_results=max_results)
+    except Exception as e:
+      print(f"Web search error: {e}")
+      return []
+    pages = {}
+    if self.page_fetcher is not None:
+      timeout = sum(self.page_fetcher.timeout)
+      round_ends = _round_ends.get()
+      if round_ends is not None:
+        # Fetch only within what is left of the round's budget
+        timeout = min(timeout, max(0.0, round_ends - time.monotonic()))
+      deadline = current_deadline()
+      pages = self.page_fetcher.fetch_many([hit.get("link", "") for hit in hits],
+                                           timeout=deadline.bound(timeout) if deadline else timeout)
+    results = []
+    for hit in hits:
+      url = hit.get("link", "")
+      page = pages.get(url)
+      results.append({
           "source":"web",
-          "content":results[:1000],
+          "title":hit.get("title", ""),
+          "url":url,
+          "snippet":hit.get("snippet", ""),
+          "content":page["text"] if page else hit.get("snippet", ""),
+          "page_fetched":page is not None,
           "relevance_score":0.8
-      }]
-    except:
-      return []
+      })
+    return results
 
   def _arxiv_search(self, query: str, max_results: int) -> List[Dict]:
         """Search arXiv for academic papers"""
         try:
-            docs = self.arxiv_wrapper.load(query[:300])
-            return [{
-                "source": "arxiv",
-                "title": doc.metadata.get("Title", ""),
-                "authors": doc.metadata.get("Authors", []),
-                "summary": doc.page_content[:500],
-                "published": doc.metadata.get("Published", ""),
-                "relevance_score": 0.9
-            } for doc in docs[:max_results]]
-        except:
+            deadline = current_deadline()
+            timeout = deadline.bound(60) if deadline else 60
+            return self.arxiv_client.search(query[:300], max_results).result(timeout=timeout)
+        except Exception as e:
+            print(f"arXiv search error: {e}")
             return []
 
   def _scholar_search(self, query: str, max_results: int) -> List[Dict]: # Corrected indentation
@@ -83,12 +251,18 @@ class AdvancedResearch:
             "relevance_score": 0.85
         }]
 
+  @staticmethod
+  def has_body(result: Dict) -> bool:
+    """Whether a result has text the search specialist can turn into a source"""
+    return bool(result.get("content") or result.get("summary"))
+
   def _deduplicate_results(self, results: List[Dict]) -> List[Dict]:
     seen = set()
     unique=[]
     for result in results:
-      content_hash = hashlib.md5(str(result.get('title','') + result.get('content', '')).encode()).hexdigest()
-      if content_hash not in seen:
-        seen.add(content_hash)
-        unique.append(result) # Corrected: append result, not hash
-    return unique
\ No newline at end of file
+      # Same paper or page reached through different providers collapses to one entry
+      citation_id = canonical_citation_id(result)
+      if citation_id not in seen:
+        seen.add(citation_id)
+        unique.append(result)
+    return unique
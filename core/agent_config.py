@@ -1,14 +1,19 @@
 from dataclasses import dataclass, field
-from typing import List, Any
+from typing import List, Any, Optional
 from core.agent_type import AgentType
 
 @dataclass
 class AgentConfig:
     """Configuration for individual agents"""
     agent_type: AgentType
-    llm_model: str = "liquid/lfm-2.5-1.2b-instruct:free"
+    llm_model: Optional[str] = None  # Explicit model; overrides model_tier when set
+    model_tier: str = "standard"  # "fast", "standard" or "strong"
+    fallback_model: Optional[str] = None
     temperature: float = 0.3
     max_tokens: int = 2000
+    latency_threshold: float = 60.0  # Seconds before a call falls back to the secondary model
+    error_threshold: int = 3  # Consecutive errors before a model is bypassed
+    max_prompt_chars: int = 12000  # Upper bound on context packed into one prompt
     tools: List[Any] = field(default_factory=list)
     system_prompt: str = ""
-    is_async: bool = False
\ No newline at end of file
+    is_async: bool = False
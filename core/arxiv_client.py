@@ -0,0 +1,182 @@
+from typing import Dict, List, Optional, Any, Tuple
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import queue
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+import requests
+from core.citation_index import normalize_arxiv_id
+
+
+class ArxivBatchClient:
+    """Process-wide arXiv client that batches queries and paces requests.
+
+    Queries submitted within a short window are combined into one API
+    request as an OR of per-query clauses, and the entries that come back
+    are split again per query. Every request, from any run in the process, waits for arXiv's
+    minimum interval since the previous one, which keeps parallel runs from
+    being throttled. The pacing wait doubles as batching time.
+    """
+
+    API_URL = "https://export.arxiv.org/api/query"
+    NAMESPACES = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+    # Words that describe the kind of search rather than its subject
+    GENERIC_TERMS = frozenset({
+        "a", "an", "the", "in", "on", "of", "for", "to", "and", "or", "with", "about", "by",
+        "recent", "developments", "research", "papers", "paper", "methodology", "best",
+        "practices", "survey", "review", "literature", "empirical", "evidence", "study", "studies"
+    })
+
+    _shared: Optional["ArxivBatchClient"] = None
+    _shared_lock = threading.Lock()
+    # Pacing is global: one request at a time, min_interval apart, across all clients
+    _pace_lock = threading.Lock()
+    _last_request = 0.0
+
+    def __init__(self, window_s: float = 0.25, max_batch: int = 8, min_interval: float = 3.0,
+                 timeout: float = 30.0, min_overlap: float = 0.5):
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.min_overlap = min_overlap
+        self.session = requests.Session()
+        self.requests_sent = 0
+        self.queries_served = 0
+        self._queue: "queue.Queue[Tuple[str, int, Future]]" = queue.Queue()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="arxiv-batcher", daemon=True)
+        self._dispatcher.start()
+
+    @classmethod
+    def shared(cls) -> "ArxivBatchClient":
+        """Client shared by every AdvancedResearch instance in the process"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def search(self, query: str, max_results: int = 5) -> Future:
+        """Queue a search; the future resolves to result dicts for this query alone"""
+        future = Future()
+        self._queue.put((query, max_results, future))
+        return future
+
+    def stats(self) -> Dict[str, int]:
+        return {"requests": self.requests_sent, "queries": self.queries_served, "pending": self._queue.qsize()}
+
+    def _dispatch_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            # Keep collecting until both the window and the pacing interval have passed
+            deadline = max(time.monotonic() + self.window_s,
+                           ArxivBatchClient._last_request + self.min_interval)
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._search_batch(batch)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _search_batch(self, items: List[Tuple[str, int, Future]]):
+        terms_by_item = [self._terms(query) for query, _, _ in items]
+        for (_, _, future), terms in zip(items, terms_by_item):
+            if not terms:
+                future.set_result([])
+        items = [item for item, terms in zip(items, terms_by_item) if terms]
+        terms_by_item = [terms for terms in terms_by_item if terms]
+        if not items:
+            return
+        clauses = ["(" + " AND ".join(f"all:{term}" for term in sorted(terms)) + ")" for terms in terms_by_item]
+        entries = self._request({
+            "search_query": " OR ".join(clauses),
+            "max_results": sum(max_results for _, max_results, _ in items) * 2,
+            "sortBy": "relevance"
+        })
+        self.queries_served += len(items)
+
+        for (query, max_results, future), terms in zip(items, terms_by_item):
+            scored = []
+            for position, entry in enumerate(entries):
+                text_terms = set(re.findall(r"\w+", (entry["title"] + " " + entry["summary"]).lower()))
+                overlap = len(terms & text_terms) / len(terms)
+                if len(items) == 1 or overlap >= self.min_overlap:
+                    scored.append((-overlap, position, entry))
+            scored.sort(key=lambda item: item[:2])
+            future.set_result([dict(entry) for _, _, entry in scored[:max_results]])
+
+    def _terms(self, query: str) -> set:
+        """Subject terms of a query, falling back to every word when all of them are generic"""
+        words = re.findall(r"\w+", query.lower()[:300])
+        terms = [word for word in words if word not in self.GENERIC_TERMS] or words
+        return set(terms[:8])
+
+    def _request(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Send one paced API request, retrying once if arXiv asks us to slow down within the timeout"""
+        for attempt in range(2):
+            with ArxivBatchClient._pace_lock:
+                wait_s = ArxivBatchClient._last_request + self.min_interval - time.monotonic()
+                if wait_s > 0:
+                    time.sleep(wait_s)
+                try:
+                    response = self.session.get(self.API_URL, params=params, timeout=self.timeout)
+                finally:
+                    ArxivBatchClient._last_request = time.monotonic()
+                    self.requests_sent += 1
+            if response.status_code in (429, 503) and attempt == 0:
+                delay = self._retry_after(response.headers.get("Retry-After"))
+                if delay > self.timeout:
+                    # The one dispatcher thread serves every query in the process; failing this
+                    # batch is better than stalling all of them for the whole delay
+                    raise requests.HTTPError(f"arXiv asked to retry after {delay:.0f}s", response=response)
+                time.sleep(delay)
+                continue
+            response.raise_for_status()
+            return self._parse(response.content)
+        return []
+
+    def _retry_after(self, value: Optional[str]) -> float:
+        """Seconds to wait per a Retry-After header in seconds or HTTP-date form, else min_interval"""
+        if not value:
+            return self.min_interval
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return self.min_interval
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def _parse(self, feed: bytes) -> List[Dict[str, Any]]:
+        ns = self.NAMESPACES
+        results = []
+        for entry in ET.fromstring(feed).findall("atom:entry", ns):
+            entry_id = entry.findtext("atom:id", "", ns)
+            results.append({
+                "source": "arxiv",
+                "title": " ".join(entry.findtext("atom:title", "", ns).split()),
+                "authors": ", ".join(author.findtext("atom:name", "", ns)
+                                     for author in entry.findall("atom:author", ns)),
+                "summary": " ".join(entry.findtext("atom:summary", "", ns).split())[:500],
+                "published": entry.findtext("atom:published", "", ns)[:10],
+                "url": entry_id,
+                "arxiv_id": normalize_arxiv_id(entry_id),
+                "doi": entry.findtext("arxiv:doi", "", ns),
+                "relevance_score": 0.9
+            })
+        return results
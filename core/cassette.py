@@ -0,0 +1,142 @@
+from typing import Any, Callable, Awaitable, Dict, Optional, Union
+from contextlib import contextmanager
+from collections import defaultdict, deque
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when no recorded interaction matches a request"""
+
+
+class Cassette:
+    """Record LLM and search-provider interactions to a JSONL file and replay them.
+
+    Each entry stores the request payload, the response and the observed
+    latency. Replay first looks for an exact payload match and otherwise
+    serves the next unused entry recorded for the same route (for example the
+    same model or provider), so prompts that embed timestamps still replay in
+    order. Replay latency is either the recorded one, none, or a fixed
+    synthetic delay in seconds. Recording starts a new file, so re-recording
+    never leaves stale interactions ahead of the fresh ones.
+    """
+
+    MODES = ("record", "replay")
+
+    def __init__(self, path: str, mode: str = "replay", latency: Union[str, float] = "recorded"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unsupported cassette mode '{mode}', expected one of {self.MODES}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, deque] = defaultdict(deque)
+        self._by_route: Dict[str, deque] = defaultdict(deque)
+        self.hits = 0
+        self.misses = 0
+        if mode == "replay":
+            self._load()
+        else:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w", encoding="utf-8").close()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entry["used"] = False
+                    self._by_key[entry["key"]].append(entry)
+                    self._by_route[entry["route"]].append(entry)
+
+    @staticmethod
+    def key(payload: Dict[str, Any]) -> str:
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def lookup(self, route: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            for queue in (self._by_key.get(self.key(payload)), self._by_route.get(route)):
+                while queue and queue[0]["used"]:
+                    queue.popleft()
+                if queue:
+                    entry = queue.popleft()
+                    entry["used"] = True
+                    self.hits += 1
+                    return entry
+            self.misses += 1
+        raise CassetteMiss(f"No recorded interaction for route '{route}'")
+
+    def record(self, route: str, payload: Dict[str, Any], response: Any, latency: float):
+        entry = {
+            "route": route,
+            "key": self.key(payload),
+            "request": payload,
+            "response": response,
+            "latency": latency
+        }
+        line = json.dumps(entry, default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def replay_delay(self, entry: Dict[str, Any]) -> float:
+        if self.latency == "recorded":
+            return entry.get("latency", 0.0)
+        if self.latency == "none":
+            return 0.0
+        return float(self.latency)
+
+    def call(self, route: str, payload: Dict[str, Any], fn: Callable[[], Any],
+             encode: Callable[[Any], Any] = lambda value: value,
+             decode: Callable[[Any], Any] = lambda value: value) -> Any:
+        """Replay or record a synchronous call"""
+        if self.mode == "replay":
+            entry = self.lookup(route, payload)
+            time.sleep(self.replay_delay(entry))
+            return decode(entry["response"])
+        started = time.perf_counter()
+        result = fn()
+        self.record(route, payload, encode(result), time.perf_counter() - started)
+        return result
+
+    async def acall(self, route: str, payload: Dict[str, Any], coro_fn: Callable[[], Awaitable[Any]],
+                    encode: Callable[[Any], Any] = lambda value: value,
+                    decode: Callable[[Any], Any] = lambda value: value) -> Any:
+        """Replay or record an asynchronous call"""
+        if self.mode == "replay":
+            entry = self.lookup(route, payload)
+            await asyncio.sleep(self.replay_delay(entry))
+            return decode(entry["response"])
+        started = time.perf_counter()
+        result = await coro_fn()
+        self.record(route, payload, encode(result), time.perf_counter() - started)
+        return result
+
+
+_active: Optional[Cassette] = None
+if os.getenv("RESEARCH_CASSETTE"):
+    _active = Cassette(
+        os.environ["RESEARCH_CASSETTE"],
+        mode=os.getenv("RESEARCH_CASSETTE_MODE", "replay"),
+        latency=os.getenv("RESEARCH_CASSETTE_LATENCY", "recorded")
+    )
+
+
+def active_cassette() -> Optional[Cassette]:
+    """The process-wide cassette, if record or replay is enabled"""
+    return _active
+
+
+@contextmanager
+def use_cassette(cassette: Optional[Cassette]):
+    """Route LLM and provider calls through a cassette for the duration of the block"""
+    global _active
+    previous, _active = _active, cassette
+    try:
+        yield cassette
+    finally:
+        _active = previous
@@ -0,0 +1,140 @@
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import hashlib
+import re
+
+
+_ARXIV_URL = re.compile(r"arxiv\.org/(?:abs|pdf)/([^\s?#]+?)(?:\.pdf)?/?$", re.IGNORECASE)
+_ARXIV_VERSION = re.compile(r"v\d+$")
+_DOI = re.compile(r"(10\.\d{4,9}/\S+)", re.IGNORECASE)
+_TRACKING_PARAMS = ("utm_", "ref", "fbclid", "gclid")
+
+
+def normalize_arxiv_id(value: str) -> str:
+    """Strip URL prefixes and version suffixes from an arXiv identifier"""
+    if not value:
+        return ""
+    match = _ARXIV_URL.search(value)
+    if match:
+        value = match.group(1)
+    value = value.strip().lower()
+    if value.startswith("arxiv:"):
+        value = value[len("arxiv:"):]
+    return _ARXIV_VERSION.sub("", value)
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL: lowercase host, no fragment, tracking params or trailing slash"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if not key.lower().startswith(_TRACKING_PARAMS)
+    ))
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme,
+                       host, parts.path.rstrip("/"), query, ""))
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(re.findall(r"\w+", (title or "").lower()))
+
+
+def canonical_citation_id(result: Dict[str, Any]) -> str:
+    """Deterministic citation ID from arXiv ID, DOI, URL or title, in that order"""
+    arxiv_id = normalize_arxiv_id(result.get("arxiv_id") or "")
+    if not arxiv_id and "arxiv.org" in (result.get("url") or ""):
+        arxiv_id = normalize_arxiv_id(result["url"])
+    if arxiv_id:
+        return f"arxiv:{arxiv_id}"
+
+    doi_match = _DOI.search(result.get("doi") or "")
+    if doi_match:
+        return f"doi:{doi_match.group(1).lower().rstrip('.')}"
+
+    url = normalize_url(result.get("url") or "")
+    if url:
+        return "url:" + hashlib.sha1(url.encode()).hexdigest()[:16]
+
+    key = normalize_title(result.get("title") or "")
+    if not key:
+        key = normalize_title((result.get("content") or result.get("summary") or "")[:300])
+    return "title:" + hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+class CitationIndex:
+    """Per-run index of citations keyed by canonical ID.
+
+    Adding the same paper found by several queries merges it into one entry
+    that records every query that found it.
+    """
+
+    def __init__(self, citations: Optional[List[Dict[str, Any]]] = None):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        for citation in citations or []:
+            if citation.get("id") in self._entries or not citation.get("id"):
+                self.add(citation, citation.get("queries", []))
+            else:
+                self._entries[citation["id"]] = {**citation, "queries": list(citation.get("queries", []))}
+
+    def add(self, result: Dict[str, Any], queries=None) -> str:
+        """Add a search result or citation, returning its canonical ID"""
+        citation_id = result.get("citation_id") or canonical_citation_id(result)
+        if isinstance(queries, str):
+            queries = [queries]
+        entry = self._entries.get(citation_id)
+        if entry is None:
+            authors = result.get("authors") or ["Unknown"]
+            if isinstance(authors, str):
+                authors = [a.strip() for a in authors.split(",") if a.strip()] or ["Unknown"]
+            entry = {
+                "id": citation_id,
+                "title": result.get("title") or "Untitled",
+                "authors": list(authors),
+                "source": result.get("source", "Unknown"),
+                "url": result.get("url", ""),
+                "published": result.get("published", ""),
+                "accessed_at": result.get("accessed_at") or datetime.now().isoformat(),
+                "queries": []
+            }
+            self._entries[citation_id] = entry
+        else:
+            # Fill in metadata the first sighting lacked
+            for key in ("url", "published"):
+                if not entry.get(key) and result.get(key):
+                    entry[key] = result[key]
+            if entry["title"] == "Untitled" and result.get("title"):
+                entry["title"] = result["title"]
+        for query in queries or []:
+            if query not in entry["queries"]:
+                entry["queries"].append(query)
+        return citation_id
+
+    def get(self, citation_id: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(citation_id)
+
+    def __contains__(self, citation_id: str) -> bool:
+        return citation_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self._entries.values())
+
+    def format_apa(self) -> str:
+        """Format the deduplicated citations in APA style"""
+        formatted = []
+        for i, citation in enumerate(self._entries.values(), 1):
+            year = (citation.get("published") or "n.d.").split("-")[0]
+            formatted.append(
+                f"{i}. {(citation.get('authors') or ['Author'])[0]} et al. "
+                f"({year}). "
+                f"{citation.get('title', 'Untitled')}. "
+                f"{citation.get('source', 'Unknown')}."
+            )
+        return "\n".join(formatted)
@@ -1,9 +1,13 @@
-from typing import Dict
+from typing import Dict, List
 # from langchain_huggingface import HuggingFaceEmbeddings
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from core.deadline import current_deadline
 
 class ContentAnalyzer:
+  EMBED_BATCH = 64
+
   def __init__(self):
     self.Embeddings = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
     self.text_splitter = RecursiveCharacterTextSplitter(
@@ -11,6 +15,9 @@ class ContentAnalyzer:
         chunk_overlap=200
     )
   def analyze_content(self,content) -> Dict[str,any]:
+    deadline = current_deadline()
+    if deadline is not None:
+      deadline.check()
     chunks = self.text_splitter.split_text(content)
     embeddings = self.Embeddings.encode(chunks)
     word_count = len(content.split())
@@ -19,4 +26,26 @@ class ContentAnalyzer:
         "chunks": len(chunks),
             "word_count": word_count,
             "sentence_count": sent_count
-    }
\ No newline at end of file
+    }
+
+  def embed(self, texts: List[str]) -> np.ndarray:
+    """Encode texts in one batch into unit-length vectors"""
+    if not texts:
+      return np.zeros((0, self.Embeddings.get_sentence_embedding_dimension()), dtype=np.float32)
+    deadline = current_deadline()
+    if deadline is None:
+      return self.Embeddings.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    # Encode in batches so a cancelled run stops between them
+    batches = []
+    for start in range(0, len(texts), self.EMBED_BATCH):
+      deadline.check()
+      batches.append(self.Embeddings.encode(texts[start:start + self.EMBED_BATCH],
+                                            normalize_embeddings=True, convert_to_numpy=True))
+    return np.concatenate(batches)
+
+  def relevance_scores(self, query: str, texts: List[str]) -> np.ndarray:
+    """Cosine similarity of every text to the query, computed in a single pass"""
+    if not texts:
+      return np.zeros(0, dtype=np.float32)
+    vectors = self.embed([query] + list(texts))
+    return vectors[1:] @ vectors[0]
@@ -0,0 +1,83 @@
+from typing import Callable, List, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import time
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised by work that notices its run's deadline has passed or was cancelled"""
+
+
+class Deadline:
+    """Time budget and cancel signal for one research run.
+
+    The deadline is carried in a context variable, so LLM calls, search rounds
+    and embedding batches can bound their waits by the time left and stop
+    early. Thread pools that should see it submit work through
+    contextvars.copy_context().run. cancel() sets a threading.Event that worker
+    threads can poll and runs the registered callbacks, which is how the graph
+    task itself gets cancelled.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+        self.cancel_event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None without a time limit"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set() or self.remaining() == 0.0
+
+    def bound(self, timeout: Optional[float]) -> Optional[float]:
+        """The smaller of timeout and the time left"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def check(self):
+        if self.cancelled:
+            raise DeadlineExceeded("Research deadline exceeded")
+
+    def cancel(self):
+        """Signal cancellation to every thread and callback watching this deadline"""
+        with self._lock:
+            if self.cancel_event.is_set():
+                return
+            self.cancel_event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]):
+        with self._lock:
+            if not self.cancel_event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("research_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the run executing in this context, if any"""
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]):
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
@@ -0,0 +1,118 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import hashlib
+import re
+import numpy as np
+
+
+class FindingsIndex:
+    """Deduplicated findings accumulated over a run's analyst passes.
+
+    Each candidate is embedded and compared to the findings already held; one
+    whose cosine similarity to a held finding reaches the threshold is merged
+    into it, adding its sources and pass number, instead of being stored a
+    second time. Ids derive from the normalized wording a finding was first
+    seen with, so a finding keeps its id across passes and runs. The index is
+    rebuilt from state["findings"] on each pass, so it lives in the
+    checkpointed state without storing vectors there. Ids of findings the
+    validator pruned are kept as tombstones, so a later pass that words one
+    the same way does not add it back.
+    """
+
+    def __init__(self, embed_fn: Optional[Callable[[List[str]], np.ndarray]] = None,
+                 findings: Optional[List[Dict[str, Any]]] = None, threshold: float = 0.88,
+                 pruned_ids: Optional[Iterable[str]] = None):
+        # Maps texts to unit-length vectors, e.g. ContentAnalyzer.embed; None merges exact rewordings only
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self._findings: List[Dict[str, Any]] = []
+        self._keys: Dict[str, int] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._pruned = set(pruned_ids or ())
+        self.added = 0
+        self.merged = 0
+        self.suppressed = 0
+        for finding in findings or []:
+            content = finding.get("content", "")
+            self._keys.setdefault(self.normalize(content), len(self._findings))
+            self._findings.append({
+                **finding,
+                "id": finding.get("id") or self.finding_id(content),
+                "source_ids": list(finding.get("source_ids", [])),
+                "passes": list(finding.get("passes", [])),
+                "mentions": finding.get("mentions", 1)
+            })
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(re.findall(r"\w+", text.lower()))
+
+    @classmethod
+    def finding_id(cls, content: str) -> str:
+        return "finding:" + hashlib.sha1(cls.normalize(content).encode()).hexdigest()[:12]
+
+    def add(self, candidates: List[Dict[str, Any]], analysis_pass: int) -> List[Dict[str, Any]]:
+        """Merge one pass's candidate findings, returning the ones that were new"""
+        candidates = [c for c in candidates if self.normalize(c.get("content", ""))]
+        kept = [c for c in candidates if self.finding_id(c["content"]) not in self._pruned]
+        self.suppressed += len(candidates) - len(kept)
+        candidates = kept
+        unmatched = [c for c in candidates if self.normalize(c["content"]) not in self._keys]
+        # Held findings are embedded once, and only when a candidate needs comparing
+        vectors = self._embed([c["content"] for c in unmatched]) if unmatched else None
+        if vectors is not None and self._vectors is None:
+            self._vectors = self._embed([f.get("content", "") for f in self._findings])
+        vector_of = {id(candidate): vector for candidate, vector in zip(unmatched, vectors)} \
+            if vectors is not None else {}
+
+        new = []
+        for candidate in candidates:
+            key = self.normalize(candidate["content"])
+            index = self._keys.get(key)
+            vector = vector_of.get(id(candidate))
+            if index is None and vector is not None and len(self._vectors):
+                similarities = self._vectors @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    index = best
+            if index is not None:
+                self._merge(self._findings[index], candidate, analysis_pass)
+                self._keys.setdefault(key, index)
+                self.merged += 1
+                continue
+
+            finding = {
+                **candidate,
+                "id": self.finding_id(candidate["content"]),
+                "source_ids": list(dict.fromkeys(candidate.get("source_ids", []))),
+                "passes": [analysis_pass],
+                "mentions": 1
+            }
+            self._keys[key] = len(self._findings)
+            self._findings.append(finding)
+            if vector is not None:
+                self._vectors = np.vstack([self._vectors, vector[None, :]])
+            self.added += 1
+            new.append(finding)
+        return new
+
+    def findings(self) -> List[Dict[str, Any]]:
+        """The deduplicated findings, best corroborated first"""
+        return sorted(self._findings, key=lambda f: (len(f["passes"]) + len(f["source_ids"]), f["mentions"]),
+                      reverse=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {"findings": len(self._findings), "added": self.added, "merged": self.merged,
+                "suppressed": self.suppressed}
+
+    def _embed(self, texts: List[str]) -> Optional[np.ndarray]:
+        if self.embed_fn is None:
+            return None
+        return np.asarray(self.embed_fn(texts), dtype=np.float32)
+
+    @staticmethod
+    def _merge(finding: Dict[str, Any], candidate: Dict[str, Any], analysis_pass: int):
+        finding["source_ids"] = list(dict.fromkeys(finding["source_ids"] + list(candidate.get("source_ids", []))))
+        if analysis_pass not in finding["passes"]:
+            finding["passes"].append(analysis_pass)
+        finding["mentions"] += 1
+        finding["confidence"] = max(finding.get("confidence", 0.0), candidate.get("confidence", 0.0))
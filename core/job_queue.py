@@ -0,0 +1,175 @@
+from typing import Any, Dict, List, Optional
+from abc import ABC, abstractmethod
+from datetime import datetime
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class JobQueue(ABC):
+    """Durable queue of research jobs claimed by workers under renewable leases.
+
+    A job whose worker stops renewing its lease (because it crashed or was
+    killed) becomes claimable again. It keeps its thread_id, so the next worker
+    resumes the run from its last checkpoint. Workers on several machines need
+    an implementation backed by a shared service; SqliteJobQueue is for one host.
+    """
+
+    @abstractmethod
+    def enqueue(self, topic: Dict[str, Any], config: Optional[Dict[str, Any]] = None, priority: int = 0) -> str:
+        ...
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_s: float) -> Optional[Dict[str, Any]]:
+        """Take the next queued or lease-expired job, or None when there is none"""
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str, lease_s: float) -> bool:
+        """Extend a lease; False means the job is no longer held by this worker"""
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]):
+        ...
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str):
+        """Requeue the job, or mark it failed once it has used up its attempts"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        ...
+
+
+class SqliteJobQueue(JobQueue):
+    """JobQueue backed by a SQLite file shared by the worker processes of one host.
+
+    The file must be on a local disk: SQLite's WAL locking does not work over
+    network filesystems.
+    """
+
+    def __init__(self, db_path: str = "research_jobs.db", max_attempts: int = 3):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # Autocommit mode so claims can take an explicit write lock with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    thread_id TEXT,
+                    topic TEXT,
+                    config TEXT,
+                    priority INTEGER DEFAULT 0,
+                    status TEXT,
+                    worker_id TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER DEFAULT 0,
+                    error TEXT,
+                    result TEXT,
+                    created_at TEXT,
+                    updated_at TEXT
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, priority, created_at)")
+
+    def enqueue(self, topic: Dict[str, Any], config: Optional[Dict[str, Any]] = None, priority: int = 0) -> str:
+        job_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO jobs (id, thread_id, topic, config, priority, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 'queued', ?, ?)",
+                (job_id, job_id, json.dumps(topic), json.dumps(config or {}), priority, now, now)
+            )
+        return job_id
+
+    def claim(self, worker_id: str, lease_s: float) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'lease expired', updated_at = ? "
+                    "WHERE status = 'running' AND lease_expires < ? AND attempts >= ?",
+                    (datetime.now().isoformat(), now, self.max_attempts)
+                )
+                row = self.conn.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' OR (status = 'running' AND lease_expires < ?) "
+                    "ORDER BY priority DESC, created_at LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is not None:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = 'running', worker_id = ?, lease_expires = ?, "
+                        "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        (worker_id, now + lease_s, datetime.now().isoformat(), row["id"])
+                    )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"]) if row is not None else None
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_s: float) -> bool:
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker_id = ? AND status = 'running'",
+                (time.time() + lease_s, job_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]):
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, updated_at = ? "
+                "WHERE id = ? AND worker_id = ?",
+                (json.dumps(result, default=str), datetime.now().isoformat(), job_id, worker_id)
+            )
+
+    def fail(self, job_id: str, worker_id: str, error: str):
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+                "error = ?, lease_expires = NULL, updated_at = ? WHERE id = ? AND worker_id = ?",
+                (self.max_attempts, error, datetime.now().isoformat(), job_id, worker_id)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        for key in ("topic", "config", "result"):
+            job[key] = json.loads(job[key]) if job[key] else None
+        return job
+
+    def jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        sql = "SELECT id FROM jobs"
+        params: List[Any] = []
+        if status:
+            sql += " WHERE status = ?"
+            params.append(status)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            ids = [row["id"] for row in self.conn.execute(sql, params).fetchall()]
+        return [self.get(job_id) for job_id in ids]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["count"] for row in rows}
@@ -0,0 +1,188 @@
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from core.citation_index import canonical_citation_id, normalize_arxiv_id, normalize_url
+
+
+_STOPWORDS = {
+    "the", "and", "for", "with", "from", "into", "over", "that", "this", "are", "was",
+    "recent", "developments", "research", "papers", "methodology", "best", "practices",
+    "using", "based", "study", "studies"
+}
+
+
+class KnowledgeBase:
+    """Persistent cross-run store of processed sources and findings.
+
+    Sources and findings are kept in SQLite tables with FTS5 indexes over their
+    text, and are indexed by topic, domain, arXiv ID and URL so later runs can
+    be served locally before going to the network.
+    """
+
+    def __init__(self, db_path: str = "research_knowledge.db", min_overlap: float = 0.6):
+        self.db_path = db_path
+        self.min_overlap = min_overlap
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS sources (
+                    id TEXT PRIMARY KEY,
+                    topic TEXT,
+                    domain TEXT,
+                    provider TEXT,
+                    title TEXT,
+                    url TEXT,
+                    arxiv_id TEXT,
+                    payload TEXT NOT NULL,
+                    created_at TEXT,
+                    last_used_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_sources_domain ON sources(domain);
+                CREATE INDEX IF NOT EXISTS idx_sources_topic ON sources(topic);
+                CREATE INDEX IF NOT EXISTS idx_sources_url ON sources(url);
+                CREATE INDEX IF NOT EXISTS idx_sources_arxiv ON sources(arxiv_id);
+                CREATE VIRTUAL TABLE IF NOT EXISTS sources_fts USING fts5(
+                    id UNINDEXED, title, content, topic
+                );
+
+                CREATE TABLE IF NOT EXISTS findings (
+                    id TEXT PRIMARY KEY,
+                    topic TEXT,
+                    domain TEXT,
+                    category TEXT,
+                    content TEXT,
+                    confidence REAL,
+                    created_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_findings_domain ON findings(domain);
+                CREATE VIRTUAL TABLE IF NOT EXISTS findings_fts USING fts5(
+                    id UNINDEXED, content, topic
+                );
+            """)
+
+    def add_sources(self, topic, results: List[Dict[str, Any]]) -> int:
+        """Insert or refresh processed sources for a topic"""
+        now = datetime.now().isoformat()
+        rows = []
+        for result in results:
+            text = self._source_text(result)
+            if not text.strip():
+                continue
+            url = result.get("url", "")
+            arxiv_id = normalize_arxiv_id(result.get("arxiv_id") or (url if "arxiv.org" in url else ""))
+            rows.append((
+                self.source_id(result), topic.title, topic.domain, result.get("source", "unknown"),
+                result.get("title", ""), normalize_url(url), arxiv_id,
+                json.dumps(result, default=str), now, text
+            ))
+
+        with self._lock, self.conn:
+            for row in rows:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sources "
+                    "(id, topic, domain, provider, title, url, arxiv_id, payload, created_at, last_used_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    row[:9] + (now,)
+                )
+                self.conn.execute("DELETE FROM sources_fts WHERE id = ?", (row[0],))
+                self.conn.execute(
+                    "INSERT INTO sources_fts (id, title, content, topic) VALUES (?, ?, ?, ?)",
+                    (row[0], row[4], row[9], row[1])
+                )
+        return len(rows)
+
+    def add_findings(self, topic, findings: List[Dict[str, Any]]) -> int:
+        """Insert findings for a topic, keyed by their normalized content"""
+        now = datetime.now().isoformat()
+        with self._lock, self.conn:
+            for finding in findings:
+                content = finding.get("content", "").strip()
+                finding_id = hashlib.md5(f"{topic.domain}|{content.lower()}".encode()).hexdigest()
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO findings "
+                    "(id, topic, domain, category, content, confidence, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (finding_id, topic.title, topic.domain, finding.get("category", "observation"),
+                     content, finding.get("confidence", 0.0), now)
+                )
+                self.conn.execute("DELETE FROM findings_fts WHERE id = ?", (finding_id,))
+                self.conn.execute(
+                    "INSERT INTO findings_fts (id, content, topic) VALUES (?, ?, ?)",
+                    (finding_id, content, topic.title)
+                )
+        return len(findings)
+
+    def search_sources(self, query: str, domain: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """Full-text search over stored sources, best matches first"""
+        terms = self._terms(query)
+        if not terms:
+            return []
+
+        sql = ("SELECT s.id, s.payload, s.title, sources_fts.content AS text FROM sources_fts "
+               "JOIN sources s ON s.id = sources_fts.id WHERE sources_fts MATCH ?")
+        params: List[Any] = [" OR ".join(f'"{term}"' for term in terms)]
+        if domain:
+            sql += " AND s.domain = ?"
+            params.append(domain)
+        sql += " ORDER BY bm25(sources_fts) LIMIT ?"
+        params.append(limit * 4)
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+
+        matches = []
+        for row in rows:
+            if self._overlap(terms, f"{row['title']} {row['text']}") < self.min_overlap:
+                continue
+            payload = json.loads(row["payload"])
+            payload["from_knowledge_base"] = True
+            matches.append(payload)
+            if len(matches) >= limit:
+                break
+
+        if matches:
+            now = datetime.now().isoformat()
+            with self._lock, self.conn:
+                self.conn.executemany(
+                    "UPDATE sources SET last_used_at = ? WHERE id = ?",
+                    [(now, self.source_id(match)) for match in matches]
+                )
+        return matches
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sources": self.conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0],
+                "findings": self.conn.execute("SELECT COUNT(*) FROM findings").fetchone()[0]
+            }
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    @staticmethod
+    def source_id(result: Dict[str, Any]) -> str:
+        return result.get("citation_id") or canonical_citation_id(result)
+
+    @staticmethod
+    def _source_text(result: Dict[str, Any]) -> str:
+        return " ".join(str(result.get(key, "")) for key in ("content", "summary", "abstract") if result.get(key))
+
+    @staticmethod
+    def _terms(query: str) -> List[str]:
+        words = re.findall(r"\w+", query.lower())
+        return list(dict.fromkeys(w for w in words if len(w) > 2 and w not in _STOPWORDS))
+
+    @staticmethod
+    def _overlap(terms: List[str], text: str) -> float:
+        words = set(re.findall(r"\w+", text.lower()))
+        return sum(term in words for term in terms) / len(terms)
@@ -0,0 +1,215 @@
+from typing import Dict, Any, Optional, List
+from dataclasses import dataclass
+import asyncio
+import os
+import threading
+import time
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+from langchain_core.messages import message_to_dict, messages_from_dict
+from core.agent_config import AgentConfig
+from core.single_flight import SingleFlight
+from core.cassette import active_cassette
+from core.usage_ledger import UsageLedger
+from core.persistent_cache import shared_cache
+from core.deadline import current_deadline, DeadlineExceeded
+
+load_dotenv()
+openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
+
+DEFAULT_MODEL = "liquid/lfm-2.5-1.2b-instruct:free"
+MODEL_TIERS = {
+    "fast": os.getenv("OPENROUTER_FAST_MODEL") or DEFAULT_MODEL,
+    "standard": os.getenv("OPENROUTER_STANDARD_MODEL") or DEFAULT_MODEL,
+    "strong": os.getenv("OPENROUTER_STRONG_MODEL") or DEFAULT_MODEL,
+}
+FALLBACK_MODEL = os.getenv("OPENROUTER_FALLBACK_MODEL") or None
+
+
+@dataclass
+class ModelHealth:
+    """Rolling latency and error state for one model"""
+    ewma_latency: float = 0.0
+    calls: int = 0
+    consecutive_errors: int = 0
+    degraded_until: float = 0.0
+
+
+class ModelRouter:
+    """Route an agent's LLM calls to a model tier with latency/error based fallback.
+
+    Model health is shared by every router in the process, so once one agent
+    sees a model exceed its latency or error threshold the other agents send
+    their calls to the fallback model until the cooldown expires.
+    """
+
+    _health: Dict[str, ModelHealth] = {}
+    _health_lock = threading.Lock()
+    # Identical prompts sent to the same model while one is in flight share its response
+    flights = SingleFlight()
+
+    def __init__(self, config: AgentConfig, cooldown: float = 120.0, smoothing: float = 0.3,
+                 ledger: Optional[UsageLedger] = None):
+        self.config = config
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self.ledger = ledger or UsageLedger.default()
+        self._llms: Dict[str, ChatOpenAI] = {}
+
+    def resolve(self, tier: Optional[str] = None) -> List[str]:
+        """Return the models to try for a call, in order"""
+        if tier is None and self.config.llm_model:
+            primary = self.config.llm_model
+        else:
+            primary = MODEL_TIERS.get(tier or self.config.model_tier, DEFAULT_MODEL)
+        fallback = self.config.fallback_model or FALLBACK_MODEL
+        if not fallback or fallback == primary:
+            return [primary]
+        if self._is_degraded(primary) and not self._is_degraded(fallback):
+            return [fallback, primary]
+        return [primary, fallback]
+
+    def llm(self, model: Optional[str] = None) -> ChatOpenAI:
+        """Return a (cached) chat model client configured from the agent config"""
+        model = model or self.resolve()[0]
+        if model not in self._llms:
+            self._llms[model] = ChatOpenAI(
+                api_key=openrouter_api_key,
+                base_url="https://openrouter.ai/api/v1",
+                model=model,
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+                stream_usage=True,
+            )
+        return self._llms[model]
+
+    async def ainvoke(self, prompt, inputs: Dict[str, Any], tier: Optional[str] = None):
+        """Invoke prompt | model, falling back to the next model on timeout or error"""
+        models = self.resolve(tier)
+        messages = prompt.format_messages(**inputs)
+        deadline = current_deadline()
+        last_error = None
+        for position, model in enumerate(models):
+            if deadline is not None:
+                deadline.check()
+            is_last = position == len(models) - 1
+            started = time.perf_counter()
+            llm = self.llm(model)
+            leader = []
+
+            def run_call(llm=llm, model=model):
+                leader.append(True)
+                return self._call_model(llm, model, messages)
+
+            try:
+                call = self.flights.ado(self._call_key(model, messages), run_call)
+                timeout = None if is_last else self.config.latency_threshold
+                if deadline is not None:
+                    timeout = deadline.bound(timeout)
+                response = await asyncio.wait_for(call, timeout=timeout)
+            except Exception as e:
+                latency = time.perf_counter() - started
+                self._record(model, latency, failed=True)
+                self._log_usage(model, latency, None, coalesced=not leader, error=repr(e))
+                if deadline is not None and deadline.cancelled:
+                    # Out of time: trying the fallback model would only overrun further
+                    raise DeadlineExceeded(f"Deadline reached during call to {model}") from e
+                last_error = e
+                continue
+            latency = time.perf_counter() - started
+            self._record(model, latency, failed=False)
+            self._log_usage(model, latency, response, coalesced=not leader)
+            return response
+        raise last_error
+
+    async def _stream_model(self, llm: ChatOpenAI, messages):
+        """Stream the completion so time-to-first-token can be measured"""
+        started = time.perf_counter()
+        response, ttft = None, None
+        async for chunk in llm.astream(messages):
+            if ttft is None:
+                ttft = time.perf_counter() - started
+            response = chunk if response is None else response + chunk
+        if response is None:
+            raise ValueError(f"Model {llm.model_name} returned an empty stream")
+        response.response_metadata["ttft_s"] = ttft
+        return response
+
+    def _log_usage(self, model: str, latency: float, response, coalesced: bool, error: Optional[str] = None):
+        metadata = getattr(response, "response_metadata", None) or {}
+        # A persistent-cache hit carries the usage of the call that filled the cache
+        cached = bool(metadata.get("cached"))
+        usage = (getattr(response, "usage_metadata", None) or {}) if not (coalesced or cached) else {}
+        self.ledger.record(
+            agent=self.config.agent_type.value,
+            model=model,
+            latency_s=latency,
+            prompt_tokens=usage.get("input_tokens", 0),
+            completion_tokens=usage.get("output_tokens", 0),
+            ttft_s=None if coalesced or cached else metadata.get("ttft_s"),
+            coalesced=coalesced,
+            cached=cached,
+            error=error
+        )
+
+    async def _call_model(self, llm: ChatOpenAI, model: str, messages):
+        """Call the model through the shared cache, and record/replay it when a cassette is active"""
+        payload = {
+            "model": model,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "messages": [[message.type, str(message.content)] for message in messages]
+        }
+        cache = shared_cache()
+        if cache is not None:
+            cached = cache.get("llm", payload)
+            if cached is not None:
+                response = messages_from_dict([cached])[0]
+                response.response_metadata["cached"] = True
+                return response
+
+        cassette = active_cassette()
+        if cassette is None:
+            response = await self._stream_model(llm, messages)
+        else:
+            response = await cassette.acall(
+                f"llm:{model}", payload, lambda: self._stream_model(llm, messages),
+                encode=message_to_dict, decode=lambda data: messages_from_dict([data])[0]
+            )
+        if cache is not None:
+            cache.set("llm", payload, message_to_dict(response))
+        return response
+
+    def _call_key(self, model: str, messages) -> tuple:
+        return (model, self.config.temperature, self.config.max_tokens,
+                tuple((message.type, str(message.content)) for message in messages))
+
+    def _is_degraded(self, model: str) -> bool:
+        with self._health_lock:
+            health = self._health.get(model)
+            return bool(health) and health.degraded_until > time.monotonic()
+
+    def _record(self, model: str, latency: float, failed: bool):
+        with self._health_lock:
+            health = self._health.setdefault(model, ModelHealth())
+            health.calls += 1
+            health.ewma_latency = latency if health.calls == 1 else \
+                self.smoothing * latency + (1 - self.smoothing) * health.ewma_latency
+            health.consecutive_errors = health.consecutive_errors + 1 if failed else 0
+            if (health.consecutive_errors >= self.config.error_threshold
+                    or health.ewma_latency > self.config.latency_threshold):
+                health.degraded_until = time.monotonic() + self.cooldown
+
+    @classmethod
+    def health_report(cls) -> Dict[str, Dict[str, Any]]:
+        with cls._health_lock:
+            now = time.monotonic()
+            return {
+                model: {
+                    "ewma_latency": round(health.ewma_latency, 3),
+                    "calls": health.calls,
+                    "consecutive_errors": health.consecutive_errors,
+                    "degraded": health.degraded_until > now
+                }
+                for model, health in cls._health.items()
+            }
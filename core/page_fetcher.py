@@ -0,0 +1,186 @@
+from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from html.parser import HTMLParser
+import codecs
+import contextvars
+import hashlib
+import json
+import os
+import tempfile
+import requests
+from requests.adapters import HTTPAdapter
+from core.deadline import current_deadline
+
+
+class _MainTextExtractor(HTMLParser):
+    """Incremental HTML-to-text extractor that skips page chrome and stops at a character cap"""
+
+    SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "template"}
+    BLOCK_TAGS = {"p", "div", "section", "article", "li", "br", "tr", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.parts: List[str] = []
+        self.length = 0
+        self.title = ""
+        self._skip_depth = 0
+        self._in_title = False
+        self._pending: List[str] = []
+
+    @property
+    def full(self) -> bool:
+        return self.length >= self.max_chars
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in self.BLOCK_TAGS and self.parts and self.parts[-1] != "\n":
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data):
+        # Text nodes can arrive split across feed() calls; buffer until the next tag
+        if self._in_title or not (self._skip_depth or self.full):
+            self._pending.append(data)
+
+    def _flush(self):
+        data, self._pending = "".join(self._pending), []
+        if self._in_title:
+            self.title += " ".join(data.split())
+            return
+        text = " ".join(data.split())
+        if text and not self.full:
+            text = text[:self.max_chars - self.length]
+            self.parts.append(text + " ")
+            self.length += len(text) + 1
+
+    def text(self) -> str:
+        self._flush()
+        return "".join(self.parts).replace(" \n", "\n").strip()
+
+
+class PageFetcher:
+    """Fetch result pages concurrently over a pooled HTTP session.
+
+    Each page is streamed with a byte cap and timeouts, its main text is
+    extracted while it downloads, and the extracted text is cached on disk
+    keyed by URL so later runs do not refetch it.
+    """
+
+    def __init__(self, max_bytes: int = 512_000, max_chars: int = 4000, connect_timeout: float = 3.05,
+                 read_timeout: float = 8.0, max_workers: int = 8, cache_dir: Optional[str] = "page_cache",
+                 user_agent: str = "Mozilla/5.0 (compatible; research-assistant/1.0)"):
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="page-fetch")
+
+    def fetch_many(self, urls: List[str], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch pages concurrently; pages that fail or miss the timeout are left out"""
+        futures = {self.pool.submit(contextvars.copy_context().run, self.fetch, url): url
+                   for url in dict.fromkeys(urls) if url}
+        done, _ = wait(futures, timeout=timeout)
+        pages = {}
+        for future in done:
+            page = future.result()
+            if page:
+                pages[futures[future]] = page
+        return pages
+
+    def fetch(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch one page's main text, from the disk cache when available"""
+        cached = self._read_cache(url)
+        if cached:
+            return cached
+        deadline = current_deadline()
+        try:
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "")
+                if "html" not in content_type and not content_type.startswith("text/"):
+                    return None
+
+                extractor = _MainTextExtractor(self.max_chars)
+                decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+                received = 0
+                truncated = False
+                for chunk in response.iter_content(chunk_size=16384):
+                    if deadline is not None and deadline.cancelled:
+                        return None
+                    received += len(chunk)
+                    extractor.feed(decoder.decode(chunk))
+                    if received >= self.max_bytes or extractor.full:
+                        truncated = True
+                        break
+        except Exception as e:
+            print(f"Page fetch error {url}: {e}")
+            return None
+
+        text = extractor.text()
+        if not text:
+            return None
+        page = {
+            "url": url,
+            "title": extractor.title,
+            "text": text,
+            "bytes": received,
+            "truncated": truncated,
+            "fetched_at": datetime.now().isoformat()
+        }
+        self._write_cache(url, page)
+        return page
+
+    def _cache_path(self, url: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def _read_cache(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._cache_path(url)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, url: str, page: Dict[str, Any]):
+        path = self._cache_path(url)
+        if not path:
+            return
+        # A unique temporary file per write, so fetch threads and processes never share one
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        except OSError as e:
+            print(f"Page cache write error {url}: {e}")
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(page, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Page cache write error {url}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,86 @@
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class PersistentCache:
+    """SQLite-backed cache for search and LLM results shared by worker processes.
+
+    Entries are keyed by namespace and a hash of the request payload and
+    stored as JSON. WAL mode lets the worker processes of one host read and
+    write the same file, which must be on a local disk since WAL does not work
+    over network filesystems. Workers on several machines need another
+    backend with the same get/set interface, installed with set_shared_cache.
+    """
+
+    def __init__(self, db_path: str = "research_cache.db", ttl_s: Optional[float] = None):
+        self.db_path = db_path
+        # Entries older than this are ignored; None keeps them forever
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT,
+                    key TEXT,
+                    value TEXT,
+                    created_at REAL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+
+    @staticmethod
+    def key(payload: Dict[str, Any]) -> str:
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, namespace: str, payload: Dict[str, Any]) -> Optional[Any]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, self.key(payload))
+            ).fetchone()
+            if row is None or (self.ttl_s is not None and time.time() - row[1] > self.ttl_s):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, namespace: str, payload: Dict[str, Any], value: Any):
+        encoded = json.dumps(value, default=str)
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                (namespace, self.key(payload), encoded, time.time())
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+_shared: Optional[PersistentCache] = None
+if os.getenv("RESEARCH_CACHE_DB"):
+    _shared = PersistentCache(os.environ["RESEARCH_CACHE_DB"])
+
+
+def shared_cache() -> Optional[PersistentCache]:
+    """The process-wide cache for search and LLM results, if enabled"""
+    return _shared
+
+
+def set_shared_cache(cache: Optional[PersistentCache]):
+    global _shared
+    _shared = cache
@@ -2,21 +2,29 @@ from typing import TypedDict
 from typing import Any, List, Dict
 from typing_extensions import Annotated
 from core.research_topic import ResearchTopic
+from core.source_record import SourceRecord
 from langgraph.graph.message import add_messages
 
 class ResearchState(TypedDict):
     messages: Annotated[List[Any], add_messages]
     topic: ResearchTopic
     research_phase: str
-    search_results: Dict[str, Any]
-    sources: List[Dict[str, str]]
+    research_plan: str
+    search_results: List[str]
+    search_passes: int
+    sources: List[SourceRecord]
     analysis: Dict[str, Any]
     literature_review: str
     methodology: str
     findings: List[Dict[str, Any]]
+    pruned_finding_ids: List[str]
     limitations: List[str]
     recommendations: List[str]
     citations: List[Dict[str, str]]
     validation_errors: List[str]
+    validation_results: Dict[str, Any]
+    analysis_passes: int
+    partial_analyses: List[Dict[str, Any]]
+    final_paper: Dict[str, Any]
     metadata: Dict[str, Any]
     agent_logs: List[Dict[str, Any]]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 from typing import List
 
 class ResearchTopic(BaseModel):
@@ -7,8 +7,9 @@ class ResearchTopic(BaseModel):
     complexity: str = Field("intermediate", pattern="^(beginner|intermediate|advanced|expert)$")
     subtopics: List[str] = Field(default_factory=list)
 
-    @validator('title')
+    @field_validator('title')
+    @classmethod
     def title_must_be_meaningful(cls, v):
         if len(v.split()) < 2:
             raise ValueError("Title must be at least 2 words")
-        return v
\ No newline at end of file
+        return v
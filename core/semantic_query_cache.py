@@ -0,0 +1,114 @@
+from typing import Any, Callable, Dict, List, Optional
+from collections import OrderedDict
+import re
+import threading
+import numpy as np
+
+
+class SemanticQueryCache:
+    """Per-provider search cache that also serves paraphrased queries.
+
+    Queries are normalized (lowercased, punctuation and stopwords dropped,
+    tokens sorted) so reordered wordings share one exact key. On an exact miss
+    the normalized query is embedded and compared to the provider's cached
+    queries; the closest one is served if its cosine similarity reaches that
+    provider's threshold. Providers whose results shift more with wording get
+    a stricter threshold.
+    """
+
+    DEFAULT_THRESHOLDS = {"arxiv": 0.9, "web": 0.95, "scholar": 0.85}
+    STOPWORDS = frozenset({
+        "a", "an", "the", "in", "on", "of", "for", "to", "and", "or", "with", "about",
+        "by", "from", "at", "into", "is", "are", "what", "how", "latest", "new"
+    })
+
+    def __init__(self, embed_fn: Optional[Callable[[List[str]], np.ndarray]] = None,
+                 thresholds: Optional[Dict[str, float]] = None, default_threshold: float = 0.95,
+                 max_entries: int = 1024):
+        # Maps texts to unit-length vectors, e.g. ContentAnalyzer.embed; None disables semantic matching
+        self.embed_fn = embed_fn
+        self.thresholds = {**self.DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.default_threshold = default_threshold
+        self.max_entries = max_entries
+        self._entries: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def normalize(cls, query: str) -> str:
+        tokens = re.findall(r"\w+", query.lower())
+        return " ".join(sorted(set(token for token in tokens if token not in cls.STOPWORDS)))
+
+    def threshold(self, provider: str) -> float:
+        return self.thresholds.get(provider, self.default_threshold)
+
+    def get(self, provider: str, query: str, max_results: int) -> Optional[List[Dict]]:
+        """Cached results for this query or a close enough paraphrase, or None"""
+        key = self.normalize(query)
+        with self._lock:
+            entries = self._entries.get(provider, {})
+            entry = entries.get(key)
+            if entry is not None and entry["max_results"] >= max_results:
+                entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry["results"][:max_results]
+            candidates = [(other, cached) for other, cached in entries.items()
+                          if cached["max_results"] >= max_results]
+
+        if self.embed_fn is None or not candidates:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        vector = self._vector(key)
+        matrix = np.stack([self._vector(other) for other, _ in candidates])
+        scores = matrix @ vector
+        best = int(np.argmax(scores))
+        with self._lock:
+            if scores[best] < self.threshold(provider):
+                self.misses += 1
+                return None
+            self.semantic_hits += 1
+        return candidates[best][1]["results"][:max_results]
+
+    def put(self, provider: str, query: str, max_results: int, results: List[Dict]):
+        """Cache a provider's results; empty results are never cached"""
+        if not results:
+            return
+        key = self.normalize(query)
+        with self._lock:
+            entries = self._entries.setdefault(provider, OrderedDict())
+            entries[key] = {"query": query, "max_results": max_results, "results": results}
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._vectors.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "entries": sum(len(entries) for entries in self._entries.values())
+            }
+
+    def _vector(self, key: str) -> np.ndarray:
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is not None:
+                self._vectors.move_to_end(key)
+                return vector
+        vector = np.asarray(self.embed_fn([key])[0], dtype=np.float32)
+        with self._lock:
+            self._vectors[key] = vector
+            while len(self._vectors) > self.max_entries * 4:
+                self._vectors.popitem(last=False)
+        return vector
@@ -0,0 +1,100 @@
+from typing import Any, Callable, Awaitable, Dict, Hashable
+from concurrent.futures import Future
+import asyncio
+import threading
+from core.deadline import DeadlineExceeded, current_deadline
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one in-flight call.
+
+    The first caller for a key runs the call; callers arriving while it is in
+    flight wait on the same future instead of issuing a duplicate request.
+    Futures are thread-safe, so synchronous callers in worker threads and
+    coroutines on any event loop can share one group.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable):
+        """Return (future, is_leader) for a key"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            self.calls += 1
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) once per key across concurrent threads"""
+        future, is_leader = self._join(key)
+        if not is_leader:
+            # A waiter stops at its own run's deadline, even if the leader's run has longer
+            deadline = current_deadline()
+            try:
+                return future.result(timeout=deadline.remaining() if deadline is not None else None)
+            except TimeoutError:
+                if future.done():
+                    raise
+                raise DeadlineExceeded("Research deadline exceeded while waiting for a coalesced call")
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._settle(future, exception=e)
+            raise
+        else:
+            self._settle(future, result=result)
+            return result
+        finally:
+            self._finish(key, future)
+
+    async def ado(self, key: Hashable, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await coro_fn() once per key across concurrent coroutines"""
+        future, is_leader = self._join(key)
+        if not is_leader:
+            # Shielded so a waiter's own timeout or cancellation cannot cancel the shared future
+            return await asyncio.shield(asyncio.wrap_future(future))
+        try:
+            result = await coro_fn()
+        except asyncio.CancelledError:
+            # The leader timed out or was cancelled; waiters get an ordinary error
+            # they can fall back from instead of a cancellation
+            self._settle(future, exception=TimeoutError("Coalesced call was cancelled before it finished"))
+            raise
+        except BaseException as e:
+            self._settle(future, exception=e)
+            raise
+        else:
+            self._settle(future, result=result)
+            return result
+        finally:
+            self._finish(key, future)
+
+    @staticmethod
+    def _settle(future: Future, result: Any = None, exception: BaseException = None):
+        if future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._inflight)
+            }
@@ -0,0 +1,135 @@
+from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+import sys
+import time
+
+
+_MISSING = object()
+
+
+@dataclass(slots=True)
+class SourceRecord:
+    """Compact, typed record for one processed source.
+
+    Provider and author names are interned, so thousands of sources share
+    one copy of each. The content analysis is stored as three integers
+    instead of a nested dict, and the processing time as a float instead of
+    an ISO string. get() and item access accept the keys of the old per-source
+    dicts, so prompt packing and display code can read records directly;
+    to_dict() is for the edges (knowledge base, JSON output).
+    """
+
+    citation_id: str
+    source: str = "unknown"
+    title: str = ""
+    content: str = ""
+    url: str = ""
+    authors: Tuple[str, ...] = ()
+    published: str = ""
+    arxiv_id: str = ""
+    doi: str = ""
+    relevance_score: Optional[float] = None
+    chunks: int = 0
+    word_count: int = 0
+    sentence_count: int = 0
+    processed_at: float = 0.0
+    from_knowledge_base: bool = False
+    # Provider-specific fields without a slot of their own (snippet, citations, ...)
+    extra: Optional[Dict[str, Any]] = field(default=None)
+
+    # Keys of the result dicts that map onto the slots above
+    BODY_KEYS = ("content", "summary", "abstract")
+    KNOWN_KEYS = frozenset({
+        "citation_id", "source", "title", "content", "summary", "abstract", "url", "authors",
+        "published", "arxiv_id", "doi", "relevance_score", "analysis", "processed_at",
+        "from_knowledge_base"
+    })
+
+    def __post_init__(self):
+        self.source = sys.intern(self.source)
+        self.authors = tuple(sys.intern(author) for author in self.authors)
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any], citation_id: str,
+                    analysis: Optional[Dict[str, Any]] = None) -> "SourceRecord":
+        """Build a record from a provider or knowledge-base result dict"""
+        analysis = analysis or result.get("analysis") or {}
+        authors = result.get("authors") or ()
+        if isinstance(authors, str):
+            authors = [author.strip() for author in authors.split(",") if author.strip()]
+        extra = {key: value for key, value in result.items() if key not in cls.KNOWN_KEYS}
+        return cls(
+            citation_id=citation_id,
+            source=result.get("source") or "unknown",
+            title=result.get("title") or "",
+            content=next((result[key] for key in cls.BODY_KEYS if result.get(key)), ""),
+            url=result.get("url") or "",
+            authors=tuple(authors),
+            published=str(result.get("published") or ""),
+            arxiv_id=result.get("arxiv_id") or "",
+            doi=result.get("doi") or "",
+            relevance_score=None if result.get("relevance_score") is None else float(result["relevance_score"]),
+            chunks=analysis.get("chunks", 0),
+            word_count=analysis.get("word_count", 0),
+            sentence_count=analysis.get("sentence_count", 0),
+            processed_at=time.time(),
+            from_knowledge_base=bool(result.get("from_knowledge_base")),
+            extra=extra or None
+        )
+
+    @property
+    def analysis(self) -> Dict[str, int]:
+        return {"chunks": self.chunks, "word_count": self.word_count, "sentence_count": self.sentence_count}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style read using the keys of the original result dicts"""
+        if key == "analysis":
+            return self.analysis
+        if key == "processed_at":
+            return datetime.fromtimestamp(self.processed_at).isoformat()
+        if key in ("summary", "abstract"):
+            return default
+        if key in self.KNOWN_KEYS:
+            value = getattr(self, key)
+            return default if value is None or value in ("", ()) else value
+        return (self.extra or {}).get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict for storage and display, in the shape of the original result dicts"""
+        data = {
+            "citation_id": self.citation_id,
+            "source": self.source,
+            "title": self.title,
+            "content": self.content,
+            "url": self.url,
+            "authors": list(self.authors),
+            "published": self.published,
+            "arxiv_id": self.arxiv_id,
+            "doi": self.doi,
+            "relevance_score": self.relevance_score,
+            "analysis": self.analysis,
+            "processed_at": self.get("processed_at"),
+            "from_knowledge_base": self.from_knowledge_base
+        }
+        data.update(self.extra or {})
+        return data
+
+    def field_values(self) -> Dict[str, Any]:
+        """Field values by name, the form used for checkpoints"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    @classmethod
+    def from_field_values(cls, values: Dict[str, Any]) -> "SourceRecord":
+        """Rebuild a record from field_values(), ignoring fields it no longer has"""
+        names = {f.name for f in fields(cls)}
+        return cls(**{name: value for name, value in values.items() if name in names})
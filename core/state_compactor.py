@@ -0,0 +1,101 @@
+from typing import List, Dict, Any, Optional
+from dataclasses import replace
+import json
+from langchain_core.messages import SystemMessage
+
+
+class StateCompactor:
+    """Keep stored sources, analysis text and prompts bounded across revision loops.
+
+    Source bodies are stored trimmed to max_stored_source_chars: past the
+    search node only their first few hundred characters are read, while gap-fill
+    loops keep adding sources to every checkpoint. Long analysis text and
+    research plans are cut down to their head and tail. Prompt helpers trim what each agent sends to
+    the model to max_prompt_chars.
+    """
+
+    def __init__(self, keep_recent: int = 6, max_message_chars: int = 2000,
+                 max_analysis_chars: int = 6000, max_prompt_chars: int = 12000,
+                 max_source_chars: int = 600, max_stored_source_chars: int = 2000):
+        self.keep_recent = keep_recent
+        self.max_message_chars = max_message_chars
+        self.max_analysis_chars = max_analysis_chars
+        self.max_prompt_chars = max_prompt_chars
+        self.max_source_chars = max_source_chars
+        self.max_stored_source_chars = max_stored_source_chars
+
+    def compact_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """State updates that compact stored sources, the plan and stale analysis, or {} below the thresholds"""
+        updates = {}
+        sources = self.compact_sources(state.get("sources", []))
+        if sources is not None:
+            updates["sources"] = sources
+        analysis = self.compact_analysis(state.get("analysis", {}))
+        if analysis is not None:
+            updates["analysis"] = analysis
+        plan = state.get("research_plan", "")
+        if len(plan) > self.max_analysis_chars:
+            updates["research_plan"] = self.bound_text(plan, self.max_analysis_chars)
+        return updates
+
+    def compact_sources(self, sources: List[Any]) -> Optional[List[Any]]:
+        """Copy of the source records with oversized bodies trimmed, or None if nothing changed"""
+        limit = self.max_stored_source_chars
+        if not any(len(source.content) > limit for source in sources):
+            return None
+        return [replace(source, content=self.bound_text(source.content, limit))
+                if len(source.content) > limit else source for source in sources]
+
+    def compact_analysis(self, analysis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Copy of the analysis with its oversized text trimmed, or None if nothing changed"""
+        text = analysis.get("comprehensive_analysis")
+        if not isinstance(text, str) or len(text) <= self.max_analysis_chars:
+            return None
+        return {**analysis, "comprehensive_analysis": self.bound_text(text, self.max_analysis_chars)}
+
+    def bound_messages(self, messages: List[Any]) -> List[Any]:
+        """Prompt view of the history: leading system message, recent messages, trimmed content"""
+        head = messages[:1] if messages and isinstance(messages[0], SystemMessage) else []
+        recent = messages[len(head):][-self.keep_recent:]
+        bounded = []
+        for message in head + recent:
+            content = str(message.content)
+            if len(content) > self.max_message_chars:
+                message = message.model_copy(update={"content": self.bound_text(content, self.max_message_chars)})
+            bounded.append(message)
+        return bounded
+
+    def pack_sources(self, sources: List[Dict[str, Any]], max_chars: Optional[int] = None) -> str:
+        """Compact JSON of the fields an LLM needs from each source, within a character budget"""
+        budget = max_chars or self.max_prompt_chars
+        packed = []
+        used = 2
+        for source in sources:
+            body = source.get("content") or source.get("summary") or source.get("abstract") or ""
+            authors = source.get("authors") or []
+            if isinstance(authors, str):
+                authors = [a.strip() for a in authors.split(",")]
+            entry = {
+                "id": source.get("citation_id", ""),
+                "source": source.get("source", "unknown"),
+                "title": source.get("title", ""),
+                "authors": list(authors)[:3],
+                "published": source.get("published", ""),
+                "content": self.bound_text(body, self.max_source_chars)
+            }
+            encoded = json.dumps({k: v for k, v in entry.items() if v}, ensure_ascii=False)
+            if used + len(encoded) > budget:
+                break
+            packed.append(encoded)
+            used += len(encoded) + 2
+        return "[\n" + ",\n".join(packed) + "\n]"
+
+    def bound_text(self, text: str, limit: Optional[int] = None) -> str:
+        """Trim text to limit characters, keeping its head and tail"""
+        limit = limit or self.max_prompt_chars
+        if len(text) <= limit:
+            return text
+        marker = "\n[...]\n"
+        head = (limit - len(marker)) * 2 // 3
+        tail = limit - len(marker) - head
+        return text[:head] + marker + (text[-tail:] if tail > 0 else "")
@@ -0,0 +1,100 @@
+from typing import Any, Tuple
+from datetime import datetime
+import ormsgpack
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from core.research_topic import ResearchTopic
+from core.source_record import SourceRecord
+
+
+class ResearchStateSerializer(SerializerProtocol):
+    """Checkpoint serializer with explicit msgpack encoders for research state.
+
+    ResearchTopic, LangChain messages, source records, tuples, sets and
+    datetimes are packed as msgpack extension types, so encoding never walks
+    pydantic models generically and decoding needs no type-guessing pass.
+    Anything else (LangGraph internals such as Send or Interrupt) falls back to
+    LangGraph's JsonPlusSerializer, so the serializer is safe to use for every
+    checkpoint; fallbacks counts how often that happened.
+    """
+
+    TYPE = "research-msgpack"
+
+    EXT_TOPIC = 1
+    EXT_MESSAGE = 2
+    EXT_TUPLE = 3
+    EXT_DATETIME = 4
+    EXT_SOURCE = 5
+    EXT_SET = 6
+    EXT_FROZENSET = 7
+
+    OPTIONS = (ormsgpack.OPT_PASSTHROUGH_TUPLE | ormsgpack.OPT_PASSTHROUGH_DATETIME
+               | ormsgpack.OPT_PASSTHROUGH_DATACLASS | ormsgpack.OPT_PASSTHROUGH_ENUM
+               | ormsgpack.OPT_PASSTHROUGH_UUID | ormsgpack.OPT_PASSTHROUGH_SUBCLASS)
+
+    def __init__(self):
+        self.fallback = JsonPlusSerializer()
+        self.fallbacks = 0
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.fallback.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self.fallback.loads(data)
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        try:
+            return self.TYPE, self._pack(obj)
+        except TypeError:
+            self.fallbacks += 1
+            return self.fallback.dumps_typed(obj)
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_ == self.TYPE:
+            return self._unpack(payload)
+        return self.fallback.loads_typed(data)
+
+    def _pack(self, obj: Any) -> bytes:
+        return ormsgpack.packb(obj, default=self._default, option=self.OPTIONS)
+
+    def _unpack(self, payload: bytes) -> Any:
+        return ormsgpack.unpackb(payload, ext_hook=self._ext_hook)
+
+    def _default(self, obj: Any) -> ormsgpack.Ext:
+        if isinstance(obj, ResearchTopic):
+            return ormsgpack.Ext(self.EXT_TOPIC, self._pack(obj.model_dump()))
+        if isinstance(obj, BaseMessage):
+            return ormsgpack.Ext(self.EXT_MESSAGE, self._pack(message_to_dict(obj)))
+        if isinstance(obj, SourceRecord):
+            # Keyed by field name, so adding or reordering fields keeps old checkpoints readable
+            return ormsgpack.Ext(self.EXT_SOURCE, self._pack(obj.field_values()))
+        if isinstance(obj, tuple) and type(obj) is tuple:
+            return ormsgpack.Ext(self.EXT_TUPLE, self._pack(list(obj)))
+        if isinstance(obj, frozenset):
+            return ormsgpack.Ext(self.EXT_FROZENSET, self._pack(list(obj)))
+        if isinstance(obj, set):
+            # e.g. the node names a named-barrier channel has seen at a join
+            return ormsgpack.Ext(self.EXT_SET, self._pack(list(obj)))
+        if isinstance(obj, datetime):
+            return ormsgpack.Ext(self.EXT_DATETIME, obj.isoformat().encode())
+        raise TypeError(f"No research-state encoder for {type(obj).__name__}")
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == self.EXT_TOPIC:
+            # Validated when it was created; skip re-validation on every checkpoint read
+            return ResearchTopic.model_construct(**self._unpack(data))
+        if code == self.EXT_MESSAGE:
+            return messages_from_dict([self._unpack(data)])[0]
+        if code == self.EXT_SOURCE:
+            return SourceRecord.from_field_values(self._unpack(data))
+        if code == self.EXT_TUPLE:
+            return tuple(self._unpack(data))
+        if code == self.EXT_SET:
+            return set(self._unpack(data))
+        if code == self.EXT_FROZENSET:
+            return frozenset(self._unpack(data))
+        if code == self.EXT_DATETIME:
+            return datetime.fromisoformat(data.decode())
+        raise TypeError(f"Unknown research-state extension type {code}")
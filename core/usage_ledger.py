@@ -0,0 +1,135 @@
+from typing import Dict, Any, List, Optional, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+import sqlite3
+import threading
+
+
+# Tags (run_id, node, iteration) for the LLM calls made in the current task
+usage_context: ContextVar[Dict[str, Any]] = ContextVar("llm_usage_context", default={})
+
+
+@contextmanager
+def usage_scope(**tags):
+    """Tag every LLM call made inside the block, nesting over outer tags"""
+    token = usage_context.set({**usage_context.get(), **tags})
+    try:
+        yield
+    finally:
+        usage_context.reset(token)
+
+
+class UsageLedger:
+    """Local SQLite ledger of LLM calls with token counts, latency and throughput"""
+
+    COLUMNS = ("run_id", "node", "iteration", "agent", "model")
+
+    _default: Optional["UsageLedger"] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, db_path: str = "llm_usage.db"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at TEXT,
+                    run_id TEXT,
+                    node TEXT,
+                    iteration INTEGER,
+                    agent TEXT,
+                    model TEXT,
+                    prompt_tokens INTEGER,
+                    completion_tokens INTEGER,
+                    ttft_s REAL,
+                    latency_s REAL,
+                    tokens_per_s REAL,
+                    coalesced INTEGER,
+                    cached INTEGER DEFAULT 0,
+                    error TEXT
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_run ON llm_calls(run_id)")
+
+    @classmethod
+    def default(cls) -> "UsageLedger":
+        """Process-wide ledger shared by all agents"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def record(self, agent: str, model: str, latency_s: float, prompt_tokens: int = 0,
+               completion_tokens: int = 0, ttft_s: Optional[float] = None,
+               coalesced: bool = False, cached: bool = False, error: Optional[str] = None) -> Dict[str, Any]:
+        """Record one call, tagged with the current usage_scope.
+
+        Coalesced calls and persistent-cache hits record no tokens of their own.
+        """
+        tags = usage_context.get()
+        entry = {
+            "created_at": datetime.now().isoformat(),
+            "run_id": tags.get("run_id"),
+            "node": tags.get("node"),
+            "iteration": tags.get("iteration"),
+            "agent": agent,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "ttft_s": ttft_s,
+            "latency_s": latency_s,
+            "tokens_per_s": completion_tokens / latency_s if latency_s > 0 and completion_tokens else None,
+            "coalesced": int(coalesced),
+            "cached": int(cached),
+            "error": error
+        }
+        with self._lock, self.conn:
+            self.conn.execute(
+                f"INSERT INTO llm_calls ({', '.join(entry)}) VALUES ({', '.join('?' for _ in entry)})",
+                tuple(entry.values())
+            )
+        return entry
+
+    def aggregate(self, group_by: Sequence[str] = ("agent",), run_id: Optional[str] = None,
+                  since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Totals and averages per group, slowest groups first"""
+        unknown = set(group_by) - set(self.COLUMNS)
+        if unknown:
+            raise ValueError(f"Cannot group by {sorted(unknown)}, expected any of {self.COLUMNS}")
+        columns = ", ".join(group_by)
+        sql = (f"SELECT {columns}, COUNT(*) AS calls, SUM(coalesced) AS coalesced, "
+               "SUM(cached) AS cached, "
+               "SUM(error IS NOT NULL) AS errors, "
+               "SUM(prompt_tokens) AS prompt_tokens, SUM(completion_tokens) AS completion_tokens, "
+               "SUM(latency_s) AS total_latency_s, AVG(latency_s) AS avg_latency_s, "
+               "MAX(latency_s) AS max_latency_s, AVG(ttft_s) AS avg_ttft_s, "
+               "AVG(tokens_per_s) AS avg_tokens_per_s FROM llm_calls")
+        conditions, params = [], []
+        if run_id:
+            conditions.append("run_id = ?")
+            params.append(run_id)
+        if since:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" GROUP BY {columns} ORDER BY total_latency_s DESC"
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+    def calls(self, run_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recent calls, optionally for one run"""
+        sql = "SELECT * FROM llm_calls"
+        params: List[Any] = []
+        if run_id:
+            sql += " WHERE run_id = ?"
+            params.append(run_id)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
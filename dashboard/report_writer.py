@@ -0,0 +1,441 @@
+from typing import Dict, Any, List, Iterator, Iterable, Optional, TextIO, Union
+from itertools import islice
+import html
+import json
+import math
+import os
+
+
+class _ReportView:
+    """Read-only view over a research result that splits each text field once"""
+
+    def __init__(self, result: Dict[str, Any]):
+        self.result = result
+        self.topic_info = self._topic_info(result.get("topic"))
+        self.sources = result.get("sources", []) or []
+        self.findings = result.get("findings", []) or []
+        self.limitations = result.get("limitations", []) or []
+        self.recommendations = result.get("recommendations", []) or []
+        self.analysis = result.get("analysis", {}) or {}
+        self.paper = result.get("final_paper", {}) or {}
+        # Runs stopped by their deadline are marked partial, with the nodes left to run
+        self.partial = bool(result.get("partial"))
+        self.pending = list((result.get("metadata", {}) or {}).get("pending_nodes", []))
+
+        self.plan = self._research_plan(result)
+        self.plan_lines = self.plan.split("\n") if self.plan else []
+        self.plan_words = len(self.plan.split()) if self.plan else 0
+
+        insights = self.analysis.get("comprehensive_analysis", "")
+        self.analysis_lines = insights.split("\n") if insights else []
+
+        abstract = self.paper.get("content", {}).get("abstract", "") if self.paper else ""
+        self.abstract = abstract
+        self.abstract_lines = abstract.split("\n") if abstract else []
+
+    @staticmethod
+    def _topic_info(topic) -> Dict[str, Any]:
+        if isinstance(topic, dict):
+            return topic
+        if hasattr(topic, "model_dump"):
+            return topic.model_dump()
+        if hasattr(topic, "dict"):
+            return topic.dict()
+        return {}
+
+    @staticmethod
+    def _research_plan(result: Dict[str, Any]) -> str:
+        if result.get("research_plan"):
+            return result["research_plan"]
+        if "research_plan" in result.get("metadata", {}):
+            return result["metadata"]["research_plan"] or ""
+        return result.get("analysis", {}).get("comprehensive_analysis", "") or ""
+
+    @property
+    def confidence(self) -> Optional[float]:
+        return self.analysis.get("confidence_score")
+
+    @staticmethod
+    def source_title(source: Dict[str, Any]) -> str:
+        title = source.get("title") or "Untitled"
+        if title == "Untitled":
+            words = (source.get("content") or "").split(None, 5)
+            if len(words) > 2:
+                title = " ".join(words[:5]) + "..."
+        return title
+
+    @staticmethod
+    def source_details(source: Dict[str, Any], snippet_chars: int) -> List[str]:
+        details = []
+        content = source.get("content")
+        if content:
+            snippet = content[:snippet_chars].replace("\n", " ")
+            if len(content) > snippet_chars:
+                snippet += "..."
+            details.append(snippet)
+
+        meta_info = []
+        if source.get("published"):
+            meta_info.append(f"Published: {source['published']}")
+        authors = source.get("authors")
+        if authors:
+            if isinstance(authors, str):
+                authors = [a.strip() for a in authors.split(",") if a.strip()]
+            meta_info.append(f"Authors: {', '.join(authors[:2])}" +
+                             (f" + {len(authors) - 2} more" if len(authors) > 2 else ""))
+        if source.get("relevance_score"):
+            meta_info.append(f"Relevance: {source['relevance_score']:.2f}")
+        if meta_info:
+            details.append(" | ".join(meta_info))
+        return details
+
+    @staticmethod
+    def finding_content(finding: Dict[str, Any]) -> str:
+        content = (finding.get("content") or "").strip()
+        if content.startswith("#"):
+            content = content.lstrip("#").strip()
+        return content
+
+
+class _TextRenderer:
+    """Base renderer: each method returns the text chunk for one element"""
+
+    def begin(self, title: str) -> str:
+        return ""
+
+    def end(self, footer: str) -> str:
+        return ""
+
+    def heading(self, icon: str, title: str) -> str:
+        raise NotImplementedError
+
+    def page(self, page: int, pages: int) -> str:
+        return ""
+
+    def line(self, text: str) -> str:
+        raise NotImplementedError
+
+    def bullet(self, text: str) -> str:
+        raise NotImplementedError
+
+    def item(self, index: int, text: str, details: Iterable[str] = ()) -> str:
+        raise NotImplementedError
+
+    def end_list(self) -> str:
+        return ""
+
+
+class _ConsoleRenderer(_TextRenderer):
+    """Plain-text layout used by the interactive console report"""
+
+    def begin(self, title):
+        return "\n" + "=" * 100 + f"\n🎯 {title}\n" + "=" * 100 + "\n"
+
+    def end(self, footer):
+        return "\n" + "=" * 100 + f"\n✅ {footer}\n" + "=" * 100 + "\n"
+
+    def heading(self, icon, title):
+        return f"\n{icon} {title}\n   {'─' * 40}\n"
+
+    def page(self, page, pages):
+        return f"   ── page {page}/{pages} ──\n"
+
+    def line(self, text):
+        return f"   {text}\n"
+
+    def bullet(self, text):
+        return f"   • {text}\n"
+
+    def item(self, index, text, details=()):
+        chunk = f"   {index}. {text}\n"
+        for detail in details:
+            chunk += f"      └─ {detail}\n"
+        return chunk
+
+
+class _MarkdownRenderer(_TextRenderer):
+    """GitHub-flavoured Markdown report"""
+
+    def begin(self, title):
+        return f"# {title}\n"
+
+    def end(self, footer):
+        return f"\n---\n\n_{footer}_\n"
+
+    def heading(self, icon, title):
+        return f"\n## {title}\n\n"
+
+    def page(self, page, pages):
+        return f"\n### Page {page} of {pages}\n\n"
+
+    def line(self, text):
+        return f"{text}  \n"
+
+    def bullet(self, text):
+        return f"- {text}\n"
+
+    def item(self, index, text, details=()):
+        chunk = f"{index}. {text}\n"
+        for detail in details:
+            chunk += f"   - {detail}\n"
+        return chunk
+
+
+class _HtmlRenderer(_TextRenderer):
+    """Standalone HTML document; lists are closed per page so chunks stay valid"""
+
+    def __init__(self):
+        self._open_list = False
+
+    def begin(self, title):
+        title = html.escape(title)
+        return (f"<!DOCTYPE html>\n<html>\n<head><meta charset=\"utf-8\"><title>{title}</title></head>\n"
+                f"<body>\n<h1>{title}</h1>\n")
+
+    def end(self, footer):
+        return self.end_list() + f"<footer>{html.escape(footer)}</footer>\n</body>\n</html>\n"
+
+    def heading(self, icon, title):
+        return self.end_list() + f"<h2>{html.escape(title)}</h2>\n"
+
+    def page(self, page, pages):
+        return self.end_list() + f"<h3>Page {page} of {pages}</h3>\n"
+
+    def line(self, text):
+        return self.end_list() + f"<p>{html.escape(text)}</p>\n"
+
+    def bullet(self, text):
+        return self._ensure_list("ul") + f"<li>{html.escape(text)}</li>\n"
+
+    def item(self, index, text, details=()):
+        chunk = self._ensure_list("ol", start=index) + f"<li>{html.escape(text)}"
+        if details:
+            chunk += "<ul>" + "".join(f"<li>{html.escape(d)}</li>" for d in details) + "</ul>"
+        return chunk + "</li>\n"
+
+    def end_list(self):
+        if self._open_list:
+            tag, self._open_list = self._open_list, False
+            return f"</{tag}>\n"
+        return ""
+
+    def _ensure_list(self, tag: str, start: int = 1) -> str:
+        if self._open_list == tag:
+            return ""
+        chunk = self.end_list()
+        self._open_list = tag
+        return chunk + (f"<ol start=\"{start}\">\n" if tag == "ol" else "<ul>\n")
+
+
+class ReportWriter:
+    """Render research results section by section to files or streams.
+
+    Output is produced as a sequence of small chunks that are written as soon
+    as they are rendered, and source/finding lists are paginated, so memory use
+    does not grow with the number of sources in a run.
+    """
+
+    FORMATS = ("console", "markdown", "html", "json")
+    EXTENSIONS = {"console": ".txt", "markdown": ".md", "html": ".html", "json": ".json"}
+
+    def __init__(self, fmt: str = "markdown", page_size: int = 50,
+                 max_items: Optional[int] = None, preview_lines: int = 10,
+                 snippet_chars: int = 150):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported report format '{fmt}', expected one of {self.FORMATS}")
+        self.fmt = fmt
+        self.page_size = max(1, page_size)
+        self.max_items = max_items
+        self.preview_lines = preview_lines
+        self.snippet_chars = snippet_chars
+
+    def write(self, result: Dict[str, Any], destination: Union[str, os.PathLike, TextIO]) -> int:
+        """Write the report to a path or text stream, returning characters written"""
+        if isinstance(destination, (str, os.PathLike)):
+            directory = os.path.dirname(os.fspath(destination))
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(destination, "w", encoding="utf-8") as stream:
+                return self._write_stream(result, stream)
+        return self._write_stream(result, destination)
+
+    def render(self, result: Dict[str, Any]) -> Iterator[str]:
+        """Yield the report as a sequence of text chunks"""
+        view = _ReportView(result)
+        if self.fmt == "json":
+            return self._iter_json(view)
+        renderer = {
+            "console": _ConsoleRenderer,
+            "markdown": _MarkdownRenderer,
+            "html": _HtmlRenderer
+        }[self.fmt]()
+        return self._iter_text(view, renderer)
+
+    def _write_stream(self, result: Dict[str, Any], stream: TextIO) -> int:
+        written = 0
+        for chunk in self.render(result):
+            if chunk:
+                stream.write(chunk)
+                written += len(chunk)
+        if hasattr(stream, "flush"):
+            stream.flush()
+        return written
+
+    def _pages(self, items: List[Any]) -> Iterator[tuple]:
+        """Yield (page_number, page_count, start_index, page_items) for a list"""
+        limit = len(items) if self.max_items is None else min(len(items), self.max_items)
+        pages = max(1, math.ceil(limit / self.page_size))
+        for page in range(pages):
+            start = page * self.page_size
+            stop = min(start + self.page_size, limit)
+            yield page + 1, pages, start, islice(items, start, stop)
+
+    def _iter_text(self, view: _ReportView, r: _TextRenderer) -> Iterator[str]:
+        topic = view.topic_info
+        yield r.begin("ADVANCED RESEARCH REPORT")
+
+        # 1. Overview
+        yield r.heading("📋", "RESEARCH OVERVIEW")
+        if topic:
+            yield r.line(f"🔹 Topic: {topic.get('title', 'N/A')}")
+            yield r.line(f"🔹 Domain: {topic.get('domain', 'N/A')}")
+            yield r.line(f"🔹 Complexity: {topic.get('complexity', 'N/A')}")
+            if topic.get("subtopics"):
+                yield r.line(f"🔹 Subtopics: {', '.join(topic['subtopics'])}")
+        else:
+            yield r.line("Topic data not found in result")
+        yield r.line(f"🔹 Research Phase: {view.result.get('research_phase', 'N/A')}")
+        if view.partial:
+            yield r.line(f"⚠️ Partial result: deadline reached before {', '.join(view.pending) or 'completion'}")
+        yield r.line(f"🔹 Sources Analyzed: {len(view.sources)}")
+        yield r.line(f"🔹 Key Findings: {len(view.findings)}")
+
+        # 2. Research plan
+        yield r.heading("📝", "RESEARCH PLAN")
+        if view.plan_lines:
+            for line in view.plan_lines[:self.preview_lines]:
+                if line.strip():
+                    yield r.line(line)
+            if len(view.plan_lines) > self.preview_lines:
+                yield r.line(f"... (truncated, full plan: {view.plan_words} words)")
+        else:
+            yield r.line("No detailed research plan found")
+
+        # 3. Sources, paginated
+        yield r.heading("📚", f"SOURCES FOUND ({len(view.sources)})")
+        for page, pages, start, items in self._pages(view.sources):
+            if pages > 1:
+                yield r.page(page, pages)
+            for i, source in enumerate(items, start + 1):
+                label = f"[{(source.get('source') or 'unknown').upper()}] {view.source_title(source)}"
+                yield r.item(i, label, view.source_details(source, self.snippet_chars))
+            yield r.end_list()
+        yield from self._truncation_note(r, len(view.sources))
+
+        # 4. Findings, paginated
+        yield r.heading("🔍", f"KEY FINDINGS ({len(view.findings)})")
+        for page, pages, start, items in self._pages(view.findings):
+            if pages > 1:
+                yield r.page(page, pages)
+            for i, finding in enumerate(items, start + 1):
+                category = (finding.get("category") or "observation").upper()
+                details = [view.finding_content(finding)]
+                confidence = finding.get("confidence", 0)
+                if confidence:
+                    filled = int(confidence * 10)
+                    details.append(f"Confidence: {confidence:.2f} [{'█' * filled}{'░' * (10 - filled)}]")
+                yield r.item(i, f"[{category}]", details)
+            yield r.end_list()
+        yield from self._truncation_note(r, len(view.findings))
+
+        # 5. Analysis insights
+        if view.analysis:
+            yield r.heading("🧠", "ANALYSIS INSIGHTS")
+            for line in view.analysis_lines[:8]:
+                if len(line.strip()) > 20:
+                    yield r.bullet(line.strip())
+            yield r.end_list()
+            if view.confidence is not None:
+                yield r.line(f"🔹 Overall Confidence Score: {view.confidence:.2f}/1.0")
+
+        # 6. Limitations and recommendations
+        for icon, title, entries in (("⚠️", "IDENTIFIED LIMITATIONS", view.limitations),
+                                     ("💡", "RESEARCH RECOMMENDATIONS", view.recommendations)):
+            if entries:
+                yield r.heading(icon, title)
+                for i, entry in enumerate(entries, 1):
+                    yield r.item(i, str(entry))
+                yield r.end_list()
+
+        # 7. Final paper
+        if view.paper:
+            paper = view.paper
+            yield r.heading("📄", "FINAL RESEARCH PAPER")
+            yield r.line(f"Title: {paper.get('title', 'Research Report')}")
+            if view.partial:
+                yield r.line("Status: ⚠ PARTIAL")
+                yield r.line(f"Unfinished phases: {', '.join(view.pending) or 'not recorded'}")
+            else:
+                yield r.line("Status: ✓ COMPLETED")
+            yield r.line(f"Word Count: {paper.get('word_count', 0):,}")
+            yield r.line(f"Citations: {paper.get('citations_count', 0)}")
+            sections = paper.get("sections", [])
+            if sections:
+                yield r.line(f"Sections: {len(sections)}")
+                for section in sections[:5]:
+                    yield r.bullet(section)
+                if len(sections) > 5:
+                    yield r.bullet(f"... and {len(sections) - 5} more")
+                yield r.end_list()
+            if view.abstract_lines:
+                yield r.heading("📑", "ABSTRACT PREVIEW")
+                for line in view.abstract_lines[:4]:
+                    if line.strip():
+                        yield r.line(line.strip())
+                if len(view.abstract) > 500:
+                    yield r.line(f"... (full abstract: {len(view.abstract)} characters)")
+
+        # 8. Executive summary
+        yield r.heading("⭐", "EXECUTIVE SUMMARY")
+        summary_parts = []
+        if topic:
+            summary_parts.append(f"Research on '{topic.get('title', 'the topic')}'")
+        summary_parts.append(f"analyzed {len(view.sources)} sources")
+        summary_parts.append(f"identified {len(view.findings)} key findings")
+        if view.limitations:
+            summary_parts.append(f"noted {len(view.limitations)} limitations")
+        if view.recommendations:
+            summary_parts.append(f"proposed {len(view.recommendations)} recommendations")
+        yield r.line(f"This research {' and '.join(summary_parts)}.")
+        if view.confidence is not None:
+            conf = view.confidence
+            level = "High" if conf > 0.7 else "Moderate" if conf > 0.5 else "Preliminary"
+            yield r.line(f"Overall confidence: {level} ({conf:.2f}/1.0)")
+
+        yield r.end("RESEARCH COMPLETE")
+
+    def _truncation_note(self, r: _TextRenderer, total: int) -> Iterator[str]:
+        if self.max_items is not None and total > self.max_items:
+            yield r.line(f"... and {total - self.max_items} more not shown")
+
+    def _iter_json(self, view: _ReportView) -> Iterator[str]:
+        """Stream a JSON document, encoding list entries one at a time"""
+        # Source records from a live run carry their own dict form
+        plain = lambda value: value.to_dict() if hasattr(value, "to_dict") else str(value)
+        dumps = lambda value: json.dumps(value, default=plain, ensure_ascii=False)
+        yield "{\n"
+        yield f'"topic": {dumps(view.topic_info)},\n'
+        yield f'"research_phase": {dumps(view.result.get("research_phase"))},\n'
+        yield f'"partial": {dumps(view.partial)},\n'
+        yield f'"research_plan": {dumps(view.plan)},\n'
+        for key, items in (("sources", view.sources), ("findings", view.findings)):
+            yield f'"{key}": ['
+            for i, item in enumerate(items):
+                yield ("," if i else "") + "\n  " + dumps(item)
+            yield "\n],\n"
+        yield f'"analysis": {dumps(view.analysis)},\n'
+        yield f'"limitations": {dumps(view.limitations)},\n'
+        yield f'"recommendations": {dumps(view.recommendations)},\n'
+        yield f'"citations": {dumps(view.result.get("citations", []))},\n'
+        yield f'"final_paper": {dumps(view.paper)}\n'
+        yield "}\n"
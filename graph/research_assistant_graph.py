@@ -1,26 +1,59 @@
 from typing import Dict, Any, List, Optional
+import asyncio
+import time
+from collections import Counter, defaultdict
 import aiosqlite
 import uuid
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 import aiosqlite # Import aiosqlite for async SQLite connections
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from core.research_state import ResearchState
 from agents.research_coordinator_agent import ResearchCoordinatorAgent
 from agents.search_specialist_agent import SearchSpecialistAgent
 from agents.analyst_agent import AnalystAgent   
+from agents.writer_agent import WriterAgent
 from datetime import datetime
 from langchain_core.messages import SystemMessage, HumanMessage
 from core.research_topic import ResearchTopic
+from core.state_compactor import StateCompactor
+from core.usage_ledger import usage_scope
+from core.state_serde import ResearchStateSerializer
+from core.deadline import Deadline, DeadlineExceeded, deadline_scope
 
 
 
 class ResearchAssistantGraph:
     """Main research assistant graph with complex workflow"""
 
-    def __init__(self):
+    def __init__(self, speculative_start: bool = True, relevance_threshold: float = 0.25,
+                 compactor: Optional[StateCompactor] = None, max_analysis_passes: int = 3,
+                 pipelined: bool = False, checkpointer=None, agents: Optional[Dict[str, Any]] = None):
+        # Run the coordinator and the first search round as parallel branches
+        self.speculative_start = speculative_start
+        # Minimum topic similarity for a source or finding to survive validation
+        self.relevance_threshold = relevance_threshold
+        # Trims message history and stale analysis whenever a loop node re-runs
+        self.compactor = compactor or StateCompactor()
+        # Upper bound on analyst runs before the workflow proceeds to synthesis
+        self.max_analysis_passes = max_analysis_passes
+        # Analyze early search batches while the remaining queries are still running
+        self.pipelined = pipelined
         # Correctly instantiate AsyncSqliteSaver with an aiosqlite connection
-        self.memory = AsyncSqliteSaver(conn=aiosqlite.connect("research_checkpoints.db"))
-        self.agents = self._initialize_agents()
+        # Workers on several machines pass a checkpointer backed by a shared store instead
+        self.memory = checkpointer or AsyncSqliteSaver(
+            conn=aiosqlite.connect("research_checkpoints.db"),
+            serde=ResearchStateSerializer()
+        )
+        # Prebuilt agents replace the default set, e.g. to share models between graphs
+        self.agents = agents or self._initialize_agents()
+        self.content_analyzer = self.agents["search_specialist"].content_analyzer
+        self.agents["analyst"].embed_fn = self.content_analyzer.embed
+        # Per-node wall-clock timings of the most recently finished run
+        self.node_timings: List[Dict[str, Any]] = []
+        # Timings and visits per (run, node) of runs in progress, dropped when each run ends;
+        # visits tag LLM usage with the loop iteration
+        self._run_timings: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+        self._node_visits: Counter = Counter()
         self.graph = self._build_graph()
         self.app = self._compile_graph()
 
@@ -31,6 +64,7 @@ class ResearchAssistantGraph:
             "research_coordinator": ResearchCoordinatorAgent(),
             "search_specialist": SearchSpecialistAgent(),
             "analyst": AnalystAgent(),
+            "writer": WriterAgent(),
             # Additional agents can be added here
         }
 
@@ -39,15 +73,23 @@ class ResearchAssistantGraph:
         workflow = StateGraph(ResearchState)
 
         # Add nodes for each agent
-        workflow.add_node("research_coordinator", self._create_agent_node("research_coordinator"))
-        workflow.add_node("search_specialist", self._create_agent_node("search_specialist"))
-        workflow.add_node("analyst", self._create_agent_node("analyst"))
-        workflow.add_node("validator", self._validator_node)
-        workflow.add_node("synthesizer", self._synthesizer_node)
-        workflow.add_node("writer", self._writer_node)
+        for agent_type in ("research_coordinator", "search_specialist", "analyst"):
+            self._add_node(workflow, agent_type, self._compacting_node(self._create_agent_node(agent_type)))
+        self._add_node(workflow, "validator", self._validator_node)
+        self._add_node(workflow, "synthesizer", self._synthesizer_node)
+        self._add_node(workflow, "writer", self._writer_node)
 
         # Define the workflow edges with conditional routing
-        workflow.set_entry_point("research_coordinator")
+        if self.speculative_start:
+            # The first search round only needs the topic, so it runs alongside
+            # the coordinator's planning call and both branches join at the analyst
+            self._add_node(workflow, "kickoff_coordinator", self._create_kickoff_node("research_coordinator"))
+            self._add_node(workflow, "kickoff_search", self._create_kickoff_node("search_specialist"))
+            workflow.add_edge(START, "kickoff_coordinator")
+            workflow.add_edge(START, "kickoff_search")
+            workflow.add_edge(["kickoff_coordinator", "kickoff_search"], "analyst")
+        else:
+            workflow.set_entry_point("research_coordinator")
 
         # Main research flow
         workflow.add_edge("research_coordinator", "search_specialist")
@@ -69,8 +111,9 @@ class ResearchAssistantGraph:
             "validator",
             self._route_from_validator,
             {
-                "analyst": "analyst",       # If needs revision
-                "synthesizer": "synthesizer" # If validation passed
+                "search_specialist": "search_specialist",  # If more sources are needed
+                "analyst": "analyst",       # If the analysis needs revision
+                "synthesizer": "synthesizer" # If validation passed or revisions are exhausted
             }
         )
 
@@ -87,6 +130,8 @@ class ResearchAssistantGraph:
             if agent_type == "research_coordinator":
                 return await agent.coordinate(state)
             elif agent_type == "search_specialist":
+                if self.pipelined:
+                    return await self._pipelined_search(state)
                 return await agent.search(state)
             elif agent_type == "analyst":
                 return await agent.analyze(state)
@@ -95,10 +140,67 @@ class ResearchAssistantGraph:
 
         return agent_node
 
+    async def _pipelined_search(self, state: ResearchState) -> Dict[str, Any]:
+        """Search while the analyst works through early batches as they arrive"""
+        analyst = self.agents["analyst"]
+        partial_tasks = []
+        update = {}
+        async for batch in self.agents["search_specialist"].search_stream(state):
+            if batch["done"]:
+                update = batch["update"]
+            elif batch["remaining"] and batch["results"]:
+                # The tail batch is left for the analyst's final merge pass
+                partial_tasks.append(asyncio.create_task(analyst.analyze_batch(state["topic"], batch["results"])))
+        partial_analyses = [partial for partial in await asyncio.gather(*partial_tasks) if partial]
+        return {**update, "partial_analyses": partial_analyses}
+
+    def _add_node(self, workflow: StateGraph, name: str, node):
+        workflow.add_node(name, self._timed_node(name, node))
+
+    def _timed_node(self, name: str, node):
+        """Wrap a node so its wall-clock duration is recorded with its run's timings"""
+        async def timed_node(state: ResearchState):
+            run_id = state.get("metadata", {}).get("topic_id")
+            self._node_visits[(run_id, name)] += 1
+            started = time.perf_counter()
+            try:
+                with usage_scope(run_id=run_id, node=name, iteration=self._node_visits[(run_id, name)]):
+                    return await node(state)
+            finally:
+                self._run_timings[run_id].append({
+                    "node": name,
+                    "duration": time.perf_counter() - started,
+                    "finished_at": datetime.now().isoformat()
+                })
+
+        return timed_node
+
+    def _compacting_node(self, node):
+        """Compact stored sources and stale analysis before a loop node runs on the compacted view"""
+        async def compacting_node(state: ResearchState):
+            updates = self.compactor.compact_state(state)
+            if not updates:
+                return await node(state)
+            result = await node({**state, **updates})
+            return {**updates, **result}
+
+        return compacting_node
+
+    def _create_kickoff_node(self, agent_type: str):
+        """Create a parallel entry node; only the search branch sets the research phase"""
+        agent_node = self._create_agent_node(agent_type)
+
+        async def kickoff_node(state: ResearchState):
+            result = await agent_node(state)
+            if agent_type != "search_specialist":
+                result = {key: value for key, value in result.items() if key != "research_phase"}
+            return result
+
+        return kickoff_node
+
     async def _validator_node(self, state: ResearchState) -> Dict[str, Any]:
         """Validate research quality and completeness"""
         analysis = state.get("analysis", {})
-        findings = state.get("findings", [])
 
         validation_results = {
             "timestamp": datetime.now().isoformat(),
@@ -107,8 +209,21 @@ class ResearchAssistantGraph:
             "issues": []
         }
 
+        # Check 0: Topic relevance, pruning off-topic sources and findings
+        relevance = await self._check_relevance(state)
+        sources = relevance["sources"]
+        findings = relevance["findings"]
+        off_topic = relevance["off_topic_sources"] + relevance["off_topic_findings"]
+        validation_results["checks"].append({
+            "check": "topic_relevance",
+            "passed": off_topic == 0,
+            "message": (f"Pruned {relevance['off_topic_sources']} off-topic sources and "
+                        f"{relevance['off_topic_findings']} off-topic findings "
+                        f"(threshold {self.relevance_threshold:.2f})")
+        })
+
         # Check 1: Sufficient sources
-        sources_count = len(state.get("sources", []))
+        sources_count = len(sources)
         if sources_count < 3:
             validation_results["checks"].append({
                 "check": "minimum_sources",
@@ -119,12 +234,12 @@ class ResearchAssistantGraph:
             validation_results["issues"].append("insufficient_sources")
 
         # Check 2: Analysis depth
-        analysis_text = analysis.get("comprehensive_analysis", "")
-        if len(analysis_text.split()) < 200:
+        analysis_words = len(analysis.get("comprehensive_analysis", "").split())
+        if analysis_words < 200:
             validation_results["checks"].append({
                 "check": "analysis_depth",
                 "passed": False,
-                "message": f"Analysis too brief: {len(analysis_text.split())} words"
+                "message": f"Analysis too brief: {analysis_words} words"
             })
             validation_results["passed"] = False
             validation_results["issues"].append("shallow_analysis")
@@ -139,41 +254,87 @@ class ResearchAssistantGraph:
             validation_results["passed"] = False
             validation_results["issues"].append("insufficient_findings")
 
-        # Add passed checks
-        validation_results["checks"].extend([
-            {
-                "check": "topic_relevance",
-                "passed": True,
-                "message": "All findings are relevant to research topic"
-            },
-            {
-                "check": "citation_presence",
-                "passed": True,
-                "message": f"Found {len(state.get('citations', []))} citations"
-            }
-        ])
-
-        return {
+        # Check 4: Citations present; pruned sources leave the references too
+        citations = [citation for citation in state.get("citations", [])
+                     if citation.get("id") not in relevance["pruned_ids"]]
+        citations_count = len(citations)
+        validation_results["checks"].append({
+            "check": "citation_presence",
+            "passed": citations_count > 0,
+            "message": f"Found {citations_count} citations"
+        })
+
+        updates = {
             "validation_errors": validation_results.get("issues", []),
             "validation_results": validation_results,
             "research_phase": "synthesis" if validation_results["passed"] else "needs_revision"
         }
+        if relevance["off_topic_sources"]:
+            updates["sources"] = sources
+            updates["search_results"] = [source.citation_id for source in sources]
+            updates["citations"] = citations
+        if relevance["off_topic_findings"]:
+            updates["findings"] = findings
+            # Tombstones keep the next analyst pass from adding them back
+            updates["pruned_finding_ids"] = list(dict.fromkeys(
+                state.get("pruned_finding_ids", []) + relevance["pruned_finding_ids"]
+            ))
+        return updates
+
+    async def _check_relevance(self, state: ResearchState) -> Dict[str, Any]:
+        """Score sources and findings against the topic in one embedding pass"""
+        topic = state["topic"]
+        sources = state.get("sources", [])
+        findings = state.get("findings", [])
+
+        texts = [finding.get("content", "") for finding in findings]
+        for source in sources:
+            body = source.get("content") or source.get("summary") or source.get("abstract") or ""
+            texts.append(f"{source.get('title', '')} {body[:500]}")
+
+        topic_text = " ".join([topic.title, topic.domain] + list(topic.subtopics))
+        # to_thread carries the run's deadline into the embedding batches
+        scores = await asyncio.to_thread(self.content_analyzer.relevance_scores, topic_text, texts)
+        keep = scores >= self.relevance_threshold
+
+        kept_findings = [f for f, ok in zip(findings, keep[:len(findings)]) if ok]
+        kept_sources = [s for s, ok in zip(sources, keep[len(findings):]) if ok]
+        kept_ids = {source.citation_id for source in kept_sources}
+        return {
+            "sources": kept_sources,
+            "findings": kept_findings,
+            "pruned_ids": {source.citation_id for source in sources} - kept_ids,
+            "pruned_finding_ids": [f["id"] for f, ok in zip(findings, keep[:len(findings)]) if not ok],
+            "off_topic_sources": len(sources) - len(kept_sources),
+            "off_topic_findings": len(findings) - len(kept_findings)
+        }
 
     def _route_based_on_quality(self, state: ResearchState) -> str:
-        """Route based on analysis quality"""
+        """Route based on analysis quality to the cheapest step that can improve it"""
         analysis = state.get("analysis", {})
         confidence = analysis.get("confidence_score", 0.0)
 
-        if confidence < 0.4:
+        if state.get("analysis_passes", 0) >= self.max_analysis_passes:
+            return "continue"
+        # Confidence is derived from source quality, so weak sources call for more
+        # searching; a new plan only helps when there is no usable plan at all
+        if confidence < 0.4 or len(state.get("sources", [])) < 3:
             return "redo_search"
-        elif confidence < 0.7:
+        elif confidence < 0.7 and not state.get("research_plan", "").strip():
             return "escalate"
         else:
             return "continue"
 
     def _route_from_validator(self, state: ResearchState) -> str:
-        """Route based on validation results"""
-        if state.get("research_phase") == "needs_revision":
+        """Route each validation issue to the cheapest action that can fix it"""
+        if state.get("research_phase") != "needs_revision":
+            return "synthesizer"
+        if state.get("analysis_passes", 0) >= self.max_analysis_passes:
+            return "synthesizer"
+        issues = set(state.get("validation_errors", []))
+        if "insufficient_sources" in issues:
+            return "search_specialist"
+        if issues & {"shallow_analysis", "insufficient_findings"}:
             return "analyst"
         return "synthesizer"
 
@@ -200,33 +361,7 @@ class ResearchAssistantGraph:
 
     async def _writer_node(self, state: ResearchState) -> Dict[str, Any]:
         """Generate final research paper"""
-        paper_sections = [
-            "Title and Abstract",
-            "Introduction",
-            "Literature Review",
-            "Methodology",
-            "Findings and Analysis",
-            "Discussion",
-            "Limitations",
-            "Conclusion and Recommendations",
-            "References"
-        ]
-
-        final_paper = {
-            "title": f"Research Report: {state['topic'].title}",
-            "sections": paper_sections,
-            "content": self._compile_final_paper(state),
-            "generated_at": datetime.now().isoformat(),
-            "word_count": sum(len(section.split()) for section in paper_sections),
-            "citations_count": len(state.get("citations", [])),
-            "metadata": state.get("metadata", {})
-        }
-
-        return {
-            "final_paper": final_paper,
-            "research_phase": "completed",
-            "completion_time": datetime.now().isoformat()
-        }
+        return await self.agents["writer"].write(state)
 
     def _compile_graph(self):
         """Compile the graph with memory and parallel processing"""
@@ -295,34 +430,15 @@ class ResearchAssistantGraph:
             "Application of findings in practical contexts"
         ]
 
-    def _compile_final_paper(self, state: ResearchState) -> Dict[str, str]:
-        """Compile final research paper sections"""
-        return {
-            "abstract": self._generate_executive_summary(state),
-            "introduction": f"Introduction to {state['topic'].title} research...",
-            "literature_review": state.get("literature_review", ""),
-            "methodology": state.get("methodology", ""),
-            "findings": "\n".join([f["content"] for f in state.get("findings", [])]),
-            "discussion": "Analysis and interpretation of findings...",
-            "limitations": "\n".join(state.get("limitations", [])),
-            "conclusion": "Summary of research and implications...",
-            "references": self._format_citations(state.get("citations", []))
-        }
+    async def run_research(self, topic: ResearchTopic, config: Optional[Dict] = None,
+                           thread_id: Optional[str] = None, deadline_s: Optional[float] = None,
+                           deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Execute the complete research workflow, resuming thread_id from its last checkpoint if it has one.
 
-    def _format_citations(self, citations: List[Dict]) -> str:
-        """Format citations in APA style"""
-        formatted = []
-        for i, citation in enumerate(citations, 1):
-            formatted.append(
-                f"{i}. {citation.get('authors', ['Author'])[0]} et al. "
-                f"({citation.get('published', 'n.d.').split('-')[0]}). "
-                f"{citation.get('title', 'Untitled')}. "
-                f"{citation.get('source', 'Unknown')}."
-            )
-        return "\n".join(formatted)
-
-    async def run_research(self, topic: ResearchTopic, config: Optional[Dict] = None) -> Dict[str, Any]:
-        """Execute the complete research workflow"""
+        When deadline_s passes, or deadline.cancel() is called, in-flight work is
+        cancelled and the last checkpointed state is returned with partial=True.
+        """
+        deadline = deadline or Deadline(deadline_s)
         initial_state = {
             "topic": topic,
             "messages": [
@@ -330,16 +446,22 @@ class ResearchAssistantGraph:
                 HumanMessage(content=f"Research topic: {topic.title}")
             ],
             "research_phase": "initiated",
-            "search_results": {},
+            "research_plan": "",
+            "search_results": [],
+            "search_passes": 0,
             "sources": [],
             "analysis": {},
             "literature_review": "",
             "methodology": "",
             "findings": [],
+            "pruned_finding_ids": [],
             "limitations": [],
             "recommendations": [],
             "citations": [],
             "validation_errors": [],
+            "validation_results": {},
+            "analysis_passes": 0,
+            "partial_analyses": [],
             "metadata": {
                 "start_time": datetime.now().isoformat(),
                 "topic_id": str(uuid.uuid4()),
@@ -347,19 +469,69 @@ class ResearchAssistantGraph:
             },
             "agent_logs": []
         }
-        final_state = {}
-
         config_dict = {
             "configurable": {
-                "thread_id": str(uuid.uuid4()),
+                "thread_id": thread_id or str(uuid.uuid4()),
                 "checkpointer": self.memory
             }
         }
 
-        async for step in self.app.astream(initial_state, config=config_dict):
+        snapshot = await self.app.aget_state(config_dict)
+        final_state = dict(snapshot.values)
+        if final_state and not snapshot.next:
+            # This thread already ran to completion
+            return {**final_state, "partial": False}
+        # None continues an interrupted run from its checkpoint instead of starting over
+        inputs = None if final_state else initial_state
+        run_id = (final_state or initial_state)["metadata"]["topic_id"]
+
+        loop = asyncio.get_running_loop()
+        # The task copies the current context, so every node it runs sees the deadline
+        with deadline_scope(deadline):
+            run = asyncio.create_task(self._stream_steps(inputs, config_dict, final_state))
+        deadline.add_callback(lambda: loop.call_soon_threadsafe(run.cancel))
+        remaining = deadline.remaining()
+        timer = loop.call_later(remaining, deadline.cancel) if remaining is not None else None
+        try:
+            await run
+        except (asyncio.CancelledError, DeadlineExceeded):
+            if not deadline.cancelled:
+                raise
+            return await self._partial_state(config_dict, final_state, deadline)
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._end_run(run_id)
+
+        final_state["partial"] = False
+        return final_state
+
+    def _end_run(self, run_id: str):
+        """Keep the finished run's timings as node_timings and drop its per-run counters"""
+        self.node_timings = self._run_timings.pop(run_id, [])
+        for key in [key for key in self._node_visits if key[0] == run_id]:
+            del self._node_visits[key]
+
+    async def _stream_steps(self, inputs: Optional[Dict[str, Any]], config_dict: Dict[str, Any],
+                            final_state: Dict[str, Any]):
+        async for step in self.app.astream(inputs, config=config_dict):
             for key, value in step.items():
                 if key != "__end__":
                     print(f"Step: {key}")
                     final_state.update(value)
 
-        return final_state
\ No newline at end of file
+    async def _partial_state(self, config_dict: Dict[str, Any], final_state: Dict[str, Any],
+                             deadline: Deadline) -> Dict[str, Any]:
+        """Best available state after a deadline: the last checkpoint, marked partial"""
+        snapshot = await self.app.aget_state(config_dict)
+        partial = {**final_state, **snapshot.values, "partial": True}
+        partial["metadata"] = {
+            **partial.get("metadata", {}),
+            "partial": True,
+            "deadline_s": deadline.seconds,
+            # Resuming the same thread_id later runs these nodes and continues the workflow
+            "pending_nodes": list(snapshot.next),
+            "thread_id": config_dict["configurable"]["thread_id"]
+        }
+        print(f"Deadline reached; returning partial state (pending: {', '.join(snapshot.next) or 'none'})")
+        return partial
\ No newline at end of file
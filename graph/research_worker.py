@@ -0,0 +1,152 @@
+"""Worker mode: several processes pull research topics from a shared job queue.
+
+Start any number of workers on one machine sharing the queue, cache and
+checkpoint files, then enqueue topics:
+
+    python -m graph.research_worker work --concurrency 2
+    python -m graph.research_worker enqueue --title "Discounted Cash Flow in modern world" --domain Finance
+    python -m graph.research_worker status
+
+A job whose worker dies is picked up by another worker once its lease
+expires, and it resumes from the run's last checkpoint. The SQLite stores
+are single-host; spreading workers over several machines takes a JobQueue,
+cache and checkpointer backed by shared services.
+"""
+from typing import Dict, Any, Optional
+import argparse
+import asyncio
+import json
+import os
+import socket
+import uuid
+from core.job_queue import JobQueue, SqliteJobQueue
+from core.persistent_cache import PersistentCache, shared_cache, set_shared_cache
+from core.research_topic import ResearchTopic
+
+
+class ResearchWorker:
+    """Claims jobs from a JobQueue and runs them through one ResearchAssistantGraph"""
+
+    def __init__(self, queue: JobQueue, assistant=None, worker_id: Optional[str] = None,
+                 concurrency: int = 1, lease_s: float = 300.0, poll_s: float = 2.0):
+        if assistant is None:
+            from graph.research_assistant_graph import ResearchAssistantGraph
+            assistant = ResearchAssistantGraph()
+        self.queue = queue
+        self.assistant = assistant
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.concurrency = concurrency
+        self.lease_s = lease_s
+        self.poll_s = poll_s
+        self.completed = 0
+        self.failed = 0
+
+    async def run(self, drain: bool = False):
+        """Process jobs until cancelled, or until the queue is empty when drain is set"""
+        loop = asyncio.get_event_loop()
+        slots = asyncio.Semaphore(self.concurrency)
+        running = set()
+        while True:
+            await slots.acquire()
+            job = await loop.run_in_executor(None, self.queue.claim, self.worker_id, self.lease_s)
+            if job is None:
+                slots.release()
+                if drain and not running:
+                    return
+                await asyncio.sleep(self.poll_s)
+                continue
+            task = asyncio.create_task(self.run_job(job))
+            running.add(task)
+            task.add_done_callback(lambda done: (running.discard(done), slots.release()))
+
+    async def run_job(self, job: Dict[str, Any]):
+        """Run one claimed job while renewing its lease"""
+        loop = asyncio.get_event_loop()
+        topic = ResearchTopic(**job["topic"])
+        run = asyncio.create_task(self.assistant.run_research(topic, job["config"], thread_id=job["thread_id"]))
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"], run))
+        print(f"[{self.worker_id}] Running job {job['id']} (attempt {job['attempts']}): {topic.title}")
+        try:
+            final_state = await run
+        except asyncio.CancelledError:
+            if not heartbeat.done() or heartbeat.cancelled():
+                raise
+            # The heartbeat found the job held by another worker, which now owns the run
+            print(f"[{self.worker_id}] Lost lease on job {job['id']}")
+            return
+        except Exception as e:
+            self.failed += 1
+            print(f"[{self.worker_id}] Job {job['id']} failed: {e}")
+            await loop.run_in_executor(None, self.queue.fail, job["id"], self.worker_id, repr(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        self.completed += 1
+        paper = final_state.get("final_paper", {})
+        result = {
+            "thread_id": job["thread_id"],
+            "research_phase": final_state.get("research_phase"),
+            "sources": len(final_state.get("sources", [])),
+            "word_count": paper.get("word_count", 0)
+        }
+        await loop.run_in_executor(None, self.queue.complete, job["id"], self.worker_id, result)
+        print(f"[{self.worker_id}] Completed job {job['id']}")
+
+    async def _heartbeat(self, job_id: str, run: asyncio.Task):
+        """Renew the lease every third of its length; stop the run if another worker took it over"""
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(self.lease_s / 3)
+            held = await loop.run_in_executor(None, self.queue.heartbeat, job_id, self.worker_id, self.lease_s)
+            if not held:
+                run.cancel()
+                return
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Research worker and job queue commands")
+    parser.add_argument("--queue-db", default="research_jobs.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    work = commands.add_parser("work", help="Pull and run jobs")
+    work.add_argument("--concurrency", type=int, default=1)
+    work.add_argument("--lease", type=float, default=300.0, help="Lease length in seconds")
+    work.add_argument("--cache-db", default="research_cache.db",
+                      help="Search/LLM cache shared by workers; '' disables it")
+    work.add_argument("--drain", action="store_true", help="Exit once the queue is empty")
+
+    enqueue = commands.add_parser("enqueue", help="Add a research topic to the queue")
+    enqueue.add_argument("--title", required=True)
+    enqueue.add_argument("--domain", required=True)
+    enqueue.add_argument("--complexity", default="intermediate")
+    enqueue.add_argument("--subtopic", action="append", default=[])
+    enqueue.add_argument("--priority", type=int, default=0)
+
+    status = commands.add_parser("status", help="Show queue counts and recent jobs")
+    status.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    queue = SqliteJobQueue(args.queue_db)
+    if args.command == "enqueue":
+        topic = ResearchTopic(title=args.title, domain=args.domain,
+                              complexity=args.complexity, subtopics=args.subtopic)
+        print(queue.enqueue(topic.model_dump(), priority=args.priority))
+    elif args.command == "status":
+        print(json.dumps({
+            "counts": queue.stats(),
+            "jobs": [
+                {key: job[key] for key in ("id", "status", "attempts", "worker_id", "error", "result")}
+                for job in queue.jobs(limit=args.limit)
+            ]
+        }, indent=2, default=str))
+    else:
+        if args.cache_db and shared_cache() is None:
+            set_shared_cache(PersistentCache(args.cache_db))
+        worker = ResearchWorker(queue, concurrency=args.concurrency, lease_s=args.lease)
+        await worker.run(drain=args.drain)
+        print(json.dumps({"worker": worker.worker_id, "completed": worker.completed, "failed": worker.failed}))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
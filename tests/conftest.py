@@ -0,0 +1,175 @@
+import asyncio
+import os
+import sys
+import pytest
+
+# Tests import the project packages (core, agents, graph, ...) from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeContentAnalyzer:
+    """Deterministic stand-in for the sentence-transformer model"""
+
+    def __init__(self, scores=None):
+        # Relevance score per text prefix; unmatched texts score 1.0
+        self.scores = scores or {}
+
+    def embed(self, texts):
+        import numpy as np
+        vectors = np.zeros((len(texts), 8), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, hash(word) % 8] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def analyze_content(self, content):
+        return {"chunks": 1, "word_count": len(content.split()), "sentence_count": len(content.split("."))}
+
+    def relevance_scores(self, query, texts):
+        import numpy as np
+        return np.array([next((score for prefix, score in self.scores.items() if text.startswith(prefix)), 1.0)
+                         for text in texts], dtype=np.float32)
+
+
+class FakeSearchTool:
+    """The statistics SearchSpecialistAgent reads from AdvancedResearch after a search"""
+
+    def __init__(self):
+        self.flights = type("Flights", (), {"stats": lambda self: {"coalesced": 0}})()
+        self.query_cache = type("QueryCache", (), {"stats": lambda self: {}})()
+
+    def latency_report(self):
+        return {}
+
+
+class FakeKnowledgeBase:
+    def __init__(self):
+        self.added = []
+
+    def add_sources(self, topic, sources):
+        self.added.extend(sources)
+
+
+class FakeCoordinator:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def coordinate(self, state):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"research_phase": "literature_review", "research_plan": "1. Key questions", "analysis": {}}
+
+
+class FakeSearch:
+    def __init__(self, sources=3, delay=0.0):
+        self.delay = delay
+        self.count = sources
+        self.calls = 0
+        self.states = []
+        self.content_analyzer = FakeContentAnalyzer()
+
+    async def search(self, state):
+        from core.source_record import SourceRecord
+        self.calls += 1
+        self.states.append(state)
+        await asyncio.sleep(self.delay)
+        sources = [SourceRecord(citation_id=f"web:{i}", source="web", title=f"Source {i}",
+                                content=f"Source {i} on discounted cash flow") for i in range(self.count)]
+        return {
+            "search_results": [source.citation_id for source in sources],
+            "sources": sources,
+            "citations": [{"id": source.citation_id, "title": source.title} for source in sources],
+            "research_phase": "analysis"
+        }
+
+
+class FakeAnalyst:
+    def __init__(self, confidence=0.9, words=250):
+        self.confidence = confidence
+        self.words = words
+        self.calls = 0
+        self.embed_fn = None
+
+    async def analyze(self, state):
+        self.calls += 1
+        return {
+            "analysis": {"comprehensive_analysis": "finding " * self.words, "confidence_score": self.confidence},
+            "findings": [{"id": f"finding:{i}", "content": f"Finding {i}", "category": "result",
+                          "confidence": 0.8} for i in range(2)],
+            "research_phase": "synthesis",
+            "analysis_passes": state.get("analysis_passes", 0) + 1
+        }
+
+
+class FakeWriter:
+    async def write(self, state):
+        return {"final_paper": {"title": state["topic"].title, "word_count": 100},
+                "research_phase": "completed"}
+
+
+@pytest.fixture
+def topic():
+    pytest.importorskip("pydantic")
+    from core.research_topic import ResearchTopic
+    return ResearchTopic(title="Discounted cash flow valuation", domain="Finance")
+
+
+@pytest.fixture
+def make_graph():
+    """Build a ResearchAssistantGraph over fake agents and an in-memory checkpointer"""
+    pytest.importorskip("langgraph")
+    pytest.importorskip("sentence_transformers")
+    from langgraph.checkpoint.memory import InMemorySaver
+    from graph.research_assistant_graph import ResearchAssistantGraph
+
+    def factory(coordinator=None, search=None, analyst=None, writer=None, **options):
+        agents = {
+            "research_coordinator": coordinator or FakeCoordinator(),
+            "search_specialist": search or FakeSearch(),
+            "analyst": analyst or FakeAnalyst(),
+            "writer": writer or FakeWriter()
+        }
+        return ResearchAssistantGraph(checkpointer=InMemorySaver(), agents=agents, **options)
+
+    return factory
+
+
+@pytest.fixture
+def make_specialist():
+    """Build a SearchSpecialistAgent whose provider rounds come from results_for(query)"""
+    try:
+        from agents.search_specialist_agent import SearchSpecialistAgent
+    except ImportError as e:
+        pytest.skip(f"search specialist dependencies unavailable: {e}")
+
+    def factory(results_for, **settings):
+        # Skip __init__, which loads the embedding model and chat clients
+        agent = SearchSpecialistAgent.__new__(SearchSpecialistAgent)
+        agent.content_analyzer = FakeContentAnalyzer()
+        agent.search_tool = FakeSearchTool()
+        agent.knowledge_base = FakeKnowledgeBase()
+        agent.max_results = 3
+        agent.wave_size = 2
+        agent.stagger_s = 2.0
+        agent.max_queries = 8
+        agent.max_results_cap = 5
+        agent.min_novelty = 0.15
+        agent.widen_novelty = 0.45
+        agent.provider_min_novelty = 0.1
+        agent.gap_queries_per_pass = 3
+        for name, value in settings.items():
+            setattr(agent, name, value)
+        agent.issued = []
+        agent.activity = []
+
+        async def execute_search(query, topic, max_results=None, providers=None):
+            agent.issued.append(query)
+            return {"query": query, "results": results_for(query)}
+
+        agent._execute_search = execute_search
+        agent.log_activity = lambda activity, metadata=None: agent.activity.append((activity, metadata))
+        return agent
+
+    return factory
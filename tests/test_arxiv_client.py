@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import pytest
+
+pytest.importorskip("requests")
+from core.arxiv_client import ArxivBatchClient
+
+
+class RecordingClient(ArxivBatchClient):
+    ENTRIES = [
+        {"source": "arxiv", "title": "Discounted cash flow valuation", "summary": "Terminal value estimates",
+         "arxiv_id": "2401.00001"},
+        {"source": "arxiv", "title": "Option pricing", "summary": "Black Scholes volatility surfaces",
+         "arxiv_id": "2401.00002"}
+    ]
+
+    def __init__(self, **options):
+        self.params = []
+        super().__init__(**options)
+
+    def _request(self, params):
+        self.params.append(params)
+        return self.ENTRIES
+
+
+def test_queries_in_one_window_share_a_request_and_are_split_again():
+    client = RecordingClient(window_s=0.2, min_interval=0.0)
+
+    dcf = client.search("discounted cash flow recent developments", 5)
+    options = client.search("option pricing research papers", 5)
+
+    assert [r["arxiv_id"] for r in dcf.result(timeout=2)] == ["2401.00001"]
+    assert [r["arxiv_id"] for r in options.result(timeout=2)] == ["2401.00002"]
+    assert len(client.params) == 1 and " OR " in client.params[0]["search_query"]
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    client = ArxivBatchClient(min_interval=3.0)
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+    assert client._retry_after("5") == 5.0
+    assert 25 <= client._retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+    assert client._retry_after(format_datetime(datetime(2000, 1, 1, tzinfo=timezone.utc), usegmt=True)) == 0.0
+
+
+def test_unreadable_retry_after_falls_back_to_the_pacing_interval():
+    client = ArxivBatchClient(min_interval=3.0)
+
+    assert client._retry_after("soon") == 3.0
+    assert client._retry_after(None) == 3.0
+
+
+class ThrottledSession:
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        return type("Response", (), {"status_code": 429, "headers": {"Retry-After": self.retry_after}})()
+
+
+def test_retry_after_longer_than_the_timeout_fails_the_batch():
+    import time
+    import requests
+    client = ArxivBatchClient(min_interval=0.0, timeout=5.0)
+    client.session = ThrottledSession("3600")
+
+    started = time.perf_counter()
+    with pytest.raises(requests.HTTPError):
+        client._request({"search_query": "all:dcf"})
+
+    assert time.perf_counter() - started < 1.0
+    assert client.session.calls == 1
@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+from core.cassette import Cassette, CassetteMiss
+
+
+def test_recorded_calls_replay_by_payload_then_by_route(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    recorder = Cassette(path, mode="record")
+    recorder.call("search:web", {"query": "dcf"}, lambda: ["dcf result"])
+    asyncio.run(recorder.acall("llm:model", {"prompt": "at 10:00"}, _answer("first answer")))
+
+    player = Cassette(path, mode="replay", latency="none")
+    assert player.call("search:web", {"query": "dcf"}, _unexpected) == ["dcf result"]
+    # A prompt that differs only in an embedded timestamp replays the next entry for its route
+    assert asyncio.run(player.acall("llm:model", {"prompt": "at 10:05"}, _unexpected)) == "first answer"
+    with pytest.raises(CassetteMiss):
+        player.call("search:web", {"query": "dcf"}, _unexpected)
+    assert (player.hits, player.misses) == (2, 1)
+
+
+def test_re_recording_replaces_the_previous_interactions(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    Cassette(path, mode="record").call("search:web", {"query": "dcf"}, lambda: "stale")
+    Cassette(path, mode="record").call("search:web", {"query": "dcf"}, lambda: "fresh")
+
+    player = Cassette(path, mode="replay", latency="none")
+    assert player.call("search:web", {"query": "dcf"}, _unexpected) == "fresh"
+    with pytest.raises(CassetteMiss):
+        player.call("search:web", {"query": "dcf"}, _unexpected)
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(str(tmp_path / "run.jsonl"), mode="append")
+
+
+def _answer(value):
+    async def call():
+        return value
+    return call
+
+
+def _unexpected():
+    raise AssertionError("replay must not call the live service")
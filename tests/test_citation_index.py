@@ -0,0 +1,43 @@
+from core.citation_index import CitationIndex, canonical_citation_id, normalize_url
+
+
+def test_arxiv_versions_and_urls_share_one_id():
+    ids = {
+        canonical_citation_id({"url": "http://arxiv.org/abs/2401.00001v1"}),
+        canonical_citation_id({"url": "https://arxiv.org/pdf/2401.00001v3.pdf"}),
+        canonical_citation_id({"arxiv_id": "arXiv:2401.00001"}),
+    }
+    assert ids == {"arxiv:2401.00001"}
+
+
+def test_url_normalization_ignores_tracking_and_formatting():
+    assert normalize_url("http://WWW.Example.com/paper/?utm_source=x&b=2&a=1#section") == \
+        "https://example.com/paper?a=1&b=2"
+    assert canonical_citation_id({"url": "https://example.com/paper?utm_medium=email"}) == \
+        canonical_citation_id({"url": "http://www.example.com/paper/"})
+
+
+def test_doi_takes_precedence_over_url_and_title_is_last_resort():
+    assert canonical_citation_id({"doi": "https://doi.org/10.1000/XYZ.1.", "url": "https://a.org/x"}) == \
+        "doi:10.1000/xyz.1"
+    assert canonical_citation_id({"title": "Cash Flow!"}) == canonical_citation_id({"title": "cash  flow"})
+
+
+def test_same_paper_from_several_queries_is_merged():
+    index = CitationIndex()
+    first = index.add({"title": "Untitled", "url": "http://arxiv.org/abs/2401.00001v1", "source": "arxiv"},
+                      "dcf terminal value")
+    second = index.add({"title": "Terminal value", "url": "https://arxiv.org/abs/2401.00001v2",
+                        "published": "2024-01-02", "authors": "A. Author, B. Author"}, "dcf models")
+    assert first == second and len(index) == 1
+    entry = index.get(first)
+    assert entry["queries"] == ["dcf terminal value", "dcf models"]
+    assert entry["title"] == "Terminal value" and entry["published"] == "2024-01-02"
+
+
+def test_rebuilding_from_a_citation_list_keeps_entries():
+    index = CitationIndex()
+    index.add({"title": "Paper", "url": "https://example.com/p"}, ["q1"])
+    rebuilt = CitationIndex(index.to_list())
+    assert rebuilt.to_list() == index.to_list()
+    assert rebuilt.format_apa().startswith("1. Unknown et al. (n.d.). Paper.")
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import time
+import pytest
+from conftest import FakeAnalyst
+from core.deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope
+
+
+class HangingAnalyst(FakeAnalyst):
+    async def analyze(self, state):
+        self.calls += 1
+        await asyncio.sleep(30)
+
+
+def test_deadline_bounds_timeouts_and_signals_cancellation():
+    deadline = Deadline(0.2)
+
+    assert deadline.bound(5.0) <= 0.2
+    assert Deadline().bound(5.0) == 5.0
+    deadline.check()
+    time.sleep(0.25)
+    assert deadline.cancelled
+    with pytest.raises(DeadlineExceeded):
+        deadline.check()
+
+
+def test_cancel_runs_callbacks_once_and_late_callbacks_immediately():
+    deadline = Deadline()
+    calls = []
+    deadline.add_callback(lambda: calls.append("early"))
+
+    deadline.cancel()
+    deadline.cancel()
+    deadline.add_callback(lambda: calls.append("late"))
+
+    assert calls == ["early", "late"]
+    assert deadline.cancel_event.is_set()
+
+
+def test_worker_threads_see_the_scoped_deadline():
+    import contextvars
+    seen = []
+    with deadline_scope(Deadline(5.0)) as deadline:
+        context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(lambda: seen.append(current_deadline()),))
+    thread.start()
+    thread.join()
+
+    assert seen == [deadline]
+    assert current_deadline() is None
+
+
+def test_run_research_returns_the_checkpointed_partial_state(make_graph, topic):
+    analyst = HangingAnalyst()
+    graph = make_graph(analyst=analyst)
+
+    started = time.perf_counter()
+    state = asyncio.run(graph.run_research(topic, deadline_s=0.5))
+
+    assert time.perf_counter() - started < 2.0
+    assert state["partial"] is True and state["metadata"]["partial"] is True
+    assert state["metadata"]["pending_nodes"] == ["analyst"]
+    # The search finished before the deadline, so its sources are kept
+    assert len(state["sources"]) == 3
@@ -0,0 +1,80 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from core.findings_index import FindingsIndex
+
+
+class CountingEmbedder:
+    """Texts mentioning 'terminal' share one direction, everything else gets its own"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), 16), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vectors[row, 0 if "terminal" in text.lower() else 1 + hash(text) % 15] = 1.0
+        return vectors
+
+
+def finding(content, *source_ids):
+    return {"content": content, "category": "result", "confidence": 0.8, "source_ids": list(source_ids)}
+
+
+def test_rewordings_merge_with_provenance():
+    index = FindingsIndex(CountingEmbedder())
+    index.add([finding("Terminal value dominates DCF estimates", "web:1")], analysis_pass=1)
+
+    new = index.add([finding("The terminal value makes up most of a DCF estimate", "arxiv:2"),
+                     finding("Discount rates vary by sector", "web:3")], analysis_pass=2)
+
+    assert [f["content"] for f in new] == ["Discount rates vary by sector"]
+    merged = index.findings()[0]
+    assert merged["source_ids"] == ["web:1", "arxiv:2"] and merged["passes"] == [1, 2]
+    assert index.stats() == {"findings": 2, "added": 2, "merged": 1, "suppressed": 0}
+
+
+def test_held_findings_keep_their_ids_across_passes():
+    first = FindingsIndex(None)
+    first.add([finding("Terminal value dominates DCF estimates")], analysis_pass=1)
+
+    second = FindingsIndex(None, first.findings())
+    second.add([finding("terminal value dominates DCF estimates!")], analysis_pass=2)
+
+    assert [f["id"] for f in second.findings()] == [f["id"] for f in first.findings()]
+    assert second.findings()[0]["mentions"] == 2
+
+
+def test_nothing_is_embedded_when_every_candidate_is_already_held():
+    embedder = CountingEmbedder()
+    held = FindingsIndex(None)
+    held.add([finding("Terminal value dominates DCF estimates")], analysis_pass=1)
+    index = FindingsIndex(embedder, held.findings())
+
+    index.add([finding("Terminal value dominates DCF estimates.")], analysis_pass=2)
+
+    assert embedder.calls == []
+
+
+def test_pruned_findings_are_not_added_back():
+    pruned = finding("Football scores rose last season")
+    index = FindingsIndex(None, pruned_ids=[FindingsIndex.finding_id(pruned["content"])])
+
+    new = index.add([pruned, finding("Discount rates vary by sector")], analysis_pass=2)
+
+    assert [f["content"] for f in new] == ["Discount rates vary by sector"]
+    assert index.stats()["suppressed"] == 1
+
+
+def test_an_uncited_finding_is_credited_to_no_source():
+    try:
+        from agents.analyst_agent import AnalystAgent
+    except ImportError as e:
+        pytest.skip(f"analyst dependencies unavailable: {e}")
+    agent = AnalystAgent.__new__(AnalystAgent)
+
+    findings = agent._extract_findings("The study shows gains [web:1]\nOverall the results are mixed",
+                                       ["web:1", "arxiv:2"])
+
+    assert [finding["source_ids"] for finding in findings] == [["web:1"], []]
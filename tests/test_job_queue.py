@@ -0,0 +1,63 @@
+import time
+import pytest
+from core.job_queue import JobQueue, SqliteJobQueue
+
+TOPIC = {"title": "Discounted cash flow valuation", "domain": "Finance"}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SqliteJobQueue(str(tmp_path / "jobs.db"), max_attempts=2)
+
+
+def test_job_queue_is_abstract():
+    with pytest.raises(TypeError):
+        JobQueue()
+
+
+def test_jobs_are_claimed_once_in_priority_order(queue):
+    low = queue.enqueue(TOPIC)
+    high = queue.enqueue(TOPIC, priority=5)
+
+    first = queue.claim("worker-a", lease_s=60)
+    second = queue.claim("worker-b", lease_s=60)
+
+    assert (first["id"], second["id"]) == (high, low)
+    assert queue.claim("worker-c", lease_s=60) is None
+    assert first["topic"] == TOPIC and first["status"] == "running"
+
+
+def test_expired_lease_is_reclaimed_with_the_same_thread(queue):
+    job_id = queue.enqueue(TOPIC)
+    job = queue.claim("worker-a", lease_s=0.05)
+    time.sleep(0.1)
+
+    taken_over = queue.claim("worker-b", lease_s=60)
+
+    assert taken_over["id"] == job_id and taken_over["thread_id"] == job["thread_id"]
+    assert taken_over["attempts"] == 2
+    # The first worker's heartbeat and completion no longer apply
+    assert queue.heartbeat(job_id, "worker-a", lease_s=60) is False
+    queue.complete(job_id, "worker-a", {"ok": True})
+    assert queue.get(job_id)["status"] == "running"
+
+
+def test_failed_jobs_are_retried_until_attempts_run_out(queue):
+    job_id = queue.enqueue(TOPIC)
+
+    queue.fail(job_id, queue.claim("worker-a", lease_s=60)["worker_id"], "boom")
+    assert queue.get(job_id)["status"] == "queued"
+    queue.fail(job_id, queue.claim("worker-a", lease_s=60)["worker_id"], "boom")
+
+    assert queue.get(job_id)["status"] == "failed"
+    assert queue.stats() == {"failed": 1}
+
+
+def test_completed_jobs_keep_their_result(queue):
+    job_id = queue.enqueue(TOPIC)
+    queue.claim("worker-a", lease_s=60)
+
+    queue.complete(job_id, "worker-a", {"word_count": 1200})
+
+    assert queue.get(job_id)["result"] == {"word_count": 1200}
+    assert [job["id"] for job in queue.jobs(status="done")] == [job_id]
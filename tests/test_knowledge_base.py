@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+from core.knowledge_base import KnowledgeBase
+
+TOPIC = SimpleNamespace(title="Discounted cash flow valuation", domain="Finance")
+
+
+def make_kb(**kwargs):
+    return KnowledgeBase(":memory:", **kwargs)
+
+
+def test_stored_sources_are_served_to_matching_queries():
+    kb = make_kb()
+    stored = kb.add_sources(TOPIC, [
+        {"source": "arxiv", "title": "Terminal value in discounted cash flow models",
+         "summary": "We study terminal value estimates in discounted cash flow valuation.",
+         "url": "http://arxiv.org/abs/2401.00001v2"},
+        {"source": "web", "title": "Empty page", "url": "https://example.com/empty"}
+    ])
+    assert stored == 1
+
+    matches = kb.search_sources("discounted cash flow terminal value", domain="Finance")
+    assert [match["title"] for match in matches] == ["Terminal value in discounted cash flow models"]
+    assert matches[0]["from_knowledge_base"] is True
+    assert kb.search_sources("discounted cash flow terminal value", domain="Biology") == []
+
+
+def test_partial_term_overlap_below_threshold_is_not_served():
+    kb = make_kb(min_overlap=0.6)
+    kb.add_sources(TOPIC, [{"source": "web", "title": "Cash flow basics",
+                            "content": "Cash flow statements for small firms.", "url": "https://example.com/a"}])
+    assert kb.search_sources("cash flow hedging derivatives pricing") == []
+
+
+def test_topic_words_are_search_terms():
+    assert KnowledgeBase._terms("Discounted Cash Flow in modern world") == ["discounted", "cash", "flow",
+                                                                          "modern", "world"]
+
+
+def test_findings_are_deduplicated_by_content():
+    kb = make_kb()
+    finding = {"content": "Terminal value dominates DCF estimates", "category": "result", "confidence": 0.8}
+    kb.add_findings(TOPIC, [finding])
+    kb.add_findings(TOPIC, [{**finding, "content": "  terminal value dominates DCF estimates "}])
+    assert kb.stats() == {"sources": 0, "findings": 1}
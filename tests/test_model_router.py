@@ -0,0 +1,92 @@
+import asyncio
+import uuid
+import pytest
+
+pytest.importorskip("langchain_openai")
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.prompts import ChatPromptTemplate
+from core.agent_config import AgentConfig
+from core.agent_type import AgentType
+from core.model_router import MODEL_TIERS, ModelRouter
+from core.usage_ledger import UsageLedger
+
+
+class FailingChatModel(FakeListChatModel):
+    async def _astream(self, *args, **kwargs):
+        raise RuntimeError("provider unavailable")
+        yield
+
+
+PROMPT = ChatPromptTemplate.from_messages([("human", "Summarize {topic}")])
+
+
+def make_router(primary, fallback, **config):
+    agent_config = AgentConfig(agent_type=AgentType.ANALYST, llm_model=primary, fallback_model=fallback, **config)
+    return ModelRouter(agent_config, ledger=UsageLedger(":memory:"))
+
+
+def unique(name):
+    # Model health is shared per process, so every test uses its own model names
+    return f"{name}-{uuid.uuid4().hex[:8]}"
+
+
+def test_tiers_resolve_to_configured_models():
+    router = ModelRouter(AgentConfig(agent_type=AgentType.SEARCH_SPECIALIST, model_tier="fast"),
+                         ledger=UsageLedger(":memory:"))
+    assert router.resolve()[0] == MODEL_TIERS["fast"]
+    assert router.resolve("strong")[0] == MODEL_TIERS["strong"]
+
+
+def test_failing_primary_falls_back_and_is_degraded_after_threshold():
+    primary, fallback = unique("primary"), unique("fallback")
+    router = make_router(primary, fallback, error_threshold=2)
+    router._llms[primary] = FailingChatModel(responses=["unused"])
+    router._llms[fallback] = FakeListChatModel(responses=["fallback answer"])
+
+    for attempt in range(2):
+        response = asyncio.run(router.ainvoke(PROMPT, {"topic": f"DCF {attempt}"}))
+        assert response.content == "fallback answer"
+
+    report = ModelRouter.health_report()
+    assert report[primary]["consecutive_errors"] == 2
+    assert report[primary]["degraded"] is True
+    # While degraded, the fallback model is tried first
+    assert router.resolve() == [fallback, primary]
+    assert [call["error"] is not None for call in reversed(router.ledger.calls())] == [True, False, True, False]
+
+
+def test_last_model_error_is_raised():
+    primary, fallback = unique("primary"), unique("fallback")
+    router = make_router(primary, fallback)
+    router._llms[primary] = FailingChatModel(responses=["unused"])
+    router._llms[fallback] = FailingChatModel(responses=["unused"])
+    with pytest.raises(RuntimeError, match="provider unavailable"):
+        asyncio.run(router.ainvoke(PROMPT, {"topic": "DCF"}))
+
+
+class MeteredChatModel(FakeListChatModel):
+    """Streams its reply with token usage attached, like a real provider"""
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        from langchain_core.messages import AIMessageChunk
+        from langchain_core.outputs import ChatGenerationChunk
+        yield ChatGenerationChunk(message=AIMessageChunk(
+            content=self.responses[0],
+            usage_metadata={"input_tokens": 40, "output_tokens": 10, "total_tokens": 50}
+        ))
+
+
+def test_persistent_cache_hits_are_logged_as_cache_hits(tmp_path, monkeypatch):
+    import core.persistent_cache as persistent_cache
+    monkeypatch.setattr(persistent_cache, "_shared", persistent_cache.PersistentCache(str(tmp_path / "cache.db")))
+    primary = unique("primary")
+    router = make_router(primary, None)
+    router._llms[primary] = MeteredChatModel(responses=["answer"])
+
+    first = asyncio.run(router.ainvoke(PROMPT, {"topic": "DCF"}))
+    second = asyncio.run(router.ainvoke(PROMPT, {"topic": "DCF"}))
+
+    assert first.content == second.content == "answer"
+    hit, call = router.ledger.calls()
+    assert (call["prompt_tokens"], call["completion_tokens"], call["cached"]) == (40, 10, 0)
+    assert (hit["prompt_tokens"], hit["completion_tokens"], hit["cached"]) == (0, 0, 1)
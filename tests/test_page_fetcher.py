@@ -0,0 +1,48 @@
+import os
+import threading
+import pytest
+
+pytest.importorskip("requests")
+from core.page_fetcher import PageFetcher, _MainTextExtractor
+
+
+def test_extractor_keeps_main_text_and_skips_page_chrome():
+    extractor = _MainTextExtractor(max_chars=1000)
+    extractor.feed("<html><head><title>DCF  guide</title><script>var x = 1;</script></head>"
+                   "<body><nav>Home | About</nav><p>Discount the</p><p>cash flows.</p>"
+                   "<footer>Copyright</footer></body></html>")
+
+    assert extractor.title == "DCF guide"
+    assert extractor.text() == "Discount the\ncash flows."
+
+
+def test_extractor_stops_at_the_character_cap():
+    extractor = _MainTextExtractor(max_chars=10)
+    extractor.feed("<p>" + "word " * 50 + "</p>")
+
+    assert extractor.full
+    assert len(extractor.text()) <= 10
+
+
+def test_concurrent_cache_writes_leave_a_complete_page(tmp_path):
+    fetcher = PageFetcher(cache_dir=str(tmp_path))
+    url = "https://example.com/dcf"
+    pages = [{"url": url, "text": f"text {i}" * 200} for i in range(8)]
+
+    threads = [threading.Thread(target=fetcher._write_cache, args=(url, page)) for page in pages]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetcher._read_cache(url) in pages
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_cache_write_errors_do_not_fail_the_fetch(tmp_path):
+    fetcher = PageFetcher(cache_dir=str(tmp_path))
+    os.rmdir(tmp_path)
+
+    fetcher._write_cache("https://example.com/dcf", {"text": "DCF"})
+
+    assert fetcher._read_cache("https://example.com/dcf") is None
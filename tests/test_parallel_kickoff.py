@@ -0,0 +1,31 @@
+import asyncio
+import time
+from conftest import FakeAnalyst, FakeCoordinator, FakeSearch
+
+
+def test_planning_and_first_search_run_in_parallel_and_join_once(make_graph, topic):
+    coordinator, search, analyst = FakeCoordinator(delay=0.3), FakeSearch(delay=0.3), FakeAnalyst()
+    graph = make_graph(coordinator=coordinator, search=search, analyst=analyst)
+
+    started = time.perf_counter()
+    result = asyncio.run(graph.run_research(topic))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.55
+    assert (coordinator.calls, search.calls, analyst.calls) == (1, 1, 1)
+    # Only the search branch sets the phase; the coordinator's plan still lands in state
+    assert result["research_plan"] == "1. Key questions"
+    assert result["research_phase"] == "completed"
+    kickoffs = [timing["node"] for timing in graph.node_timings if timing["node"].startswith("kickoff")]
+    assert sorted(kickoffs) == ["kickoff_coordinator", "kickoff_search"]
+
+
+def test_sequential_start_runs_coordinator_first(make_graph, topic):
+    coordinator, search = FakeCoordinator(delay=0.2), FakeSearch(delay=0.2)
+    graph = make_graph(coordinator=coordinator, search=search, speculative_start=False)
+
+    started = time.perf_counter()
+    asyncio.run(graph.run_research(topic))
+
+    assert time.perf_counter() - started >= 0.4
+    assert [timing["node"] for timing in graph.node_timings][:2] == ["research_coordinator", "search_specialist"]
@@ -0,0 +1,24 @@
+import time
+from core.persistent_cache import PersistentCache
+
+PAYLOAD = {"provider": "web", "query": "discounted cash flow", "max_results": 5}
+
+
+def test_entries_are_shared_through_the_file(tmp_path):
+    path = str(tmp_path / "cache.db")
+    PersistentCache(path).set("search", PAYLOAD, [{"title": "DCF primer"}])
+
+    # A second connection stands in for another worker process on the same host
+    other = PersistentCache(path)
+
+    assert other.get("search", PAYLOAD) == [{"title": "DCF primer"}]
+    assert other.get("llm", PAYLOAD) is None
+    assert other.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    cache = PersistentCache(str(tmp_path / "cache.db"), ttl_s=0.05)
+    cache.set("search", PAYLOAD, ["result"])
+    time.sleep(0.1)
+
+    assert cache.get("search", PAYLOAD) is None
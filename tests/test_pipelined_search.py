@@ -0,0 +1,58 @@
+import asyncio
+import time
+from conftest import FakeAnalyst, FakeSearch
+
+
+class StreamingSearch(FakeSearch):
+    """Yields one batch per query, each arriving 0.2 s after the last"""
+
+    async def search_stream(self, state):
+        from core.source_record import SourceRecord
+        sources = []
+        for i in range(3):
+            await asyncio.sleep(0.2)
+            batch = [SourceRecord(citation_id=f"web:{i}", source="web", title=f"Source {i}", content="DCF")]
+            sources.extend(batch)
+            yield {"done": False, "query": f"query {i}", "results": batch, "remaining": 2 - i, "novelty": 1.0}
+        self.finished_at = time.perf_counter()
+        yield {"done": True, "update": {"sources": sources, "search_results": [s.citation_id for s in sources],
+                                        "research_phase": "analysis"}}
+
+
+class BatchAnalyst(FakeAnalyst):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    async def analyze_batch(self, topic, sources):
+        self.batches.append((time.perf_counter(), [source.citation_id for source in sources]))
+        await asyncio.sleep(0.1)
+        return {"source_ids": [source.citation_id for source in sources], "summary": "Partial"}
+
+
+def test_early_batches_are_analyzed_while_search_is_still_running(make_graph, topic):
+    search, analyst = StreamingSearch(), BatchAnalyst()
+    graph = make_graph(search=search, analyst=analyst, pipelined=True)
+
+    update = asyncio.run(graph._pipelined_search({"topic": topic}))
+
+    # The tail batch is left to the analyst's final pass
+    assert [ids for _, ids in analyst.batches] == [["web:0"], ["web:1"]]
+    assert analyst.batches[0][0] < search.finished_at - 0.3
+    assert [partial["source_ids"] for partial in update["partial_analyses"]] == [["web:0"], ["web:1"]]
+    assert len(update["sources"]) == 3
+
+
+def test_search_stream_yields_each_query_as_it_completes(make_specialist, topic):
+    agent = make_specialist(lambda query: [{"source": "web", "title": query, "url": f"https://example.com/{query}",
+                                            "content": f"{query} text", "relevance_score": 0.8}])
+
+    async def collect():
+        return [batch async for batch in agent.search_stream({"topic": topic})]
+
+    batches = asyncio.run(collect())
+
+    *partial, final = batches
+    assert final["done"] and not any(batch["done"] for batch in partial)
+    assert [batch["remaining"] for batch in partial][-1] == 0
+    assert sum(len(batch["results"]) for batch in partial) == len(final["update"]["sources"])
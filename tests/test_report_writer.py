@@ -0,0 +1,48 @@
+import io
+import json
+from dashboard.report_writer import ReportWriter
+
+
+def make_result(**overrides):
+    result = {
+        "topic": {"title": "Discounted cash flow", "domain": "Finance", "complexity": "expert", "subtopics": []},
+        "research_phase": "completed",
+        "sources": [{"source": "web", "title": f"Source {i}", "content": "Cash flows. " * 5} for i in range(3)],
+        "findings": [{"content": "Terminal value dominates", "category": "result", "confidence": 0.8}],
+        "final_paper": {"title": "DCF", "word_count": 1200, "citations_count": 3, "sections": ["abstract"]},
+        "metadata": {}
+    }
+    result.update(overrides)
+    return result
+
+
+def render(fmt, result, **kwargs):
+    buffer = io.StringIO()
+    ReportWriter(fmt, **kwargs).write(result, buffer)
+    return buffer.getvalue()
+
+
+def test_completed_run_reports_completed_status():
+    text = render("console", make_result())
+    assert "Status: ✓ COMPLETED" in text
+    assert "PARTIAL" not in text
+
+
+def test_partial_run_reports_partial_status_and_unfinished_phases():
+    result = make_result(partial=True, metadata={"partial": True, "pending_nodes": ["validator", "writer"]})
+    text = render("console", result)
+    assert "✓ COMPLETED" not in text
+    assert "Status: ⚠ PARTIAL" in text
+    assert "Unfinished phases: validator, writer" in text
+
+
+def test_json_output_is_valid_and_streams_every_source():
+    document = json.loads(render("json", make_result(partial=True)))
+    assert document["partial"] is True
+    assert [source["title"] for source in document["sources"]] == ["Source 0", "Source 1", "Source 2"]
+
+
+def test_max_items_truncates_long_lists():
+    result = make_result(sources=[{"source": "web", "title": f"S{i}", "content": "x"} for i in range(30)])
+    text = render("markdown", result, max_items=5)
+    assert "... and 25 more not shown" in text
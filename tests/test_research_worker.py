@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from core.job_queue import SqliteJobQueue
+
+TOPIC = {"title": "Discounted cash flow valuation", "domain": "Finance"}
+
+
+class FakeAssistant:
+    def __init__(self, fail_titles=()):
+        self.fail_titles = set(fail_titles)
+        self.thread_ids = []
+
+    async def run_research(self, topic, config=None, thread_id=None):
+        self.thread_ids.append(thread_id)
+        if topic.title in self.fail_titles:
+            raise RuntimeError("provider outage")
+        return {"research_phase": "completed", "sources": [1, 2, 3], "final_paper": {"word_count": 900}}
+
+
+@pytest.fixture
+def make_worker(tmp_path):
+    pytest.importorskip("pydantic")
+    from graph.research_worker import ResearchWorker
+
+    def factory(assistant, **options):
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"), max_attempts=1)
+        return ResearchWorker(queue, assistant=assistant, poll_s=0.01, **options)
+
+    return factory
+
+
+def test_worker_drains_the_queue_and_records_results(make_worker):
+    assistant = FakeAssistant(fail_titles={"Broken topic"})
+    worker = make_worker(assistant, concurrency=2)
+    done = worker.queue.enqueue(TOPIC)
+    failed = worker.queue.enqueue({**TOPIC, "title": "Broken topic"})
+
+    asyncio.run(worker.run(drain=True))
+
+    assert worker.queue.get(done)["result"]["word_count"] == 900
+    assert worker.queue.get(failed)["status"] == "failed"
+    # Each run resumes under its job's own thread id
+    assert sorted(assistant.thread_ids) == sorted([done, failed])
+    assert (worker.completed, worker.failed) == (1, 1)
+
+
+def test_a_long_lived_graph_drops_per_run_bookkeeping(make_graph, topic):
+    graph = make_graph()
+
+    for _ in range(3):
+        asyncio.run(graph.run_research(topic))
+
+    assert not graph._run_timings and not graph._node_visits
+    assert graph.node_timings and len(graph.node_timings) < 10
@@ -0,0 +1,134 @@
+import time
+import uuid
+import pytest
+
+pytest.importorskip("langchain_community")
+pytest.importorskip("requests")
+from core.advanced_research import AdvancedResearch
+
+
+def web_result(i, content="Discounted cash flow text"):
+    return {"source": "web", "title": f"Page {i}", "url": f"https://example.com/{i}",
+            "content": content, "relevance_score": 0.8}
+
+
+def arxiv_result(i):
+    return {"source": "arxiv", "title": f"Paper {i}", "url": f"http://arxiv.org/abs/2401.0000{i}v1",
+            "summary": "Terminal value estimates", "relevance_score": 0.9}
+
+
+def make_research(web, arxiv, arxiv_delay=0.3, **options):
+    try:
+        research = AdvancedResearch(**options)
+    except ImportError as e:
+        pytest.skip(f"web search backend unavailable: {e}")
+
+    def slow_arxiv(query, max_results):
+        time.sleep(arxiv_delay)
+        return arxiv
+
+    research._web_search = lambda query, max_results: web
+    research._arxiv_search = slow_arxiv
+    return research
+
+
+def query():
+    # Provider calls are coalesced process-wide by query, so each test searches its own
+    return f"discounted cash flow {uuid.uuid4().hex[:8]}"
+
+
+def test_mock_provider_and_duplicates_do_not_fill_the_quorum():
+    web = [web_result(1), web_result(1), web_result(2)]
+    research = make_research(web, [arxiv_result(1)], deadline_s=2.0)
+
+    started = time.perf_counter()
+    round_ = research.search_with_cache(query(), max_results=5, min_results=3)
+
+    # Two distinct web pages plus the canned scholar result are not enough to return early
+    assert time.perf_counter() - started >= 0.3
+    assert round_["partial"] is False
+    assert {result["source"] for result in round_["results"]} == {"web", "arxiv", "scholar"}
+
+
+def test_results_without_text_do_not_count_toward_the_quorum():
+    web = [web_result(1), web_result(2), web_result(3, content="")]
+    research = make_research(web, [arxiv_result(1)], deadline_s=2.0)
+
+    started = time.perf_counter()
+    round_ = research.search_with_cache(query(), max_results=5, min_results=3)
+
+    assert time.perf_counter() - started >= 0.3
+    assert round_["pending_providers"] == []
+
+
+def test_round_returns_early_once_enough_usable_results_arrive():
+    research = make_research([web_result(i) for i in range(3)], [arxiv_result(1)], arxiv_delay=1.0,
+                             deadline_s=2.0)
+
+    started = time.perf_counter()
+    round_ = research.search_with_cache(query(), max_results=5, min_results=3)
+
+    assert time.perf_counter() - started < 0.5
+    assert round_["partial"] is True
+    assert "arxiv" in round_["pending_providers"]
+
+
+def test_budget_bounds_the_round():
+    research = make_research([web_result(1)], [arxiv_result(1)], arxiv_delay=1.0, deadline_s=0.2)
+
+    started = time.perf_counter()
+    round_ = research.search_with_cache(query(), max_results=5, min_results=3)
+
+    assert time.perf_counter() - started < 0.6
+    assert "arxiv" in round_["pending_providers"]
+
+
+class RecordingFetcher:
+    timeout = (3.05, 8.0)
+
+    def __init__(self):
+        self.timeouts = []
+
+    def fetch_many(self, urls, timeout=None):
+        self.timeouts.append(timeout)
+        return {}
+
+
+class OneHit:
+    def results(self, query, max_results):
+        return [{"link": "https://example.com/1", "title": "Page 1", "snippet": "Discounted cash flow"}]
+
+
+def test_page_fetching_stays_within_the_round_budget():
+    research = make_research([], [], arxiv_delay=0.0, deadline_s=0.5)
+    del research._web_search
+    research.search_tool = OneHit()
+    research.page_fetcher = RecordingFetcher()
+
+    round_ = research.search_with_cache(query(), max_results=5, min_results=3)
+
+    # The fetcher's own connect + read timeout is longer than the whole round
+    assert research.page_fetcher.timeouts and research.page_fetcher.timeouts[0] <= 0.5
+    web = [result for result in round_["results"] if result["source"] == "web"]
+    assert web and web[0]["page_fetched"] is False
+
+
+
+def test_coalesced_provider_calls_record_one_latency(monkeypatch):
+    import threading
+    from core.latency_histogram import LatencyHistogram
+    monkeypatch.setitem(AdvancedResearch.provider_latency, "probe", LatencyHistogram())
+    research = make_research([], [])
+    q = query()
+
+    def probe(query, max_results):
+        time.sleep(0.2)
+        return [web_result(1)]
+
+    threads = [threading.Thread(target=research._timed_search, args=("probe", probe, q, 5)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert AdvancedResearch.provider_latency["probe"].snapshot()["count"] == 1
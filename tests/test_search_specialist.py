@@ -0,0 +1,129 @@
+import asyncio
+
+
+def page(query, i=0):
+    return {"source": "web", "title": f"{query} page {i}", "url": f"https://example.com/{query}/{i}",
+            "content": f"{query} body text {i}", "relevance_score": 0.8}
+
+
+def test_first_pass_runs_the_base_queries(make_specialist, topic):
+    agent = make_specialist(lambda query: [page(query)])
+
+    update = asyncio.run(agent.search({"topic": topic}))
+
+    queries, gap_fill = agent._plan_queries({"topic": topic})
+    assert gap_fill is False
+    assert set(agent.issued) <= set(queries)
+    assert update["search_passes"] == 1
+
+
+def test_redo_search_fills_the_gap_even_with_no_sources_held(make_specialist, topic):
+    # The analyst's router sends the run back before the validator records insufficient_sources
+    agent = make_specialist(lambda query: [page(query)])
+    base, _ = agent._plan_queries({"topic": topic})
+
+    update = asyncio.run(agent.search({"topic": topic, "sources": [], "search_passes": 1}))
+
+    assert agent.issued and not set(agent.issued) & set(base)
+    assert set(agent.issued) <= set(agent._gap_queries(topic, 1)) | set(agent._widening_queries(topic))
+    assert update["sources"] and update["search_passes"] == 2
+
+
+def test_each_gap_pass_issues_queries_no_earlier_pass_has(make_specialist, topic):
+    agent = make_specialist(lambda query: [page(query)])
+    base, _ = agent._plan_queries({"topic": topic})
+    widening = set(agent._widening_queries(topic))
+
+    passes = [agent._plan_queries({"topic": topic, "search_passes": n})[0] for n in (1, 2, 3)]
+
+    issued = [query for queries in passes for query in queries]
+    assert all(passes) and len(set(issued)) == len(issued)
+    assert not set(issued) & (set(base) | widening)
+
+
+def test_redo_search_keeps_the_sources_already_held(make_specialist, topic):
+    agent = make_specialist(lambda query: [page(query)])
+    first = asyncio.run(agent.search({"topic": topic}))
+
+    second = asyncio.run(agent.search({"topic": topic, **first}))
+
+    held_ids = [source.citation_id for source in first["sources"]]
+    assert [source.citation_id for source in second["sources"][:len(held_ids)]] == held_ids
+    assert len(second["sources"]) > len(held_ids)
+
+
+class DistinctAnalyzer:
+    """Embeds each distinct text on its own axis, so novelty is exactly 0 or 1"""
+
+    def __init__(self):
+        self.axes = {}
+
+    def embed(self, texts):
+        import numpy as np
+        vectors = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vectors[row, self.axes.setdefault(text, len(self.axes) % 64)] = 1.0
+        return vectors
+
+    def analyze_content(self, content):
+        return {}
+
+
+def search_metadata(agent):
+    (_, metadata), = [entry for entry in agent.activity if entry[0] == "search_completed"]
+    return metadata
+
+
+def test_repeated_results_skip_the_queries_not_yet_started(make_specialist, topic):
+    agent = make_specialist(lambda query: [page("same")], wave_size=2)
+    agent.content_analyzer = DistinctAnalyzer()
+    base, _ = agent._plan_queries({"topic": topic})
+
+    asyncio.run(agent.search({"topic": topic}))
+
+    # The second query only returned the page already held, so the third never runs
+    assert agent.issued == base[:2]
+    assert search_metadata(agent)["queries_skipped"] == base[2:]
+
+
+def test_a_planned_query_starts_after_the_stagger_without_waiting_for_results(make_specialist, topic):
+    agent = make_specialist(lambda query: [page(query)], wave_size=2, stagger_s=0.05, max_queries=3)
+    started = []
+
+    async def slow_search(query, topic, max_results=None, providers=None):
+        started.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(0.5)
+        return {"query": query, "results": [page(query)]}
+
+    agent._execute_search = slow_search
+
+    asyncio.run(agent.search({"topic": topic}))
+
+    assert len(started) == 3 and started[2] - started[0] < 0.4
+
+
+def test_novel_results_widen_the_search(make_specialist, topic):
+    agent = make_specialist(lambda query: [page(query)], wave_size=2, max_queries=7)
+    agent.content_analyzer = DistinctAnalyzer()
+
+    asyncio.run(agent.search({"topic": topic}))
+
+    assert len(agent.issued) == 7
+    assert set(agent.issued[3:]) <= set(agent._widening_queries(topic))
+
+
+def test_unmeasured_batches_do_not_keep_a_stale_provider(make_specialist, topic):
+    stale = {"source": "arxiv", "title": "held", "url": "https://arxiv.org/held", "content": "held body"}
+
+    def results_for(query):
+        return [stale, page(query)]
+
+    agent = make_specialist(results_for, wave_size=1, max_queries=4)
+    agent.content_analyzer = DistinctAnalyzer()
+
+    asyncio.run(agent.search({"topic": topic}))
+
+    metadata = search_metadata(agent)
+    # The first batch held nothing yet; every later arxiv result was a duplicate
+    assert metadata["provider_novelty"]["arxiv"] == 0.0
+    assert "arxiv" not in metadata["providers_in_use"]
@@ -0,0 +1,45 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from core.semantic_query_cache import SemanticQueryCache
+
+RESULTS = [{"title": "DCF primer"}, {"title": "Terminal value"}]
+
+
+def embed(texts):
+    # Queries mentioning a survey sit at cosine 0.8 from the rest
+    return np.array([[0.8, 0.6] if "survey" in text else [1.0, 0.0] for text in texts], dtype=np.float32)
+
+
+def test_reworded_queries_share_an_exact_key():
+    cache = SemanticQueryCache()
+    cache.put("web", "Discounted cash flow recent developments", 5, RESULTS)
+
+    assert cache.get("web", "recent developments in discounted cash flow", 2) == RESULTS
+    assert cache.stats()["exact_hits"] == 1
+
+
+def test_larger_requests_are_not_served_from_smaller_entries():
+    cache = SemanticQueryCache()
+    cache.put("web", "discounted cash flow", 2, RESULTS)
+
+    assert cache.get("web", "discounted cash flow", 5) is None
+
+
+def test_paraphrases_are_served_within_the_provider_threshold():
+    cache = SemanticQueryCache(embed_fn=embed, thresholds={"arxiv": 0.75, "web": 0.95})
+    cache.put("arxiv", "discounted cash flow valuation methods", 5, RESULTS)
+    cache.put("web", "discounted cash flow valuation methods", 5, RESULTS)
+
+    query = "discounted cash flow valuation methods survey"
+    assert cache.get("arxiv", query, 5) == RESULTS
+    assert cache.get("web", query, 5) is None
+    assert cache.stats()["semantic_hits"] == 1
+
+
+def test_empty_results_are_never_cached():
+    cache = SemanticQueryCache()
+    cache.put("web", "discounted cash flow", 5, [])
+
+    assert cache.get("web", "discounted cash flow", 5) is None
+    assert cache.stats()["entries"] == 0
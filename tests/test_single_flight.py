@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+import pytest
+from core.single_flight import SingleFlight
+
+
+def test_concurrent_async_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flights.ado("key", fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["result"] * 5
+    assert len(calls) == 1
+    assert flights.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_waiter_timeout_does_not_cancel_the_leader():
+    flights = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.1)
+        return "leader result"
+
+    async def main():
+        leader = asyncio.create_task(flights.ado("key", slow))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(flights.ado("key", slow), timeout=0.02)
+        return await leader
+
+    assert asyncio.run(main()) == "leader result"
+
+
+def test_leader_timeout_reaches_waiters_as_an_exception():
+    flights = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(1)
+        return "never"
+
+    async def main():
+        leader = asyncio.create_task(asyncio.wait_for(flights.ado("key", slow), timeout=0.02))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flights.ado("key", slow))
+        results = await asyncio.gather(leader, waiter, return_exceptions=True)
+        return results
+
+    leader_result, waiter_result = asyncio.run(main())
+    assert isinstance(leader_result, asyncio.TimeoutError)
+    # An Exception, not CancelledError, so callers such as ModelRouter can fall back
+    assert isinstance(waiter_result, Exception)
+    assert not isinstance(waiter_result, asyncio.CancelledError)
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_errors_propagate_to_every_caller():
+    flights = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.02)
+        raise ValueError("provider error")
+
+    async def main():
+        return await asyncio.gather(*(flights.ado("key", failing) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(main()))
+
+
+def test_threads_share_one_synchronous_call():
+    flights = SingleFlight()
+    calls = []
+    results = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return 42
+
+    threads = [threading.Thread(target=lambda: results.append(flights.do("key", fetch))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [42] * 4
+    assert len(calls) == 1
+
+
+def test_sync_waiter_stops_at_its_own_deadline():
+    from core.deadline import Deadline, DeadlineExceeded, deadline_scope
+    flights = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def slow():
+        started.set()
+        time.sleep(0.5)
+        return 42
+
+    def waiter():
+        with deadline_scope(Deadline(0.05)):
+            try:
+                flights.do("key", slow)
+            except DeadlineExceeded as e:
+                errors.append((e, time.perf_counter() - began))
+
+    leader = threading.Thread(target=lambda: flights.do("key", slow))
+    leader.start()
+    started.wait()
+    began = time.perf_counter()
+    waiter()
+    leader.join()
+
+    assert len(errors) == 1 and errors[0][1] < 0.3
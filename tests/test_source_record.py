@@ -0,0 +1,52 @@
+import pytest
+from core.source_record import SourceRecord
+
+ARXIV_RESULT = {
+    "source": "arxiv",
+    "title": "Terminal value in DCF models",
+    "summary": "We compare terminal value estimates.",
+    "authors": "Ada Lovelace, Alan Turing",
+    "url": "http://arxiv.org/abs/2401.00001v1",
+    "arxiv_id": "2401.00001",
+    "relevance_score": 0.9,
+    "primary_category": "q-fin.GN"
+}
+
+
+def test_results_map_onto_typed_fields():
+    record = SourceRecord.from_result(ARXIV_RESULT, "arxiv:2401.00001",
+                                      {"chunks": 2, "word_count": 5, "sentence_count": 1})
+
+    assert record.content == "We compare terminal value estimates."
+    assert record.authors == ("Ada Lovelace", "Alan Turing")
+    assert record.analysis == {"chunks": 2, "word_count": 5, "sentence_count": 1}
+    assert record.extra == {"primary_category": "q-fin.GN"}
+
+
+def test_dict_style_reads_use_the_original_keys():
+    record = SourceRecord.from_result(ARXIV_RESULT, "arxiv:2401.00001")
+
+    assert record["title"] == "Terminal value in DCF models"
+    assert record.get("primary_category") == "q-fin.GN"
+    assert record.get("doi", "none") == "none"
+    assert "summary" not in record and "url" in record
+    with pytest.raises(KeyError):
+        record["doi"]
+
+
+def test_to_dict_keeps_the_result_shape():
+    data = SourceRecord.from_result(ARXIV_RESULT, "arxiv:2401.00001").to_dict()
+
+    assert data["authors"] == ["Ada Lovelace", "Alan Turing"]
+    assert data["primary_category"] == "q-fin.GN"
+    assert set(data["analysis"]) == {"chunks", "word_count", "sentence_count"}
+    assert isinstance(data["processed_at"], str)
+
+
+def test_provider_and_author_names_are_interned():
+    first = SourceRecord.from_result(ARXIV_RESULT, "a")
+    second = SourceRecord.from_result({**ARXIV_RESULT, "source": "".join(["arx", "iv"])}, "b")
+
+    assert first.source is second.source
+    assert first.authors[0] is second.authors[0]
+    assert not hasattr(first, "__dict__")
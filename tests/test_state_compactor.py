@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip("langchain_core")
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from core.source_record import SourceRecord
+from core.state_compactor import StateCompactor
+
+
+def test_long_source_bodies_and_analysis_are_trimmed():
+    compactor = StateCompactor(max_stored_source_chars=100, max_analysis_chars=200)
+    short = SourceRecord(citation_id="web:1", content="short body")
+    long = SourceRecord(citation_id="web:2", content="a" * 80 + "b" * 200 + "c" * 80, word_count=3)
+    updates = compactor.compact_state({
+        "sources": [short, long],
+        "analysis": {"comprehensive_analysis": "x" * 500, "confidence_score": 0.7},
+        "research_plan": "1. Question\n" * 50
+    })
+
+    assert updates["sources"][0] is short
+    trimmed = updates["sources"][1]
+    assert len(trimmed.content) == 100
+    assert trimmed.content.startswith("a") and trimmed.content.endswith("c")
+    assert (trimmed.citation_id, trimmed.word_count) == ("web:2", 3)
+    assert len(updates["analysis"]["comprehensive_analysis"]) == 200
+    assert updates["analysis"]["confidence_score"] == 0.7
+    assert len(updates["research_plan"]) == 200
+
+
+def test_state_within_bounds_needs_no_updates():
+    compactor = StateCompactor()
+    state = {"sources": [SourceRecord(citation_id="web:1", content="body")],
+             "analysis": {"comprehensive_analysis": "brief"}, "research_plan": "1. Key questions"}
+    assert compactor.compact_state(state) == {}
+
+
+def test_prompt_views_keep_system_message_and_recent_history():
+    compactor = StateCompactor(keep_recent=2, max_message_chars=50)
+    history = [SystemMessage(content="system")] + [
+        (HumanMessage if i % 2 else AIMessage)(content=f"message {i} " * 20) for i in range(5)
+    ]
+    bounded = compactor.bound_messages(history)
+    assert [message.type for message in bounded] == ["system"] + [message.type for message in history[-2:]]
+    assert all(len(str(message.content)) <= 50 for message in bounded)
+
+
+def test_pack_sources_respects_the_budget():
+    compactor = StateCompactor(max_source_chars=50)
+    sources = [SourceRecord(citation_id=f"web:{i}", title=f"Source {i}", content="text " * 100) for i in range(20)]
+    packed = compactor.pack_sources(sources, max_chars=500)
+    assert len(packed) <= 500
+    assert '"id": "web:0"' in packed
@@ -0,0 +1,54 @@
+from datetime import datetime
+import pytest
+
+pytest.importorskip("ormsgpack")
+pytest.importorskip("langgraph")
+from core.source_record import SourceRecord
+from core.state_serde import ResearchStateSerializer
+
+
+def source(i=0):
+    return SourceRecord(citation_id=f"web:{i}", source="web", title=f"Source {i}", content="Body",
+                        authors=("Ada Lovelace",), relevance_score=0.7, extra={"snippet": "Body"})
+
+
+def test_research_state_round_trips_without_fallback(topic):
+    serde = ResearchStateSerializer()
+    state = {
+        "topic": topic,
+        "sources": [source(0), source(1)],
+        "pair": (1, "a"),
+        "seen": {"kickoff_coordinator", "kickoff_search"},
+        "frozen": frozenset({"a", "b"}),
+        "at": datetime(2024, 1, 2, 3, 4, 5)
+    }
+
+    type_, payload = serde.dumps_typed(state)
+    restored = serde.loads_typed((type_, payload))
+
+    assert type_ == ResearchStateSerializer.TYPE
+    assert serde.fallbacks == 0
+    assert restored == state
+    assert type(restored["frozen"]) is frozenset
+
+
+def test_unencodable_values_fall_back_and_are_counted():
+    from langgraph.types import Send
+    serde = ResearchStateSerializer()
+
+    type_, payload = serde.dumps_typed([Send("analyst", {"batch": 1})])
+
+    assert type_ != ResearchStateSerializer.TYPE
+    assert serde.fallbacks == 1
+    assert serde.loads_typed((type_, payload)) == [Send("analyst", {"batch": 1})]
+
+
+def test_source_records_decode_by_field_name():
+    values = source().field_values()
+    values.pop("doi")
+    values["retired_field"] = "x"
+
+    record = SourceRecord.from_field_values(values)
+
+    assert record.doi == "" and record.title == "Source 0" and record.authors == ("Ada Lovelace",)
+
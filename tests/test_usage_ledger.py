@@ -0,0 +1,36 @@
+import pytest
+from core.usage_ledger import UsageLedger, usage_scope
+
+
+def test_calls_are_tagged_with_the_enclosing_scopes():
+    ledger = UsageLedger(":memory:")
+    with usage_scope(run_id="run-1", node="analyst"):
+        with usage_scope(iteration=2):
+            entry = ledger.record(agent="analyst", model="m", latency_s=2.0, prompt_tokens=100,
+                                  completion_tokens=50)
+    ledger.record(agent="writer", model="m", latency_s=1.0)
+
+    assert (entry["run_id"], entry["node"], entry["iteration"]) == ("run-1", "analyst", 2)
+    assert entry["tokens_per_s"] == 25.0
+    assert [call["agent"] for call in ledger.calls(run_id="run-1")] == ["analyst"]
+
+
+def test_aggregate_groups_totals_slowest_first():
+    ledger = UsageLedger(":memory:")
+    with usage_scope(run_id="run-1"):
+        ledger.record(agent="analyst", model="m", latency_s=3.0, prompt_tokens=10, completion_tokens=5)
+        ledger.record(agent="analyst", model="m", latency_s=1.0, coalesced=True)
+        ledger.record(agent="writer", model="m", latency_s=1.0, error="TimeoutError()")
+
+    rows = ledger.aggregate(group_by=("agent",), run_id="run-1")
+    assert [row["agent"] for row in rows] == ["analyst", "writer"]
+    analyst, writer = rows
+    assert (analyst["calls"], analyst["coalesced"], analyst["prompt_tokens"]) == (2, 1, 10)
+    assert analyst["total_latency_s"] == 4.0
+    assert writer["errors"] == 1
+
+
+def test_aggregate_rejects_unknown_columns():
+    with pytest.raises(ValueError):
+        UsageLedger(":memory:").aggregate(group_by=("prompt; DROP TABLE llm_calls",))
+
@@ -0,0 +1,31 @@
+import asyncio
+from conftest import FakeContentAnalyzer, FakeSearch
+
+
+def validated_state(make_graph, topic, scores):
+    search = FakeSearch(sources=4)
+    search.content_analyzer = FakeContentAnalyzer(scores)
+    graph = make_graph(search=search)
+    state = {"topic": topic, **asyncio.run(search.search({"topic": topic}))}
+    state["findings"] = [{"id": "finding:a", "content": "Terminal value dominates"},
+                         {"id": "finding:b", "content": "Football scores rose"}]
+    state["analysis"] = {"comprehensive_analysis": "word " * 250}
+    return state, asyncio.run(graph._validator_node(state))
+
+
+def test_off_topic_sources_are_pruned_from_sources_and_citations(make_graph, topic):
+    state, updates = validated_state(make_graph, topic, {"Source 2": 0.05, "Football": 0.1})
+
+    assert [source.citation_id for source in updates["sources"]] == ["web:0", "web:1", "web:3"]
+    assert updates["search_results"] == ["web:0", "web:1", "web:3"]
+    assert [citation["id"] for citation in updates["citations"]] == ["web:0", "web:1", "web:3"]
+    assert [finding["id"] for finding in updates["findings"]] == ["finding:a"]
+    assert updates["pruned_finding_ids"] == ["finding:b"]
+    assert updates["validation_results"]["checks"][0]["passed"] is False
+
+
+def test_on_topic_state_is_left_unchanged(make_graph, topic):
+    state, updates = validated_state(make_graph, topic, {})
+
+    assert not {"sources", "citations", "findings"} & set(updates)
+    assert updates["research_phase"] == "synthesis"
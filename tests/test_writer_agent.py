@@ -0,0 +1,76 @@
+import asyncio
+import time
+import pytest
+
+
+@pytest.fixture
+def writer():
+    try:
+        from agents.writer_agent import WriterAgent
+    except ImportError as e:
+        pytest.skip(f"writer dependencies unavailable: {e}")
+    from core.agent_config import AgentConfig
+    from core.agent_type import AgentType
+    from core.state_compactor import StateCompactor
+
+    # Skip __init__, which builds the chat clients
+    agent = WriterAgent.__new__(WriterAgent)
+    agent.config = AgentConfig(agent_type=AgentType.WRITER, system_prompt="You are an Academic Writer.")
+    agent.compactor = StateCompactor()
+    agent.log_activity = lambda activity, metadata=None: None
+    agent.prompts = []
+    agent.expired = False
+
+    async def invoke_llm(prompt, inputs=None, tier=None):
+        text = prompt.format_messages()[-1].content
+        agent.prompts.append((time.perf_counter(), text))
+        if '"Limitations"' in text:
+            raise RuntimeError("model unavailable")
+        if agent.expired:
+            from core.deadline import DeadlineExceeded
+            raise DeadlineExceeded("Research deadline exceeded")
+        await asyncio.sleep(0.2)
+        section = "abstract" if "abstract" in text else "body"
+        return type("Response", (), {"content": f" Generated {section} text. "})()
+
+    agent.invoke_llm = invoke_llm
+    return agent
+
+
+def test_sections_are_written_concurrently_and_counted(writer, topic):
+    state = {"topic": topic, "findings": [], "limitations": ["Few sources"], "sources": [],
+             "citations": [{"id": "web:1", "title": "DCF primer", "url": "https://example.com"}]}
+
+    started = time.perf_counter()
+    paper = asyncio.run(writer.write(state))["final_paper"]
+
+    # Seven body sections at 0.2 s each, then the abstract
+    assert time.perf_counter() - started < 0.7
+    content = paper["content"]
+    assert list(content) == writer.SECTION_ORDER
+    assert content["introduction"] == "Generated body text."
+    assert content["abstract"] == "Generated abstract text."
+    assert content["limitations"] == "Few sources"
+    assert "DCF primer" in content["references"]
+    assert paper["word_count"] == sum(len(content[s].split()) for s in writer.SECTION_ORDER if s != "references")
+
+
+def test_abstract_is_written_from_the_finished_body(writer, topic):
+    state = {"topic": topic, "sources": [], "citations": []}
+
+    async def collect():
+        return [section async for section, _ in writer.write_stream(state)]
+
+    order = asyncio.run(collect())
+
+    assert order[-2:] == ["abstract", "references"]
+    abstract_prompt = writer.prompts[-1][1]
+    assert "abstract" in abstract_prompt and "Generated body text." in abstract_prompt
+
+
+def test_deadline_stops_the_writer_instead_of_falling_back(writer, topic):
+    from core.deadline import DeadlineExceeded
+    writer.expired = True
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(writer.write({"topic": topic, "sources": [], "citations": []}))